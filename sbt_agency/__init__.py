@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import importlib
+import importlib.util
 import os
 import sys
 
@@ -12,10 +12,15 @@ SRC_PATH = os.path.join(REPO_ROOT, "src")
 if SRC_PATH not in sys.path:
     sys.path.insert(0, SRC_PATH)
 
-REAL_PKG = os.path.join(SRC_PATH, "sbt_agency", "__init__.py")
+REAL_PKG_DIR = os.path.join(SRC_PATH, "sbt_agency")
+REAL_PKG = os.path.join(REAL_PKG_DIR, "__init__.py")
 if os.path.isfile(REAL_PKG):
-    sys.modules.pop(__name__, None)
-    _module = importlib.import_module(__name__)
+    # Load the real package from its file: importing it by name finds this shim
+    # again (and recurses) whenever the repo root precedes src/ on sys.path.
+    _spec = importlib.util.spec_from_file_location(
+        __name__, REAL_PKG, submodule_search_locations=[REAL_PKG_DIR]
+    )
+    _module = importlib.util.module_from_spec(_spec)
     sys.modules[__name__] = _module
+    _spec.loader.exec_module(_module)
     globals().update(_module.__dict__)
-
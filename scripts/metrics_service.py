@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Serve ring metrics over local HTTP/JSON, keeping built kernels in memory."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = REPO_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from sbt_agency.service import MetricsServer
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-sessions", type=int, default=8, help="configs kept warm")
+    parser.add_argument("--idle-seconds", type=float, default=None, help="drop idle configs")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = MetricsServer(
+        args.host,
+        args.port,
+        max_sessions=args.max_sessions,
+        idle_seconds=args.idle_seconds,
+        verbose=args.verbose,
+    )
+    print(f"serving: {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,2 +1,54 @@
-"""sbt_agency package."""
+"""sbt_agency package.
 
+Submodules load on first attribute access (``sbt_agency.metrics``), so
+``import sbt_agency`` stays cheap.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+_SUBMODULES = frozenset(
+    {
+        "audit",
+        "cache",
+        "channel",
+        "cli",
+        "empowerment",
+        "env_ring_agent",
+        "evaluation",
+        "experiments",
+        "exp_configs",
+        "holonomy",
+        "kernel",
+        "lens",
+        "markov",
+        "metrics",
+        "packaging",
+        "parallel",
+        "pipeline",
+        "plotting",
+        "policies",
+        "reducers",
+        "repro",
+        "service",
+        "shared",
+        "sim",
+        "sweep",
+        "traces",
+        "viability",
+    }
+)
+
+__all__ = sorted(_SUBMODULES)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | _SUBMODULES)
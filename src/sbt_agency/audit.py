@@ -11,7 +11,11 @@ import math
 
 import numpy as np
 
+from sbt_agency.cache import CACHE_FORMAT
+from sbt_agency.pipeline import PIPELINE_STAMP_FORMAT, outputs_valid
 from sbt_agency.repro import stable_hash
+from sbt_agency.sweep import SWEEP_CELL_FORMAT
+from sbt_agency.traces import TRACE_COLUMNS, TRACE_FORMAT, TraceReader
 
 
 def _is_mapping(obj: Any) -> bool:
@@ -70,6 +74,14 @@ def _check_timestamp_and_versions(data: dict, path: Path, issues: list[dict]) ->
 
 
 def _detect_type(data: dict) -> str:
+    if data.get("format") == TRACE_FORMAT:
+        return "columnar_trace"
+    if data.get("format") == SWEEP_CELL_FORMAT:
+        return "sweep_cell"
+    if data.get("format") == PIPELINE_STAMP_FORMAT:
+        return "pipeline_stamp"
+    if data.get("format") == CACHE_FORMAT:
+        return "cache_entry"
     if all(k in data for k in ("runs", "action_names", "n_steps")):
         return "rollout_trace"
     if all(k in data for k in ("defect_off", "defect_on", "tau_list")):
@@ -121,6 +133,77 @@ def _validate_rollout_trace(data: dict, path: Path, issues: list[dict], strict:
             _add_issue(issues, level, path, f"run {name} length != n_steps")
 
 
+def _trace_segment_problem(
+    seg: dict[str, np.ndarray],
+    offset: int,
+    prev_next: int | None,
+    n_actions: int,
+    n_states: int | None,
+) -> str | None:
+    cols = [seg[col] for col in TRACE_COLUMNS]
+    if any(c.dtype != np.int32 or c.ndim != 1 for c in cols):
+        return "segment is not 1D int32"
+    if len({c.shape[0] for c in cols}) != 1:
+        return "segment column lengths differ"
+    t, s, a, s_next = cols
+    n = t.shape[0]
+    if n == 0:
+        return None
+    if not np.array_equal(t, np.arange(offset, offset + n)):
+        return "t is not contiguous"
+    if int(a.min()) < 0 or int(a.max()) >= n_actions:
+        return "action out of range"
+    if int(min(s.min(), s_next.min())) < 0:
+        return "state out of range"
+    if n_states is not None and int(max(s.max(), s_next.max())) >= n_states:
+        return "state out of range"
+    if prev_next is not None and int(s[0]) != prev_next:
+        return "breaks s/s_next continuity"
+    if not np.array_equal(s[1:], s_next[:-1]):
+        return "breaks s/s_next continuity"
+    return None
+
+
+def _validate_columnar_trace(data: dict, path: Path, issues: list[dict], strict: bool) -> None:
+    if not _require_keys(
+        data,
+        path,
+        issues,
+        ("config_hash", "config", "seed", "n_steps", "action_names", "runs"),
+    ):
+        return
+    if not isinstance(data["runs"], dict):
+        _add_issue(issues, "error", path, "runs must be a dict")
+        return
+    reader = TraceReader(path.parent)
+    n_actions = len(data["action_names"])
+    n_states = data.get("n_states") if isinstance(data.get("n_states"), int) else None
+    n_steps = data["n_steps"]
+    for name, meta in data["runs"].items():
+        total = 0
+        prev_next = None
+        problem = None
+        try:
+            for seg in reader.iter_segments(name):
+                problem = _trace_segment_problem(seg, total, prev_next, n_actions, n_states)
+                if problem is not None:
+                    break
+                n = int(seg["t"].shape[0])
+                if n:
+                    prev_next = int(seg["s_next"][-1])
+                total += n
+        except (OSError, ValueError):
+            problem = "has missing or unreadable segments"
+        if problem is not None:
+            _add_issue(issues, "error", path, f"run {name} {problem}")
+            continue
+        if isinstance(meta, dict) and meta.get("length") != total:
+            _add_issue(issues, "error", path, f"run {name} length does not match segments")
+        if isinstance(n_steps, int) and total != n_steps:
+            level = "error" if strict else "warning"
+            _add_issue(issues, level, path, f"run {name} length != n_steps")
+
+
 def _validate_packaging_ring(data: dict, path: Path, issues: list[dict]) -> None:
     if not _require_keys(
         data,
@@ -209,6 +292,39 @@ def _validate_metrics_run(data: dict, path: Path, issues: list[dict], strict: bo
             _add_issue(issues, "error", path, "kernel_size_viable invalid")
 
 
+def _validate_sweep_cell(data: dict, path: Path, issues: list[dict]) -> None:
+    if not _require_keys(data, path, issues, ["config", "metric", "version", "values"]):
+        return
+    key = stable_hash(
+        {"config": data["config"], "metric": data["metric"], "version": data["version"]}
+    )
+    if path.stem != key:
+        _add_issue(issues, "error", path, "sweep cell file name does not match its key")
+    values = data["values"]
+    if not isinstance(values, dict) or not all(
+        isinstance(v, (int, float)) and math.isfinite(v) for v in values.values()
+    ):
+        _add_issue(issues, "error", path, "sweep cell values must be finite numbers")
+
+
+def _validate_pipeline_stamp(data: dict, path: Path, issues: list[dict]) -> None:
+    if not _require_keys(data, path, issues, ["experiment", "input_hash", "outputs"]):
+        return
+    results_dir = path.parent.parent
+    missing = [rel for rel in data["outputs"] if not (results_dir / rel).is_file()]
+    if missing:
+        _add_issue(issues, "error", path, f"stamped outputs missing: {missing}")
+    elif not outputs_valid(results_dir, data):
+        _add_issue(issues, "warning", path, "outputs changed since the stamp was written")
+
+
+def _validate_cache_entry(data: dict, path: Path, issues: list[dict]) -> None:
+    if not _require_keys(data, path, issues, ["function", "version", "result"]):
+        return
+    if not path.stem.startswith(path.parent.name):
+        _add_issue(issues, "error", path, "cache entry is not under its key prefix")
+
+
 def audit_results(root: str | Path, strict: bool = False) -> dict:
     root_path = Path(root)
     details: list[dict] = []
@@ -230,11 +346,20 @@ def audit_results(root: str | Path, strict: bool = False) -> dict:
             continue
 
         _check_config_hash(raw, path, details)
-        _check_timestamp_and_versions(raw, path, details)
-
         artifact_type = _detect_type(raw)
-        if artifact_type == "rollout_trace":
+        if artifact_type not in ("sweep_cell", "cache_entry"):
+            _check_timestamp_and_versions(raw, path, details)
+
+        if artifact_type == "sweep_cell":
+            _validate_sweep_cell(raw, path, details)
+        elif artifact_type == "pipeline_stamp":
+            _validate_pipeline_stamp(raw, path, details)
+        elif artifact_type == "cache_entry":
+            _validate_cache_entry(raw, path, details)
+        elif artifact_type == "rollout_trace":
             _validate_rollout_trace(raw, path, details, strict)
+        elif artifact_type == "columnar_trace":
+            _validate_columnar_trace(raw, path, details, strict)
         elif artifact_type == "packaging_ring":
             _validate_packaging_ring(raw, path, details)
         elif artifact_type == "protocol_horizon":
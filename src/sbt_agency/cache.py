@@ -0,0 +1,261 @@
+"""Content-addressed on-disk memoization of metric results."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import asdict, is_dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Any
+import hashlib
+import inspect
+import json
+import os
+import uuid
+
+import numpy as np
+
+from sbt_agency.repro import code_version, stable_hash, write_text_atomic
+
+CACHE_FORMAT = "sbt_cache_entry"
+CACHE_ENV = "SBT_AGENCY_CACHE"
+
+_MISS = object()
+_default_cache: "MetricCache | None" = None
+_default_from_env = True
+
+
+def _key_params(obj: Any) -> Any:
+    """Reduce call arguments to something ``stable_hash`` accepts."""
+    if isinstance(obj, np.ndarray):
+        data = np.ascontiguousarray(obj)
+        return {
+            "__ndarray__": hashlib.sha256(data.tobytes()).hexdigest(),
+            "shape": list(data.shape),
+            "dtype": data.dtype.str,
+        }
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {"__dataclass__": type(obj).__qualname__, "fields": _key_params(asdict(obj))}
+    if isinstance(obj, Mapping):
+        return {k: _key_params(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_key_params(v) for v in obj]
+    if callable(obj):
+        raise TypeError(f"cannot key a cached call on callable {obj!r}")
+    return obj
+
+
+def _encode(obj: Any, arrays: dict[str, np.ndarray]) -> Any:
+    if isinstance(obj, np.ndarray):
+        name = f"a{len(arrays)}"
+        arrays[name] = obj
+        return {"__ndarray__": name}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, tuple):
+        return {"__tuple__": [_encode(v, arrays) for v in obj]}
+    if isinstance(obj, list):
+        return [_encode(v, arrays) for v in obj]
+    if isinstance(obj, dict):
+        if all(isinstance(k, str) and not k.startswith("__") for k in obj):
+            return {k: _encode(v, arrays) for k, v in obj.items()}
+        return {"__items__": [[_encode(k, arrays), _encode(v, arrays)] for k, v in obj.items()]}
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    raise TypeError(f"cannot cache a result of type {type(obj)!r}")
+
+
+def _decode(obj: Any, arrays: Mapping[str, np.ndarray]) -> Any:
+    if isinstance(obj, list):
+        return [_decode(v, arrays) for v in obj]
+    if isinstance(obj, dict):
+        if "__ndarray__" in obj:
+            return arrays[obj["__ndarray__"]]
+        if "__tuple__" in obj:
+            return tuple(_decode(v, arrays) for v in obj["__tuple__"])
+        if "__items__" in obj:
+            return {_decode(k, arrays): _decode(v, arrays) for k, v in obj["__items__"]}
+        return {k: _decode(v, arrays) for k, v in obj.items()}
+    return obj
+
+
+class MetricCache:
+    """Results stored under ``<path>/<key[:2]>/<key>.json`` (arrays in a sibling ``.npz``).
+
+    Writes go through unique temp files, and each write names its own
+    ``<key>.<id>.npz``, so concurrent puts of one key never mix or fail.
+
+    Keys are ``stable_hash`` of the function name, its bound arguments and
+    ``code_version()``, so editing the library never serves stale results.
+    Reads refresh an entry's mtime; with ``max_entries`` set, writes evict the
+    least recently used entries beyond that count.
+    """
+
+    def __init__(self, path: str | Path, *, max_entries: int | None = None) -> None:
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+
+    @staticmethod
+    def key(function: str, params: Mapping[str, Any]) -> str:
+        return stable_hash(
+            {"function": function, "params": _key_params(params), "version": code_version()}
+        )
+
+    def _file(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.json"
+
+    def _entries(self) -> list[Path]:
+        return list(self.path.glob("??/*.json"))
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def __contains__(self, key: str) -> bool:
+        return self._file(key).exists()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        path = self._file(key)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            arrays = {}
+            if payload["arrays"]:
+                with np.load(path.parent / payload["arrays"], allow_pickle=False) as npz:
+                    arrays = {name: npz[name] for name in npz.files}
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return default
+        os.utime(path)
+        return _decode(payload["result"], arrays)
+
+    def put(self, key: str, function: str, result: Any) -> None:
+        path = self._file(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays: dict[str, np.ndarray] = {}
+        encoded = _encode(result, arrays)
+        npz_name = f"{key}.{uuid.uuid4().hex}.npz" if arrays else None
+        payload = {
+            "format": CACHE_FORMAT,
+            "function": function,
+            "version": code_version(),
+            "result": encoded,
+            "arrays": npz_name,
+        }
+        # The JSON file marks a complete entry, so it is written last.
+        if npz_name is not None:
+            np.savez(path.parent / npz_name, **arrays)
+        # A replaced entry's arrays stay until the key is evicted or invalidated,
+        # since a concurrent reader may still hold the JSON that names them.
+        write_text_atomic(path, json.dumps(payload, sort_keys=True) + "\n")
+        if self.max_entries is not None:
+            self.evict(self.max_entries)
+
+    def _remove(self, path: Path) -> None:
+        path.unlink(missing_ok=True)
+        for target in path.parent.glob(f"{path.stem}.*.npz"):
+            target.unlink(missing_ok=True)
+
+    def evict(self, max_entries: int) -> int:
+        """Drop least recently used entries until at most ``max_entries`` remain."""
+        entries = self._entries()
+        excess = len(entries) - max_entries
+        if excess <= 0:
+            return 0
+        entries.sort(key=lambda p: p.stat().st_mtime_ns)
+        for path in entries[:excess]:
+            self._remove(path)
+        return excess
+
+    def invalidate(self, key: str | None = None, *, function: str | None = None) -> int:
+        """Remove one entry, every entry of ``function``, or (no arguments) everything."""
+        if key is not None:
+            path = self._file(key)
+            removed = int(path.exists())
+            self._remove(path)
+            return removed
+        removed = 0
+        for path in self._entries():
+            if function is not None:
+                try:
+                    payload = json.loads(path.read_text(encoding="utf-8"))
+                except (FileNotFoundError, json.JSONDecodeError):
+                    continue
+                if payload.get("function") != function:
+                    continue
+            self._remove(path)
+            removed += 1
+        return removed
+
+
+def set_default_cache(cache: MetricCache | str | Path | None) -> MetricCache | None:
+    """Set the cache used by ``memoize``-decorated functions; None disables caching.
+
+    Until this is called, the ``SBT_AGENCY_CACHE`` environment variable names
+    the cache directory, and caching is off when it is unset.
+    """
+    global _default_cache, _default_from_env
+    if cache is not None and not isinstance(cache, MetricCache):
+        cache = MetricCache(cache)
+    _default_cache = cache
+    _default_from_env = False
+    return cache
+
+
+def get_default_cache() -> MetricCache | None:
+    global _default_cache, _default_from_env
+    if _default_from_env:
+        path = os.environ.get(CACHE_ENV)
+        _default_cache = MetricCache(path) if path else None
+        _default_from_env = False
+    return _default_cache
+
+
+def memoize(
+    fn: Callable[..., Any] | None = None,
+    *,
+    name: str | None = None,
+    cache: MetricCache | None = None,
+) -> Any:
+    """Cache a function's results on disk, keyed on its bound arguments.
+
+    Uses ``cache`` if given, else the default cache; without either the
+    function runs as usual. Arguments may be dataclass configs, arrays
+    (keyed by content) and plain values. The wrapper exposes
+    ``cache_key(*args, **kwargs)`` and ``invalidate(*args, **kwargs)``.
+    """
+
+    def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+        function = name or f"{func.__module__}.{func.__qualname__}"
+        signature = inspect.signature(func)
+
+        def cache_key(*args: Any, **kwargs: Any) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return MetricCache.key(function, bound.arguments)
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            store = cache if cache is not None else get_default_cache()
+            if store is None:
+                return func(*args, **kwargs)
+            key = cache_key(*args, **kwargs)
+            result = store.get(key, _MISS)
+            if result is _MISS:
+                result = func(*args, **kwargs)
+                store.put(key, function, result)
+            return result
+
+        def invalidate(*args: Any, **kwargs: Any) -> int:
+            store = cache if cache is not None else get_default_cache()
+            if store is None:
+                return 0
+            return store.invalidate(cache_key(*args, **kwargs))
+
+        wrapper.cache_key = cache_key
+        wrapper.invalidate = invalidate
+        return wrapper
+
+    if fn is not None:
+        return decorate(fn)
+    return decorate
@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 from itertools import product
-from typing import Callable, Sequence
+from typing import Sequence
 
 import numpy as np
 
 from sbt_agency.kernel import FiniteKernel
+from sbt_agency.lens import ProjLike, as_lens
 
 
 def enumerate_action_seqs(actions: Sequence[int], H: int) -> list[tuple[int, ...]]:
@@ -28,38 +29,145 @@ def _validate_dist(dist: np.ndarray, n_states: int, atol: float = 1e-12) -> np.n
     return dist
 
 
-def build_channel_matrix(
+def _initial_dist(kernel: FiniteKernel, s0: int | np.ndarray) -> np.ndarray:
+    if isinstance(s0, (int, np.integer)):
+        s0_int = int(s0)
+        if s0_int < 0 or s0_int >= kernel.n_states:
+            raise IndexError("s0 state out of range")
+        return kernel.delta(s0_int)
+    return _validate_dist(np.asarray(s0, dtype=float), kernel.n_states)
+
+
+def rollout_dists(
     kernel: FiniteKernel,
-    s0: int | np.ndarray,
+    dist0: np.ndarray,
     action_seqs: Sequence[Sequence[int]],
-    proj: Callable[[int], int],
 ) -> np.ndarray:
-    """Build a channel matrix over projected outputs for action sequences."""
-    n_states = kernel.n_states
+    """Return final state distributions for each action sequence.
 
-    out_idx = np.zeros(n_states, dtype=int)
-    for s in range(n_states):
-        y = int(proj(s))
-        if y < 0:
-            raise ValueError("proj must return non-negative output indices")
-        out_idx[s] = y
-    n_outputs = int(out_idx.max()) + 1
+    Sequences that share a prefix reuse its propagated distribution, so a full
+    product of H-step sequences costs one matvec per distinct prefix.
+    """
+    dist0 = np.asarray(dist0, dtype=float)
+    if dist0.ndim != 1 or dist0.shape[0] != kernel.n_states:
+        raise ValueError("dist0 must be a 1D array of shape (n_states,)")
 
-    if isinstance(s0, (int, np.integer)):
-        s0_int = int(s0)
-        if s0_int < 0 or s0_int >= n_states:
-            raise IndexError("s0 state out of range")
-        dist0 = kernel.delta(s0_int)
-    else:
-        dist0 = _validate_dist(np.asarray(s0, dtype=float), n_states)
-
-    W = np.zeros((len(action_seqs), n_outputs), dtype=float)
+    cache: dict[tuple[int, ...], np.ndarray] = {(): dist0}
+    out = np.zeros((len(action_seqs), kernel.n_states), dtype=float)
     for i, seq in enumerate(action_seqs):
-        dist = kernel.rollout_dist(dist0, seq)
-        W[i] = np.bincount(out_idx, weights=dist, minlength=n_outputs)
+        seq = tuple(int(a) for a in seq)
+        k = len(seq)
+        while seq[:k] not in cache:
+            k -= 1
+        dist = cache[seq[:k]]
+        for j in range(k, len(seq)):
+            dist = kernel.step_dist(dist, seq[j])
+            cache[seq[: j + 1]] = dist
+        out[i] = dist
+    return out
+
+
+def build_channel_matrices(
+    kernel: FiniteKernel,
+    s0: int | np.ndarray,
+    action_seqs: Sequence[Sequence[int]],
+    projs: Sequence[ProjLike],
+) -> list[np.ndarray]:
+    """Build one channel matrix per projection from a single propagation pass."""
+    lenses = [as_lens(proj, kernel.n_states) for proj in projs]
+    dists = rollout_dists(kernel, _initial_dist(kernel, s0), action_seqs)
+
+    out = []
+    for lens in lenses:
+        W = lens.push(dists)
+        if not np.allclose(W.sum(axis=1), 1.0, atol=1e-12, rtol=0.0):
+            raise ValueError("Rows of W must sum to 1 within tolerance")
+        out.append(W)
+    return out
+
+
+def horizon_dists(
+    kernel: FiniteKernel,
+    dist0: np.ndarray,
+    actions: Sequence[int],
+    H_max: int,
+) -> list[np.ndarray]:
+    """Return final distributions for all sequences of each length 0..H_max.
+
+    Entry h has shape (len(actions)**h, n_states) with rows in
+    ``enumerate_action_seqs(actions, h)`` order; level h+1 is obtained from
+    level h by one step per action rather than by replaying each sequence.
+    """
+    if H_max < 0:
+        raise ValueError("H_max must be non-negative")
+    dist0 = np.asarray(dist0, dtype=float)
+    if dist0.ndim != 1 or dist0.shape[0] != kernel.n_states:
+        raise ValueError("dist0 must be a 1D array of shape (n_states,)")
+    levels = [dist0[None, :]]
+    for _ in range(H_max):
+        prev = levels[-1]
+        nxt = np.stack([prev @ kernel.P[int(a)] for a in actions], axis=1)
+        levels.append(nxt.reshape(-1, kernel.n_states))
+    return levels
+
+
+def build_channel_matrices_by_horizon(
+    kernel: FiniteKernel,
+    s0: int | np.ndarray,
+    actions: Sequence[int],
+    H_max: int,
+    proj: ProjLike,
+) -> list[np.ndarray]:
+    """Channel matrices for horizons 1..H_max from one incremental propagation.
+
+    Entry h - 1 equals ``build_channel_matrix(kernel, s0,
+    enumerate_action_seqs(actions, h), proj)``.
+    """
+    lens = as_lens(proj, kernel.n_states)
+    levels = horizon_dists(kernel, _initial_dist(kernel, s0), actions, H_max)
+    return [lens.push(dists) for dists in levels[1:]]
+
 
-    if not np.allclose(W.sum(axis=1), 1.0, atol=1e-12, rtol=0.0):
-        raise ValueError("Rows of W must sum to 1 within tolerance")
+def build_channel_matrices_for_states(
+    kernel: FiniteKernel,
+    states: Sequence[int],
+    actions: Sequence[int],
+    H: int,
+    proj: ProjLike,
+    chunk_size: int = 64,
+) -> np.ndarray:
+    """Channel matrices of many start states at once, shape (n, len(actions)**H, n_out).
 
-    return W
+    Row order follows ``enumerate_action_seqs(actions, H)``. States are
+    propagated together in chunks of ``chunk_size`` to bound memory.
+    """
+    if H < 0:
+        raise ValueError("H must be non-negative")
+    lens = as_lens(proj, kernel.n_states)
+    states = np.asarray(states, dtype=np.int64)
+    if np.any(states < 0) or np.any(states >= kernel.n_states):
+        raise IndexError("s0 state out of range")
+    out = np.zeros((states.shape[0], len(actions) ** H, lens.n_outputs), dtype=float)
+    for start in range(0, states.shape[0], chunk_size):
+        block = states[start : start + chunk_size]
+        dists = np.zeros((block.shape[0], 1, kernel.n_states), dtype=float)
+        dists[np.arange(block.shape[0]), 0, block] = 1.0
+        for _ in range(H):
+            nxt = np.stack([dists @ kernel.P[int(a)] for a in actions], axis=2)
+            dists = nxt.reshape(block.shape[0], -1, kernel.n_states)
+        out[start : start + block.shape[0]] = lens.push(dists)
+    return out
+
+
+def build_channel_matrix(
+    kernel: FiniteKernel,
+    s0: int | np.ndarray,
+    action_seqs: Sequence[Sequence[int]],
+    proj: ProjLike,
+) -> np.ndarray:
+    """Build a channel matrix over projected outputs for action sequences.
 
+    ``proj`` may be a ``Lens``, an ``(n_states,)`` integer label array or a
+    per-state callable.
+    """
+    return build_channel_matrices(kernel, s0, action_seqs, [proj])[0]
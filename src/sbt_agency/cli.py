@@ -0,0 +1,81 @@
+"""The ``sbt-agency`` command: every experiment and the audit in one interpreter.
+
+Subcommands run in-process, so numpy, the library and the metric caches are
+loaded once. ``all`` runs the out-of-date experiments through
+``sbt_agency.pipeline``, whose forked workers inherit those imports.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+import argparse
+import importlib
+import os
+import sys
+
+from sbt_agency.cache import set_default_cache
+
+COMMANDS = {
+    "rollouts": ("sbt_agency.experiments.rollouts", "baseline rollouts and a trace"),
+    "packaging": ("sbt_agency.experiments.packaging_ring", "packaging ring on/off"),
+    "ablations": ("sbt_agency.experiments.ablations", "primitive ablations summary"),
+    "sweep": ("sbt_agency.experiments.sweep_noise_maintenance", "noise x maintenance sweep"),
+    "protocol": ("sbt_agency.experiments.protocol_horizon", "protocol horizon curves"),
+    "learning": ("sbt_agency.experiments.learning_theta", "learning-theta curves"),
+    "all": ("sbt_agency.experiments.run_all", "out-of-date experiments, then a strict audit"),
+    "export": ("sbt_agency.experiments.paper_assets", "paper figures, table and numbers"),
+}
+
+
+def _audit(argv: Sequence[str]) -> int:
+    from sbt_agency.audit import audit_results
+
+    parser = argparse.ArgumentParser(prog="sbt-agency audit")
+    parser.add_argument("--root", default="results")
+    parser.add_argument("--strict", action="store_true")
+    args = parser.parse_args(argv)
+
+    result = audit_results(args.root, strict=args.strict)
+    print(
+        f"AUDIT summary: checked={result['checked']} errors={result['errors']} "
+        f"warnings={result['warnings']}"
+    )
+    if result["errors"] > 0:
+        return 1
+    if args.strict and result["warnings"] > 0:
+        return 1
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="sbt-agency",
+        description="Run the paper experiments; options after the command go to it.",
+        epilog="commands: "
+        + ", ".join(f"{name} ({doc})" for name, (_, doc) in COMMANDS.items())
+        + ", audit (check result artifacts)",
+    )
+    parser.add_argument("--cache", default=None, help="metric cache directory")
+    parser.add_argument("--chdir", default=None, help="working directory holding results/")
+    parser.add_argument("command", choices=[*COMMANDS, "audit"])
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    if args.cache is not None:
+        set_default_cache(args.cache)
+    if args.chdir is not None:
+        os.chdir(args.chdir)
+    if args.command == "audit":
+        return _audit(args.args)
+    module = importlib.import_module(COMMANDS[args.command][0])
+    argv0 = sys.argv
+    sys.argv = [f"sbt-agency {args.command}", *args.args]  # names the command in usage lines
+    try:
+        status = module.main(args.args)
+    finally:
+        sys.argv = argv0
+    return 0 if status is None else int(status)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
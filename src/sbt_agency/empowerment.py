@@ -7,6 +7,8 @@ from typing import Callable, Sequence, Tuple
 
 import numpy as np
 
+from sbt_agency.cache import memoize
+
 
 def _validate_channel_matrix(W: np.ndarray, atol: float = 1e-12) -> np.ndarray:
     W = np.asarray(W, dtype=float)
@@ -23,13 +25,25 @@ def _validate_channel_matrix(W: np.ndarray, atol: float = 1e-12) -> np.ndarray:
 
 
 def blahut_arimoto(
-    W: np.ndarray, tol: float = 1e-12, max_iter: int = 10_000
+    W: np.ndarray,
+    tol: float = 1e-12,
+    max_iter: int = 10_000,
+    p0: np.ndarray | None = None,
 ) -> Tuple[float, np.ndarray]:
-    """Compute channel capacity in nats and the optimal input distribution."""
+    """Compute channel capacity in nats and the optimal input distribution.
+
+    ``p0`` optionally warm-starts the input distribution (uniform by default).
+    """
     W = _validate_channel_matrix(W)
     n_inputs = W.shape[0]
 
-    p = np.full(n_inputs, 1.0 / n_inputs, dtype=float)
+    if p0 is None:
+        p = np.full(n_inputs, 1.0 / n_inputs, dtype=float)
+    else:
+        p = np.asarray(p0, dtype=float)
+        if p.shape != (n_inputs,) or np.any(p < 0.0) or p.sum() <= 0.0:
+            raise ValueError("p0 must be a nonnegative vector over the channel inputs")
+        p = p / p.sum()
     prev_C = -math.inf
 
     for _ in range(max_iter):
@@ -64,6 +78,57 @@ def blahut_arimoto(
     return float(C), p
 
 
+@memoize
+def blahut_arimoto_batch(
+    W: np.ndarray, tol: float = 1e-12, max_iter: int = 10_000
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Run ``blahut_arimoto`` on a stack of channels of shape (B, n_inputs, n_outputs).
+
+    Each channel iterates until its own stopping rule fires, exactly as in the
+    single-channel solver. Returns capacities in nats (B,) and inputs (B, n_inputs).
+    """
+    W = np.asarray(W, dtype=float)
+    if W.ndim != 3:
+        raise ValueError("W must be a 3D array with shape (B, n_inputs, n_outputs)")
+    if not np.all(np.isfinite(W)):
+        raise ValueError("W must contain only finite values")
+    if np.any(W < 0.0):
+        raise ValueError("W must have nonnegative entries")
+    if not np.allclose(W.sum(axis=2), 1.0, atol=1e-12, rtol=0.0):
+        raise ValueError("Rows of W must sum to 1 within tolerance")
+    n_batch, n_inputs, _n_outputs = W.shape
+
+    positive = W > 0.0
+    log_W = np.log(np.where(positive, W, 1.0))
+    p = np.full((n_batch, n_inputs), 1.0 / max(n_inputs, 1), dtype=float)
+    C = np.zeros(n_batch, dtype=float)
+    prev_C = np.full(n_batch, -math.inf)
+    active = np.arange(n_batch)
+
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        Wa = W[active]
+        q = np.einsum("bi,biy->by", p[active], Wa)
+        q_pos = q > 0.0
+        log_q = np.log(np.where(q_pos, q, 1.0))
+        mask = positive[active] & q_pos[:, None, :]
+        D = np.where(mask, Wa * (log_W[active] - log_q[:, None, :]), 0.0).sum(axis=2)
+
+        exp_D = np.exp(D - D.max(axis=1, keepdims=True))
+        p_new = exp_D / exp_D.sum(axis=1, keepdims=True)
+        C_new = (p_new * D).sum(axis=1)
+
+        p[active] = p_new
+        C[active] = C_new
+        done = np.abs(C_new - prev_C[active]) < tol
+        prev_C[active] = C_new
+        active = active[~done]
+
+    return C, p
+
+
+@memoize
 def capacity_bits(W: np.ndarray, tol: float = 1e-12, max_iter: int = 10_000) -> float:
     """Compute channel capacity in bits."""
     C_nats, _ = blahut_arimoto(W, tol=tol, max_iter=max_iter)
@@ -98,3 +163,87 @@ def feasible_capacity_bits(
 
     Wf = W[feasible_idx, :]
     return capacity_bits(Wf, tol=tol, max_iter=max_iter)
+
+
+def feasible_capacity_bits_batch(
+    W: np.ndarray,
+    seqs: Sequence[Sequence[int]],
+    cost_fn: Callable[[int], float],
+    budgets: Sequence[float] | np.ndarray,
+    tol: float = 1e-12,
+    max_iter: int = 10_000,
+) -> np.ndarray:
+    """``feasible_capacity_bits`` for a stack of channels with per-channel budgets.
+
+    Channels sharing a budget share the feasible sequence set and are solved
+    together with ``blahut_arimoto_batch``.
+    """
+    W = np.asarray(W, dtype=float)
+    budgets = np.asarray(budgets, dtype=float)
+    if W.ndim != 3 or W.shape[1] != len(seqs):
+        raise ValueError("W must have shape (B, len(seqs), n_outputs)")
+    if budgets.shape != (W.shape[0],):
+        raise ValueError("budgets must have one entry per channel")
+
+    seq_costs = np.zeros(len(seqs), dtype=float)
+    for i, seq in enumerate(seqs):
+        total_cost = 0.0
+        for action in seq:
+            total_cost += float(cost_fn(int(action)))
+        seq_costs[i] = total_cost
+
+    out = np.zeros(W.shape[0], dtype=float)
+    for budget in np.unique(budgets):
+        rows = np.flatnonzero(budgets == budget)
+        feasible = np.flatnonzero(seq_costs <= budget + 1e-12)
+        if feasible.size == 0:
+            continue
+        C_nats, _p = blahut_arimoto_batch(W[np.ix_(rows, feasible)], tol=tol, max_iter=max_iter)
+        out[rows] = C_nats / math.log(2.0)
+    return out
+
+
+def feasible_capacity_curve_bits(
+    channels: Sequence[np.ndarray],
+    actions: Sequence[int],
+    cost_fn: Callable[[int], float],
+    budget: float,
+    *,
+    warm_start: bool = True,
+    tol: float = 1e-12,
+    max_iter: int = 10_000,
+) -> list[float]:
+    """Feasible capacities (bits) for horizons 1..len(channels).
+
+    ``channels[h - 1]`` has one row per sequence of
+    ``enumerate_action_seqs(actions, h)``. Sequence costs are extended one
+    action at a time, and with ``warm_start`` each solve starts from the
+    previous horizon's optimal input distribution, spread uniformly over the
+    extensions of each sequence.
+    """
+    action_costs = np.array([float(cost_fn(int(a))) for a in actions], dtype=float)
+    n_actions = len(actions)
+    seq_costs = np.zeros(1, dtype=float)
+    p_prev = None
+    out = []
+    for W in channels:
+        W = np.asarray(W, dtype=float)
+        seq_costs = (seq_costs[:, None] + action_costs[None, :]).ravel()
+        if W.ndim != 2 or W.shape[0] != seq_costs.shape[0]:
+            raise ValueError("channels must have len(actions)**h rows at horizon h")
+        feasible = seq_costs <= budget + 1e-12
+        if not np.any(feasible):
+            out.append(0.0)
+            p_prev = None
+            continue
+
+        p0 = None
+        if warm_start and p_prev is not None:
+            lifted = np.repeat(p_prev, n_actions)[feasible]
+            if lifted.sum() > 0.0:
+                p0 = lifted
+        C_nats, p_opt = blahut_arimoto(W[feasible], tol=tol, max_iter=max_iter, p0=p0)
+        out.append(C_nats / math.log(2.0))
+        p_prev = np.zeros(W.shape[0], dtype=float)
+        p_prev[feasible] = p_opt
+    return out
@@ -3,11 +3,11 @@
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass
-from typing import Callable
 
 import numpy as np
 
 from sbt_agency.kernel import FiniteKernel
+from sbt_agency.lens import Lens
 
 
 @dataclass(frozen=True)
@@ -145,12 +145,14 @@ def build_kernel(
 
     kernel = FiniteKernel(P)
 
-    def proj_y(s_idx: int) -> int:
-        return state_tuples[s_idx][0]
+    tuple_arr = np.array(state_tuples, dtype=np.int64).reshape(n_states, 6)
+    y_arr, phi_arr, r_arr = tuple_arr[:, 0], tuple_arr[:, 2], tuple_arr[:, 3]
 
-    def proj_macro(s_idx: int) -> int:
-        y_val, _u, phi_val, r_val, _g, _theta = state_tuples[s_idx]
-        return (phi_val * (config.R_max + 1) + r_val) * config.L + y_val
+    proj_y = Lens(y_arr, config.L)
+    proj_macro = Lens(
+        (phi_arr * (config.R_max + 1) + r_arr) * config.L + y_arr,
+        config.m_phase * (config.R_max + 1) * config.L,
+    )
 
     projections = {
         "proj_y": proj_y,
@@ -162,6 +164,14 @@ def build_kernel(
         "action_names": action_names,
         "state_tuples": state_tuples,
         "tuple_to_state": tuple_to_state,
+        "state_shape": (
+            config.L,
+            2,
+            config.m_phase,
+            config.R_max + 1,
+            config.g_size,
+            config.theta_max + 1,
+        ),
         "dims": {
             "L": config.L,
             "m_phase": config.m_phase,
@@ -0,0 +1,121 @@
+"""Exact evaluation of stationary policies on a FiniteKernel."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from sbt_agency.kernel import FiniteKernel, PolicyLike, SuccessorTable, policy_table
+
+
+def _state_mask(mask: np.ndarray, n_states: int, name: str) -> np.ndarray:
+    mask = np.asarray(mask, dtype=bool)
+    if mask.shape != (n_states,):
+        raise ValueError(f"{name} must have shape (n_states,)")
+    return mask
+
+
+def _backward_reachable(support: np.ndarray, seeds: np.ndarray, allowed: np.ndarray) -> np.ndarray:
+    """States in ``allowed`` that reach ``seeds`` along support edges (seeds included)."""
+    reached = seeds.copy()
+    frontier = seeds.copy()
+    while np.any(frontier):
+        frontier = support[:, frontier].any(axis=1) & allowed & ~reached
+        reached |= frontier
+    return reached
+
+
+def survival_probability(
+    kernel: FiniteKernel,
+    policy: PolicyLike,
+    safe_mask: np.ndarray,
+    horizon: int,
+    *,
+    successors: SuccessorTable | None = None,
+) -> np.ndarray:
+    """Probability that S_0, ..., S_horizon all lie in the safe set, per start state.
+
+    Computed by backward recursion over the sparse successor table, for every
+    start state at once.
+    """
+    if horizon < 0:
+        raise ValueError("horizon must be non-negative")
+    safe = _state_mask(safe_mask, kernel.n_states, "safe_mask").astype(float)
+    table = policy_table(policy, kernel.n_states, kernel.n_actions)
+    if successors is None:
+        successors = kernel.successors()
+    v = safe
+    for _ in range(horizon):
+        v = safe * np.einsum("sa,as->s", table, successors.expect(v))
+    return v
+
+
+def expected_hitting_time(
+    kernel: FiniteKernel,
+    policy: PolicyLike,
+    target_mask: np.ndarray,
+    *,
+    atol: float = 0.0,
+) -> np.ndarray:
+    """Expected number of steps until the target set is first entered.
+
+    Target states have time 0. States from which the target is missed with
+    positive probability have infinite expected time; the rest are obtained
+    from one linear solve.
+    """
+    target = _state_mask(target_mask, kernel.n_states, "target_mask")
+    T = kernel.policy_matrix(policy)
+    support = T > atol
+
+    can_hit = _backward_reachable(support, target, np.ones_like(target))
+    may_miss = _backward_reachable(support, ~can_hit, ~target)
+    solve = ~target & ~may_miss
+
+    times = np.full(kernel.n_states, np.inf, dtype=float)
+    times[target] = 0.0
+    if np.any(solve):
+        Q = T[np.ix_(solve, solve)]
+        times[solve] = np.linalg.solve(np.eye(Q.shape[0]) - Q, np.ones(Q.shape[0]))
+    return times
+
+
+def expected_depletion_time(
+    kernel: FiniteKernel,
+    policy: PolicyLike,
+    ledger: Sequence[int] | np.ndarray,
+    level: int = 0,
+) -> np.ndarray:
+    """Expected steps until the ledger value first drops to ``level`` or below."""
+    return expected_hitting_time(kernel, policy, np.asarray(ledger) <= level)
+
+
+def occupancy_measure(
+    kernel: FiniteKernel,
+    policy: PolicyLike,
+    *,
+    horizon: int | None = None,
+    discount: float | None = None,
+) -> np.ndarray:
+    """Expected state visits for every start state, as an (n_states, n_states) matrix.
+
+    With ``horizon`` N, row s is sum_{t<N} delta_s T^t; with ``discount`` g it
+    is sum_t g^t delta_s T^t = delta_s (I - g T)^-1. Exactly one must be given.
+    """
+    if (horizon is None) == (discount is None):
+        raise ValueError("give exactly one of horizon or discount")
+    T = kernel.policy_matrix(policy)
+    n = kernel.n_states
+    if discount is not None:
+        if not 0.0 <= discount < 1.0:
+            raise ValueError("discount must be in [0, 1)")
+        return np.linalg.solve(np.eye(n) - discount * T, np.eye(n))
+
+    if horizon < 0:
+        raise ValueError("horizon must be non-negative")
+    occupancy = np.zeros((n, n), dtype=float)
+    power = np.eye(n)
+    for _ in range(horizon):
+        occupancy += power
+        power = power @ T
+    return occupancy
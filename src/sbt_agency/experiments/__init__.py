@@ -0,0 +1,6 @@
+"""The paper's experiments as importable modules.
+
+Each module exposes ``main(argv)`` returning an exit status, writes under
+``results/`` relative to the working directory, and is run by the
+``sbt-agency`` command (see ``sbt_agency.cli``) or the pipeline.
+"""
@@ -0,0 +1,85 @@
+"""Measure empowerment vs theta for learning config."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import json
+import platform
+
+import numpy as np
+
+from sbt_agency.exp_configs import cfg_learning_theta
+from sbt_agency.metrics import compute_empowerment_medians_by_theta
+from sbt_agency.plotting import matplotlib_version, plot_lines
+from sbt_agency.repro import stable_hash
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-plots", action="store_true", help="skip the figure")
+    args = parser.parse_args(argv)
+
+    cfg = cfg_learning_theta()
+    medians = compute_empowerment_medians_by_theta(
+        cfg,
+        safe_r_min=1,
+        empowerment_H=2,
+        restrict_u=0,
+        restrict_phi=0,
+        action_subset=("LEFT", "RIGHT"),
+    )
+
+    m0 = medians.get(0, 0.0)
+    m1 = medians.get(1, 0.0)
+    m2 = medians.get(2, 0.0)
+
+    config_hash = stable_hash(asdict(cfg))
+
+    out_dir = Path("results") / "learning"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    json_path = out_dir / f"learning_theta_{config_hash}.json"
+    png_path = out_dir / f"learning_theta_{config_hash}.png"
+
+    payload = {
+        "created_at_utc": datetime.now(timezone.utc).isoformat(),
+        "versions": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "matplotlib": matplotlib_version(),
+        },
+        "config_hash": config_hash,
+        "config": asdict(cfg),
+        "safe_r_min": 1,
+        "empowerment_H": 2,
+        "restrict_u": 0,
+        "restrict_phi": 0,
+        "action_subset": ["LEFT", "RIGHT"],
+        "medians_by_theta": {"0": m0, "1": m1, "2": m2},
+        "theta_values": [0, 1, 2],
+    }
+    json_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+    if not args.no_plots:
+        plot_lines(
+            png_path,
+            [0, 1, 2],
+            {None: [m0, m1, m2]},
+            xlabel="theta",
+            ylabel="median empowerment (bits)",
+            figsize=(5, 3.5),
+        )
+
+    print(f"config_hash={config_hash}")
+    print(f"medians: theta0={m0} theta1={m1} theta2={m2}")
+    print(f"json: {json_path}")
+    if not args.no_plots:
+        print(f"png: {png_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
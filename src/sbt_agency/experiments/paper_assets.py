@@ -0,0 +1,430 @@
+"""Export stable-named paper assets from results."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import asdict
+from pathlib import Path
+import argparse
+import csv
+import json
+import shutil
+
+import numpy as np
+
+from sbt_agency.env_ring_agent import build_kernel
+from sbt_agency.exp_configs import (
+    ablations_suite,
+    cfg_learning_theta,
+    cfg_packaging_ring_off,
+    cfg_packaging_ring_on,
+    sweep_noise_maintenance_run_id,
+)
+from sbt_agency.experiments import run_all
+from sbt_agency.holonomy import holonomy_tv
+from sbt_agency.pipeline import file_digest
+from sbt_agency.repro import code_version, stable_hash
+
+MANIFEST_PATH = Path("paper") / "generated" / "export_manifest.json"
+MANIFEST_FORMAT = "sbt_export_manifest"
+
+
+class _Manifest:
+    """Input hashes each exported asset was generated from.
+
+    An asset is rebuilt only when its inputs differ from the recorded ones or
+    one of its outputs is missing or was edited since.
+    """
+
+    def __init__(self, root: Path, force: bool = False) -> None:
+        self.root = root
+        self.path = root / MANIFEST_PATH
+        self.force = force
+        self.assets: dict[str, dict] = {}
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("format") == MANIFEST_FORMAT:
+                self.assets = data["assets"]
+        self.regenerated: list[str] = []
+
+    def asset(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+    def current(self, asset: str, inputs: dict) -> dict | None:
+        """The recorded entry if ``asset`` is up to date for ``inputs``, else None."""
+        entry = self.assets.get(asset)
+        if self.force or entry is None or entry["inputs"] != inputs:
+            return None
+        for rel, digest in entry["outputs"].items():
+            path = self.root / rel
+            if not path.is_file() or file_digest(path) != digest:
+                return None
+        return entry
+
+    def record(
+        self, asset: str, inputs: dict, outputs: list[Path], values: dict | None = None
+    ) -> None:
+        self.assets[asset] = {
+            "inputs": inputs,
+            "outputs": {self.asset(path): file_digest(path) for path in outputs},
+            "values": values or {},
+        }
+        self.regenerated.append(asset)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"format": MANIFEST_FORMAT, "assets": self.assets}
+        self.path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def _exporter_inputs(**inputs: object) -> dict:
+    return {"exporter": file_digest(__file__), **inputs}
+
+
+def _source_digest(src: Path, what: str) -> str:
+    if not src.exists():
+        raise SystemExit(f"Missing {what}: {src}")
+    return file_digest(src)
+
+
+def _copy_or_fail(manifest: _Manifest, src: Path, dst: Path) -> None:
+    asset = manifest.asset(dst)
+    inputs = {"source": _source_digest(src, "source asset")}
+    if manifest.current(asset, inputs) is not None:
+        return
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(src, dst)
+    manifest.record(asset, inputs, [dst])
+
+
+def _export_figures(manifest: _Manifest) -> list[Path]:
+    figures_dir = manifest.root / "paper" / "figures"
+
+    hash_off = stable_hash(asdict(cfg_packaging_ring_off()))
+    hash_on = stable_hash(asdict(cfg_packaging_ring_on()))
+    packaging_src = (
+        manifest.root
+        / "results"
+        / "packaging"
+        / f"packaging_ring_{hash_off}_{hash_on}.png"
+    )
+    packaging_dst = figures_dir / "fig_packaging_ring.png"
+    _copy_or_fail(manifest, packaging_src, packaging_dst)
+
+    suite = ablations_suite()
+    hash_protocol_on = stable_hash(asdict(suite["full"]))
+    hash_protocol_off = stable_hash(asdict(suite["no_protocol"]))
+    protocol_src = (
+        manifest.root
+        / "results"
+        / "protocol"
+        / f"protocol_horizon_{hash_protocol_on}_{hash_protocol_off}.png"
+    )
+    protocol_dst = figures_dir / "fig_protocol_horizon.png"
+    _copy_or_fail(manifest, protocol_src, protocol_dst)
+
+    run_id = sweep_noise_maintenance_run_id()
+    sweep_k_src = (
+        manifest.root
+        / "results"
+        / "sweeps"
+        / f"noise_maintenance_K_{run_id}.png"
+    )
+    sweep_e_src = (
+        manifest.root
+        / "results"
+        / "sweeps"
+        / f"noise_maintenance_E_{run_id}.png"
+    )
+    sweep_k_dst = figures_dir / "fig_sweep_K.png"
+    sweep_e_dst = figures_dir / "fig_sweep_E.png"
+    _copy_or_fail(manifest, sweep_k_src, sweep_k_dst)
+    _copy_or_fail(manifest, sweep_e_src, sweep_e_dst)
+
+    hash_learning = stable_hash(asdict(cfg_learning_theta()))
+    learning_src = (
+        manifest.root
+        / "results"
+        / "learning"
+        / f"learning_theta_{hash_learning}.png"
+    )
+    learning_dst = figures_dir / "fig_learning_theta.png"
+    _copy_or_fail(manifest, learning_src, learning_dst)
+
+    return [
+        packaging_dst,
+        protocol_dst,
+        sweep_k_dst,
+        sweep_e_dst,
+        learning_dst,
+    ]
+
+
+def _export_ablations_table(manifest: _Manifest) -> Path:
+    summary_path = manifest.root / "results" / "ablations" / "summary.csv"
+    out_path = manifest.root / "paper" / "generated" / "ablations_summary.tex"
+    inputs = _exporter_inputs(summary=_source_digest(summary_path, "ablations summary"))
+    if manifest.current(manifest.asset(out_path), inputs) is not None:
+        return out_path
+
+    rows = []
+    with summary_path.open("r", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            rows.append(row)
+
+    rows.sort(key=lambda r: r["name"])
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _fmt(val: str) -> str:
+        try:
+            num = float(val)
+        except ValueError:
+            return val
+        if val.isdigit():
+            return val
+        return f"{num:.3f}"
+
+    with out_path.open("w", encoding="utf-8") as f:
+        f.write("\\begin{tabular}{lrrr}\n")
+        f.write("\\toprule\n")
+        f.write("name & kernel size viable & empowerment median on K & idempotence defect \\\\\n")
+        f.write("\\midrule\n")
+        for row in rows:
+            name = row["name"].replace("_", " ")
+            f.write(
+                f"{name} & {_fmt(row['kernel_size_viable'])} & "
+                f"{_fmt(row['empowerment_median_on_K'])} & {_fmt(row['idempotence_defect'])} \\\\\n"
+            )
+        f.write("\\bottomrule\n")
+        f.write("\\end{tabular}\n")
+
+    manifest.record(manifest.asset(out_path), inputs, [out_path])
+    return out_path
+
+
+def _select_holonomy_state(
+    kernel_on: object,
+    projections_on: dict,
+    metadata_on: dict,
+    kernel_off: object,
+    projections_off: dict,
+    metadata_off: dict,
+    seqs_on: list[tuple[int, int]],
+    seqs_off: list[tuple[int, int]],
+) -> tuple[int, int, tuple[int, int, int, int, int, int], float, float]:
+    state_tuples = metadata_on["state_tuples"]
+    tuple_to_state_off = metadata_off["tuple_to_state"]
+    tv_on = holonomy_tv(kernel_on, projections_on["proj_y"], actions=seqs_on[0])[:, 0, 1]
+    tv_off = holonomy_tv(kernel_off, projections_off["proj_y"], actions=seqs_off[0])[:, 0, 1]
+
+    candidates = np.array(
+        [i for i, (_y, u, _phi, r, _g, _theta) in enumerate(state_tuples) if r >= 1 and u == 0],
+        dtype=np.int64,
+    )
+    if candidates.size == 0:
+        raise SystemExit("No witness state with r>=1 and u==0 found.")
+    off_index = np.array([tuple_to_state_off[state_tuples[i]] for i in candidates], dtype=np.int64)
+
+    # Smallest TV with the protocol off, then largest with it on, then lowest index.
+    # Rounding makes symmetric states tie exactly instead of on rounding noise.
+    key_on, key_off = np.round(tv_on[candidates], 12), np.round(tv_off[off_index], 12)
+    best = np.lexsort((candidates, -key_on, key_off))[0]
+    idx_on, idx_off = int(candidates[best]), int(off_index[best])
+    state_tuple = tuple(int(v) for v in state_tuples[idx_on])
+    return idx_on, idx_off, state_tuple, float(tv_on[idx_on]), float(tv_off[idx_off])
+
+
+def _export_holonomy_witness(manifest: _Manifest) -> dict:
+    suite = ablations_suite()
+    out_path = manifest.root / "paper" / "generated" / "holonomy_witness.tex"
+    # The witness is computed from the configs alone, so the library code is an input.
+    inputs = _exporter_inputs(
+        config_on=stable_hash(asdict(suite["full"])),
+        config_off=stable_hash(asdict(suite["no_protocol"])),
+        code_version=code_version(),
+    )
+    entry = manifest.current(manifest.asset(out_path), inputs)
+    if entry is not None:
+        return {"path": out_path, **entry["values"]}
+
+    kernel_on, projections_on, metadata_on = build_kernel(suite["full"])
+    action_names_on = metadata_on["action_names"]
+    right_on = action_names_on.index("RIGHT")
+    left_on = action_names_on.index("LEFT")
+    seq_alpha_on = (right_on, left_on)
+    seq_beta_on = (left_on, right_on)
+    seqs_on = [seq_alpha_on, seq_beta_on]
+
+    kernel_off, projections_off, metadata_off = build_kernel(suite["no_protocol"])
+    action_names_off = metadata_off["action_names"]
+    right_off = action_names_off.index("RIGHT")
+    left_off = action_names_off.index("LEFT")
+    seq_alpha_off = (right_off, left_off)
+    seq_beta_off = (left_off, right_off)
+    seqs_off = [seq_alpha_off, seq_beta_off]
+
+    s_idx_on, s_idx_off, state_tuple, tvd_on, tvd_off = _select_holonomy_state(
+        kernel_on,
+        projections_on,
+        metadata_on,
+        kernel_off,
+        projections_off,
+        metadata_off,
+        seqs_on,
+        seqs_off,
+    )
+
+    y, u, phi, r, _g, _theta = state_tuple
+    witness_tex = (
+        "\\[\n"
+        "\\mathrm{TV}\\!\\left(W_{\\alpha},W_{\\beta}\\right)\n"
+        "=\n"
+        "\\begin{cases}\n"
+        f"{tvd_on:.4f} & \\text{{protocol ON}},\\\\\n"
+        f"{tvd_off:.4f} & \\text{{protocol OFF}},\n"
+        "\\end{cases}\n"
+        "\\qquad\n"
+        f"s^\\star:\\ (y={int(y)},\\ r={int(r)},\\ \\phi={int(phi)},\\ u={int(u)}),\\ \n"
+        "\\alpha=(\\mathrm{R},\\mathrm{L}),\\ \\beta=(\\mathrm{L},\\mathrm{R}).\n"
+        "\\]\n"
+    )
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(witness_tex, encoding="utf-8")
+
+    values = {
+        "tvd_on": tvd_on,
+        "tvd_off": tvd_off,
+        "state": {"y": int(y), "r": int(r), "phi": int(phi), "u": int(u)},
+    }
+    manifest.record(manifest.asset(out_path), inputs, [out_path], values)
+    return {"path": out_path, **values}
+
+
+def _export_numbers_snapshot(manifest: _Manifest) -> Path:
+    hash_off = stable_hash(asdict(cfg_packaging_ring_off()))
+    hash_on = stable_hash(asdict(cfg_packaging_ring_on()))
+    packaging_json = (
+        manifest.root
+        / "results"
+        / "packaging"
+        / f"packaging_ring_{hash_off}_{hash_on}.json"
+    )
+    suite = ablations_suite()
+    protocol_hash_on = stable_hash(asdict(suite["full"]))
+    protocol_hash_off = stable_hash(asdict(suite["no_protocol"]))
+    protocol_json = (
+        manifest.root
+        / "results"
+        / "protocol"
+        / f"protocol_horizon_{protocol_hash_on}_{protocol_hash_off}.json"
+    )
+    run_id = sweep_noise_maintenance_run_id()
+    sweep_npz = manifest.root / "results" / "sweeps" / f"noise_maintenance_{run_id}.npz"
+    hash_learning = stable_hash(asdict(cfg_learning_theta()))
+    learning_json = (
+        manifest.root
+        / "results"
+        / "learning"
+        / f"learning_theta_{hash_learning}.json"
+    )
+
+    holonomy_witness = _export_holonomy_witness(manifest)
+
+    out_path = manifest.root / "paper" / "generated" / "numbers.json"
+    inputs = _exporter_inputs(
+        packaging=_source_digest(packaging_json, "packaging JSON"),
+        protocol=_source_digest(protocol_json, "protocol JSON"),
+        sweep=_source_digest(sweep_npz, "sweep NPZ"),
+        learning=_source_digest(learning_json, "learning JSON"),
+        # The values at full precision; the .tex shows them rounded.
+        holonomy_witness={k: holonomy_witness[k] for k in ("tvd_on", "tvd_off", "state")},
+    )
+    if manifest.current(manifest.asset(out_path), inputs) is not None:
+        return out_path
+
+    packaging = json.loads(packaging_json.read_text(encoding="utf-8"))
+    tau_list = packaging["tau_list"]
+    if 2 not in tau_list:
+        raise SystemExit("tau=2 not found in packaging JSON")
+    idx = tau_list.index(2)
+    defect_off_tau2 = packaging["defect_off"][idx]
+    defect_on_tau2 = packaging["defect_on"][idx]
+
+    protocol = json.loads(protocol_json.read_text(encoding="utf-8"))
+
+    sweep = np.load(sweep_npz, allow_pickle=False)
+    K_size = sweep["K_size"]
+    emp_median = sweep["emp_median"]
+    sweep_metric_minmax = {
+        "K_size_min": float(K_size.min()),
+        "K_size_max": float(K_size.max()),
+        "emp_median_min": float(emp_median.min()),
+        "emp_median_max": float(emp_median.max()),
+    }
+
+    learning = json.loads(learning_json.read_text(encoding="utf-8"))
+    medians = learning.get("medians_by_theta", {})
+
+    numbers = {
+        "hash_packaging_off": hash_off,
+        "hash_packaging_on": hash_on,
+        "defect_off_tau2": defect_off_tau2,
+        "defect_on_tau2": defect_on_tau2,
+        "protocol_hash_on": protocol_hash_on,
+        "protocol_hash_off": protocol_hash_off,
+        "protocol_H_list": protocol["H_list"],
+        "protocol_emp_on": protocol["emp_on"],
+        "protocol_emp_off": protocol["emp_off"],
+        "sweep_run_id": run_id,
+        "sweep_metric_minmax": sweep_metric_minmax,
+        "learning_hash_cfg": hash_learning,
+        "learning_medians_theta0": medians.get("0"),
+        "learning_medians_theta1": medians.get("1"),
+        "learning_medians_theta2": medians.get("2"),
+        "holonomy_witness_tvd_on": holonomy_witness["tvd_on"],
+        "holonomy_witness_tvd_off": holonomy_witness["tvd_off"],
+        "holonomy_witness_state": holonomy_witness["state"],
+    }
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(numbers, indent=2) + "\n", encoding="utf-8")
+    manifest.record(manifest.asset(out_path), inputs, [out_path])
+    return out_path
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-run", action="store_true")
+    parser.add_argument(
+        "--clean", action="store_true", help="delete results/ and rerun every experiment first"
+    )
+    parser.add_argument("--force", action="store_true", help="regenerate every asset")
+    parser.add_argument("--root", default=".", help="repository root holding results/ and paper/")
+    args = parser.parse_args(argv)
+    root = Path(args.root).resolve()
+
+    if not args.no_run:
+        status = run_all.main([*(["--clean"] if args.clean else []), "--root", str(root)])
+        if status != 0:
+            return status
+
+    manifest = _Manifest(root, force=args.force)
+    figures = _export_figures(manifest)
+    table_path = _export_ablations_table(manifest)
+    numbers_path = _export_numbers_snapshot(manifest)
+    manifest.save()
+
+    for path in figures:
+        print(f"figure: {path}")
+    print(f"table: {table_path}")
+    print(f"numbers: {numbers_path}")
+    print(f"regenerated: {', '.join(manifest.regenerated) or 'none'}")
+    print(f"manifest: {manifest.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+"""Measure empowerment vs horizon with protocol on/off."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import json
+import platform
+
+import numpy as np
+
+from sbt_agency.exp_configs import ablations_suite
+from sbt_agency.metrics import shared_session
+from sbt_agency.plotting import plot_lines
+from sbt_agency.repro import stable_hash
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-plots", action="store_true", help="skip the figure")
+    args = parser.parse_args(argv)
+
+    suite = ablations_suite()
+    cfg_on = suite["full"]
+    cfg_off = suite["no_protocol"]
+
+    cfg_on_dict = asdict(cfg_on)
+    cfg_off_dict = asdict(cfg_off)
+    cfg_on_comp = dict(cfg_on_dict)
+    cfg_off_comp = dict(cfg_off_dict)
+    cfg_on_comp.pop("enable_protocol", None)
+    cfg_off_comp.pop("enable_protocol", None)
+    assert cfg_on_comp == cfg_off_comp
+
+    hash_on = stable_hash(cfg_on_dict)
+    hash_off = stable_hash(cfg_off_dict)
+
+    # One session per config: the kernel and viability kernel are built once,
+    # and all horizons come from one incremental pass per sampled state.
+    session_on = shared_session(cfg_on)
+    session_off = shared_session(cfg_off)
+
+    H_list = [1, 2, 3, 4, 5]
+    emp_on = session_on.empowerment_median_curve(
+        safe_r_min=1, H_max=max(H_list), max_states=32, seed=0
+    )
+    emp_off = session_off.empowerment_median_curve(
+        safe_r_min=1, H_max=max(H_list), max_states=32, seed=0
+    )
+
+    k_on = int(session_on.viable_states(safe_r_min=1).size)
+    k_off = int(session_off.viable_states(safe_r_min=1).size)
+
+    out_dir = Path("results") / "protocol"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"protocol_horizon_{hash_on}_{hash_off}"
+    json_path = out_dir / f"{stem}.json"
+    png_path = out_dir / f"{stem}.png"
+
+    payload = {
+        "created_at_utc": datetime.now(timezone.utc).isoformat(),
+        "versions": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+        },
+        "config_hash_on": hash_on,
+        "config_hash_off": hash_off,
+        "config_on": cfg_on_dict,
+        "config_off": cfg_off_dict,
+        "H_list": H_list,
+        "emp_on": emp_on,
+        "emp_off": emp_off,
+        "kernel_size_viable_on": k_on,
+        "kernel_size_viable_off": k_off,
+    }
+    json_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+    if not args.no_plots:
+        plot_lines(
+            png_path,
+            H_list,
+            {"protocol_on": emp_on, "protocol_off": emp_off},
+            xlabel="H",
+            ylabel="median feasible empowerment on K (bits)",
+            grid=True,
+        )
+
+    gaps = [a - b for a, b in zip(emp_on, emp_off)]
+    max_gap = max(gaps)
+    max_idx = gaps.index(max_gap)
+    max_H = H_list[max_idx]
+
+    print(f"hash_on: {hash_on}")
+    print(f"hash_off: {hash_off}")
+    print(f"emp_on: {emp_on}")
+    print(f"emp_off: {emp_off}")
+    print(f"json: {json_path}")
+    if not args.no_plots:
+        print(f"png: {png_path}")
+    print(f"max_gap: {max_gap} at H={max_H}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,47 @@
+"""Run out-of-date experiments in parallel and audit results in strict mode."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from pathlib import Path
+import argparse
+import shutil
+
+from sbt_agency.audit import audit_results
+from sbt_agency.pipeline import STAMP_DIR, paper_experiments, run_pipeline
+
+RESULT_DIRS = ("rollouts", "packaging", "ablations", "sweeps", "protocol", "learning", STAMP_DIR)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clean", action="store_true", help="delete results and rerun everything")
+    parser.add_argument("--force", action="store_true", help="rerun even up-to-date experiments")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="process count (default: all cores)"
+    )
+    parser.add_argument("--root", default=".", help="directory holding results/")
+    args = parser.parse_args(argv)
+    root = Path(args.root).resolve()
+
+    if args.clean:
+        for name in RESULT_DIRS:
+            path = root / "results" / name
+            if path.exists():
+                shutil.rmtree(path)
+
+    status = run_pipeline(paper_experiments(), root, n_workers=args.workers, force=args.force)
+    for name, state in status.items():
+        print(f"{name}: {state}")
+    failed = [name for name, state in status.items() if state in ("failed", "blocked")]
+    for name in failed:
+        print(f"log: {root / 'results' / STAMP_DIR / f'{name}.log'}")
+
+    result = audit_results(root / "results", strict=True)
+    print(
+        f"AUDIT summary: checked={result['checked']} errors={result['errors']} "
+        f"warnings={result['warnings']}"
+    )
+    if failed or result["errors"] > 0 or result["warnings"] > 0:
+        return 1
+    return 0
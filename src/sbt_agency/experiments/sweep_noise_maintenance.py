@@ -0,0 +1,163 @@
+"""Sweep noise vs maintenance cost for ring agent metrics."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import json
+import platform
+
+import numpy as np
+
+from sbt_agency.exp_configs import (
+    cfg_sweep_noise_maintenance_base,
+    sweep_noise_maintenance_axes,
+    sweep_noise_maintenance_run_id,
+)
+from sbt_agency.metrics import NOISE_MAINTENANCE_SAFE, noise_maintenance_metrics
+from sbt_agency.plotting import matplotlib_version, plot_heatmap
+from sbt_agency.sweep import adaptive_sweep, run_sweep, sweep_store_path
+
+# Corner spreads that trigger refinement in --adaptive mode.
+ADAPTIVE_THRESHOLDS = {"K_size": 2.0, "emp_median": 0.25}
+
+
+def _run_adaptive(base_cfg, p_flip_values, repair_cost_values, run_id, cell_store, n_workers):
+    out = adaptive_sweep(
+        base_cfg,
+        {
+            "p_flip": (min(p_flip_values), max(p_flip_values)),
+            "cost_repair": (min(repair_cost_values), max(repair_cost_values)),
+        },
+        noise_maintenance_metrics,
+        threshold=ADAPTIVE_THRESHOLDS,
+        coarse=4,
+        max_depth=6,
+        store=cell_store,
+        n_workers=n_workers,
+    )
+    out_dir = Path("results") / "sweeps"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    npz_path = out_dir / f"noise_maintenance_adaptive_{run_id}.npz"
+    meta = {
+        "base_config": asdict(base_cfg),
+        "safe": NOISE_MAINTENANCE_SAFE,
+        "run_id": run_id,
+        "thresholds": ADAPTIVE_THRESHOLDS,
+        "n_evaluations": out["n_evaluations"],
+        "created_at_utc": datetime.now(timezone.utc).isoformat(),
+        "versions": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+        },
+    }
+    np.savez(
+        npz_path,
+        p_flip_values=out["coords"][0],
+        repair_cost_values=out["coords"][1],
+        K_size=out["grid"]["K_size"],
+        emp_median=out["grid"]["emp_median"],
+        sample_values=out["sample_values"],
+        sample_K_size=out["samples"]["K_size"],
+        sample_emp_median=out["samples"]["emp_median"],
+        meta_json=json.dumps(meta),
+    )
+    print(f"run_id: {run_id}")
+    print(f"evaluations: {out['n_evaluations']} samples: {len(out['sample_index'])}")
+    print(f"grid: {out['grid']['K_size'].shape}")
+    print(f"npz: {npz_path}")
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--workers", type=int, default=None, help="process count (default: all cores)"
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="quadtree-refined sweep on a 257x257 lattice instead of the 8x8 grid",
+    )
+    parser.add_argument("--no-plots", action="store_true", help="skip the figures")
+    args = parser.parse_args(argv)
+
+    p_flip_values, repair_cost_values = sweep_noise_maintenance_axes()
+    base_cfg = cfg_sweep_noise_maintenance_base()
+    run_id = sweep_noise_maintenance_run_id()
+
+    # Finished cells are checkpointed here; rerunning resumes an interrupted sweep.
+    cell_store = sweep_store_path(f"noise_maintenance_{run_id}")
+    if args.adaptive:
+        return _run_adaptive(
+            base_cfg, p_flip_values, repair_cost_values, run_id, cell_store, args.workers
+        )
+
+    grids = run_sweep(
+        base_cfg,
+        {"p_flip": p_flip_values, "cost_repair": repair_cost_values},
+        noise_maintenance_metrics,
+        store=cell_store,
+        n_workers=args.workers,
+    )
+    K_size = grids["K_size"]
+    emp_median = grids["emp_median"]
+
+    out_dir = Path("results") / "sweeps"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    npz_path = out_dir / f"noise_maintenance_{run_id}.npz"
+    meta = {
+        "base_config": asdict(base_cfg),
+        "safe": NOISE_MAINTENANCE_SAFE,
+        "run_id": run_id,
+        "created_at_utc": datetime.now(timezone.utc).isoformat(),
+        "versions": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "matplotlib": matplotlib_version(),
+        },
+    }
+    np.savez(
+        npz_path,
+        p_flip_values=p_flip_values,
+        repair_cost_values=np.array(repair_cost_values),
+        K_size=K_size,
+        emp_median=emp_median,
+        meta_json=json.dumps(meta),
+    )
+
+    k_png = out_dir / f"noise_maintenance_K_{run_id}.png"
+    e_png = out_dir / f"noise_maintenance_E_{run_id}.png"
+
+    if not args.no_plots:
+        for data, path, title, cbar_label in (
+            (K_size, k_png, "Viability kernel size", "|K|"),
+            (emp_median, e_png, "Empowerment median on K", "bits"),
+        ):
+            plot_heatmap(
+                path,
+                data,
+                title=title,
+                xlabel="repair_cost",
+                ylabel="p_flip",
+                xticklabels=repair_cost_values,
+                yticklabels=[f"{v:.2f}" for v in p_flip_values],
+                cbar_label=cbar_label,
+            )
+
+    print(f"run_id: {run_id}")
+    print(f"K_size_min: {K_size.min()} K_size_max: {K_size.max()}")
+    print(f"emp_median_min: {emp_median.min()} emp_median_max: {emp_median.max()}")
+    print(f"npz: {npz_path}")
+    if not args.no_plots:
+        print(f"K_png: {k_png}")
+        print(f"E_png: {e_png}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+"""Non-commutativity (holonomy) of action pairs, for all states at once."""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from sbt_agency.env_ring_agent import RingAgentConfig, build_kernel
+from sbt_agency.kernel import FiniteKernel, SuccessorTable
+from sbt_agency.lens import ProjLike, as_lens
+
+
+def holonomy_tv(
+    kernel: FiniteKernel,
+    proj: ProjLike,
+    *,
+    actions: Sequence[int] | None = None,
+    successors: SuccessorTable | None = None,
+) -> np.ndarray:
+    """TV distance between proj(delta_s P_a P_b) and proj(delta_s P_b P_a).
+
+    Returns an (n_states, n, n) array over the n given ``actions`` (default:
+    all), symmetric in the action pair with a zero diagonal. One-step
+    projected rows are computed once per action and combined along the sparse
+    successor lists of the first action, so the cost is
+    O(n^2 * n_states * max_successors * n_outputs).
+    """
+    lens = as_lens(proj, kernel.n_states)
+    acts = np.arange(kernel.n_actions) if actions is None else np.asarray(actions, dtype=np.int64)
+    if acts.ndim != 1 or np.any(acts < 0) or np.any(acts >= kernel.n_actions):
+        raise IndexError("actions out of range")
+    if successors is None:
+        successors = kernel.successors()
+
+    Y = lens.push(kernel.P[acts])
+    # two[a, b, s] = proj(delta_s P_a P_b)
+    two = np.einsum("asj,basjy->absy", successors.prob[acts], Y[:, successors.succ[acts]])
+    tv = 0.5 * np.abs(two - two.transpose(1, 0, 2, 3)).sum(axis=-1)
+    return tv.transpose(2, 0, 1)
+
+
+def holonomy_witnesses(
+    tv: np.ndarray,
+    *,
+    states: np.ndarray | Sequence[int] | None = None,
+    actions: Sequence[int] | None = None,
+    top: int | None = None,
+    decimals: int = 12,
+) -> dict[str, np.ndarray]:
+    """Rank (state, a, b) triples with a < b by decreasing TV from ``holonomy_tv``.
+
+    ``states`` restricts the table to a boolean mask or index list; ``actions``
+    maps the columns of ``tv`` back to action indices. Values are ranked after
+    rounding to ``decimals``, so pairs equal up to rounding noise tie and are
+    ordered by state, then action pair. Returns arrays ``state``, ``a``, ``b``
+    and ``tv``.
+    """
+    tv = np.asarray(tv, dtype=float)
+    if tv.ndim != 3 or tv.shape[1] != tv.shape[2]:
+        raise ValueError("tv must have shape (n_states, n, n)")
+    n_states, n, _ = tv.shape
+    if states is None:
+        idx = np.arange(n_states)
+    else:
+        states = np.asarray(states)
+        idx = np.flatnonzero(states) if states.dtype == bool else states.astype(np.int64)
+    acts = np.arange(n) if actions is None else np.asarray(actions, dtype=np.int64)
+    ia, ib = np.triu_indices(n, k=1)
+
+    values = tv[idx][:, ia, ib]
+    s_col = np.repeat(idx, ia.size)
+    pair = np.tile(np.arange(ia.size), idx.size)
+    values = values.ravel()
+    order = np.lexsort((pair, s_col, -np.round(values, decimals)))
+    if top is not None:
+        order = order[:top]
+    return {
+        "state": s_col[order],
+        "a": acts[ia[pair[order]]],
+        "b": acts[ib[pair[order]]],
+        "tv": values[order],
+    }
+
+
+def ring_holonomy_metrics(
+    config: RingAgentConfig, *, pair: tuple[str, str] = ("RIGHT", "LEFT")
+) -> dict[str, float]:
+    """Max and mean y-projected holonomy TV of an action pair over all states.
+
+    A picklable metric for ``sbt_agency.sweep``.
+    """
+    kernel, projections, metadata = build_kernel(config)
+    names = list(metadata["action_names"])
+    actions = [names.index(name) for name in pair]
+    tv = holonomy_tv(kernel, projections["proj_y"], actions=actions)[:, 0, 1]
+    return {"tv_max": float(tv.max()), "tv_mean": float(tv.mean())}
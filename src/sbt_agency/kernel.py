@@ -3,10 +3,106 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Sequence
+from typing import Callable, Sequence, Union
 
 import numpy as np
 
+PolicyLike = Union[Callable[[int], Union[int, np.ndarray]], np.ndarray, Sequence[int]]
+
+
+def _validate_policy_output(
+    out: int | np.ndarray, n_actions: int, atol: float = 1e-12
+) -> np.ndarray:
+    if isinstance(out, (int, np.integer)):
+        a = int(out)
+        if a < 0 or a >= n_actions:
+            raise ValueError("policy action out of range")
+        probs = np.zeros(n_actions, dtype=float)
+        probs[a] = 1.0
+        return probs
+
+    probs = np.asarray(out, dtype=float)
+    if probs.ndim != 1 or probs.shape[0] != n_actions:
+        raise ValueError("policy distribution has wrong shape")
+    if not np.all(np.isfinite(probs)):
+        raise ValueError("policy distribution must be finite")
+    if np.any(probs < -atol):
+        raise ValueError("policy distribution has negative entries")
+    if not np.isclose(probs.sum(), 1.0, atol=atol, rtol=0.0):
+        raise ValueError("policy distribution must sum to 1 within tolerance")
+    return probs
+
+
+def compile_policy(
+    policy: Callable[[int], int | np.ndarray], n_states: int, n_actions: int
+) -> np.ndarray:
+    """Evaluate a per-state policy callable once into an (n_states, n_actions) table."""
+    table = np.zeros((n_states, n_actions), dtype=float)
+    for s in range(n_states):
+        table[s] = _validate_policy_output(policy(s), n_actions)
+    return table
+
+
+def policy_table(
+    policy: PolicyLike, n_states: int, n_actions: int, atol: float = 1e-12
+) -> np.ndarray:
+    """Normalize a policy to an (n_states, n_actions) probability table.
+
+    Accepts a callable ``policy(s)`` returning an action index or a
+    distribution, an ``(n_states,)`` integer action array, or an
+    ``(n_states, n_actions)`` probability table.
+    """
+    if callable(policy):
+        return compile_policy(policy, n_states, n_actions)
+
+    arr = np.asarray(policy)
+    if arr.ndim == 1:
+        if arr.shape[0] != n_states:
+            raise ValueError("policy action array must have shape (n_states,)")
+        if not np.issubdtype(arr.dtype, np.integer):
+            raise ValueError("policy action array must have an integer dtype")
+        if np.any(arr < 0) or np.any(arr >= n_actions):
+            raise ValueError("policy action out of range")
+        table = np.zeros((n_states, n_actions), dtype=float)
+        table[np.arange(n_states), arr] = 1.0
+        return table
+
+    if arr.ndim != 2 or arr.shape != (n_states, n_actions):
+        raise ValueError("policy table must have shape (n_states, n_actions)")
+    table = np.asarray(arr, dtype=float)
+    if not np.all(np.isfinite(table)):
+        raise ValueError("policy distribution must be finite")
+    if np.any(table < -atol):
+        raise ValueError("policy distribution has negative entries")
+    if not np.allclose(table.sum(axis=1), 1.0, atol=atol, rtol=0.0):
+        raise ValueError("policy distribution must sum to 1 within tolerance")
+    return table
+
+
+@dataclass
+class SuccessorTable:
+    """Padded sparse successor lists of a FiniteKernel.
+
+    For each (a, s) the first n_succ[a, s] entries of succ[a, s] are the states
+    reachable in one step, in increasing order, with probabilities prob[a, s]
+    and normalized cumulative probabilities cdf[a, s]. Padding entries repeat the
+    last successor with zero probability and cdf 1.
+    """
+
+    succ: np.ndarray
+    prob: np.ndarray
+    cdf: np.ndarray
+    n_succ: np.ndarray
+
+    def sample(self, a: np.ndarray, s: np.ndarray, u: np.ndarray) -> np.ndarray:
+        """Map uniforms u in [0, 1) to successor states of (a, s), elementwise."""
+        k = (self.cdf[a, s] <= u[..., None]).sum(axis=-1)
+        return self.succ[a, s, k]
+
+    def expect(self, values: np.ndarray) -> np.ndarray:
+        """Return E[values(S') | a, s] as an (n_actions, n_states) array."""
+        return (self.prob * np.asarray(values, dtype=float)[self.succ]).sum(axis=-1)
+
 
 @dataclass
 class FiniteKernel:
@@ -59,6 +155,37 @@ class FiniteKernel:
             raise ValueError("dist_s must be a 1D array of shape (n_states,)")
         return dist @ self.P[action]
 
+    def successors(self, atol: float = 0.0) -> SuccessorTable:
+        """Return the padded sparse successor table of entries with P > atol."""
+        if atol < 0:
+            raise ValueError("atol must be non-negative")
+        mask = self.P > atol
+        n_succ = mask.sum(axis=2)
+        if np.any(n_succ == 0):
+            raise ValueError("every (action, state) pair needs at least one successor")
+        k_max = int(n_succ.max())
+
+        order = np.argsort(~mask, axis=2, kind="stable")[:, :, :k_max]
+        valid = np.arange(k_max)[None, None, :] < n_succ[:, :, None]
+        last = np.take_along_axis(order, (n_succ - 1)[:, :, None], axis=2)
+        succ = np.where(valid, order, last)
+        prob = np.where(valid, np.take_along_axis(self.P, succ, axis=2), 0.0)
+        cdf = np.cumsum(prob, axis=2)
+        cdf = np.where(valid, cdf / cdf[:, :, -1:], 1.0)
+        return SuccessorTable(succ=succ, prob=prob, cdf=cdf, n_succ=n_succ)
+
+    def policy_matrix(self, policy: PolicyLike) -> np.ndarray:
+        """Return the state transition matrix T_pi induced by a stationary policy.
+
+        T_pi[s, s2] = sum_a pi(a | s) P[a, s, s2]
+        """
+        table = policy_table(policy, self.n_states, self.n_actions)
+        rows = np.arange(self.n_states)
+        actions = table.argmax(axis=1)
+        if np.all(table[rows, actions] == 1.0):
+            return self.P[actions, rows, :]
+        return np.einsum("sa,ast->st", table, self.P)
+
     def rollout_dist(self, dist_s: np.ndarray, action_seq: Sequence[int]) -> np.ndarray:
         """Roll out a sequence of actions on a state distribution."""
         dist = np.asarray(dist_s, dtype=float)
@@ -0,0 +1,95 @@
+"""Array-valued state projections (lenses)."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Sequence, Union
+
+import numpy as np
+
+
+@dataclass(eq=False)
+class Lens:
+    """Precomputed projection of states onto output indices.
+
+    labels[s] is the output index of state s, in range(n_outputs). Instances are
+    callable like the per-state projection functions they replace.
+    """
+
+    labels: np.ndarray
+    n_outputs: int
+
+    def __post_init__(self) -> None:
+        labels = np.asarray(self.labels)
+        if labels.ndim != 1:
+            raise ValueError("lens labels must be a 1D array")
+        if labels.size and not np.issubdtype(labels.dtype, np.integer):
+            raise ValueError("lens labels must have an integer dtype")
+        labels = labels.astype(np.int64, copy=True)
+        labels.setflags(write=False)
+        self.labels = labels
+        self.n_outputs = int(self.n_outputs)
+        if np.any(labels < 0):
+            raise ValueError("lens labels must be non-negative")
+        if labels.size and int(labels.max()) >= self.n_outputs:
+            raise ValueError("lens labels must be smaller than n_outputs")
+
+    @property
+    def n_states(self) -> int:
+        return int(self.labels.shape[0])
+
+    def __call__(self, s: int) -> int:
+        return int(self.labels[s])
+
+    def indicator(self) -> np.ndarray:
+        """Return the (n_states, n_outputs) 0/1 aggregation matrix."""
+        M = np.zeros((self.n_states, self.n_outputs), dtype=float)
+        M[np.arange(self.n_states), self.labels] = 1.0
+        return M
+
+    def push(self, dist: np.ndarray) -> np.ndarray:
+        """Push state distribution(s) forward to output distribution(s)."""
+        dist = np.asarray(dist, dtype=float)
+        if dist.ndim == 1:
+            return np.bincount(self.labels, weights=dist, minlength=self.n_outputs)
+        rows = dist.reshape(-1, self.n_states)
+        offsets = np.arange(rows.shape[0])[:, None] * self.n_outputs
+        flat = np.bincount(
+            (self.labels[None, :] + offsets).ravel(),
+            weights=rows.ravel(),
+            minlength=rows.shape[0] * self.n_outputs,
+        )
+        return flat.reshape(dist.shape[:-1] + (self.n_outputs,))
+
+
+ProjLike = Union[Lens, Callable[[int], int], np.ndarray, Sequence[int]]
+
+
+def as_lens(proj: ProjLike, n_states: int) -> Lens:
+    """Return proj as a Lens over n_states states.
+
+    Callables are evaluated once per state; arrays are taken as labels. In both
+    cases n_outputs is one past the largest label.
+    """
+    if isinstance(proj, Lens):
+        if proj.n_states != n_states:
+            raise ValueError("lens does not match the number of states")
+        return proj
+
+    if callable(proj):
+        labels = np.zeros(n_states, dtype=np.int64)
+        for s in range(n_states):
+            x = proj(s)
+            if not isinstance(x, (int, np.integer)):
+                raise ValueError("proj(s) must return an integer")
+            if x < 0:
+                raise ValueError("proj(s) must be non-negative")
+            labels[s] = int(x)
+    else:
+        labels = np.asarray(proj)
+        if labels.ndim != 1 or labels.shape[0] != n_states:
+            raise ValueError("proj array must have shape (n_states,)")
+        if np.any(labels < 0):
+            raise ValueError("proj labels must be non-negative")
+    n_outputs = int(labels.max()) + 1 if labels.size else 0
+    return Lens(labels, n_outputs)
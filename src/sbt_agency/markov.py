@@ -0,0 +1,144 @@
+"""Closed-class and limiting-distribution analysis for finite Markov chains."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+def _validate_chain(T: np.ndarray) -> np.ndarray:
+    T = np.asarray(T, dtype=float)
+    if T.ndim != 2 or T.shape[0] != T.shape[1]:
+        raise ValueError("T must be a square 2D array")
+    return T
+
+
+def communicating_classes(T: np.ndarray, atol: float = 0.0) -> list[np.ndarray]:
+    """Return the strongly connected components of the support graph of T."""
+    T = _validate_chain(T)
+    n = T.shape[0]
+    succ = [np.flatnonzero(T[s] > atol) for s in range(n)]
+
+    index = np.full(n, -1, dtype=int)
+    low = np.zeros(n, dtype=int)
+    on_stack = np.zeros(n, dtype=bool)
+    stack: list[int] = []
+    classes: list[np.ndarray] = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        work = [(root, 0)]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while work:
+            v, i = work[-1]
+            if i < len(succ[v]):
+                work[-1] = (v, i + 1)
+                w = int(succ[v][i])
+                if index[w] < 0:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, 0))
+                elif on_stack[w]:
+                    low[v] = min(low[v], index[w])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[v])
+            if low[v] == index[v]:
+                members = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    members.append(w)
+                    if w == v:
+                        break
+                classes.append(np.array(sorted(members), dtype=int))
+
+    classes.sort(key=lambda c: int(c[0]))
+    return classes
+
+
+def closed_classes(T: np.ndarray, atol: float = 0.0) -> list[np.ndarray]:
+    """Return the closed (recurrent) communicating classes of T."""
+    T = _validate_chain(T)
+    closed = []
+    for members in communicating_classes(T, atol=atol):
+        outside = np.ones(T.shape[0], dtype=bool)
+        outside[members] = False
+        if not np.any(T[np.ix_(members, outside)] > atol):
+            closed.append(members)
+    return closed
+
+
+def class_period(T: np.ndarray, members: np.ndarray, atol: float = 0.0) -> int:
+    """Return the period of an irreducible class of T."""
+    T = _validate_chain(T)
+    members = np.asarray(members, dtype=int)
+    sub = T[np.ix_(members, members)] > atol
+    level = np.full(len(members), -1, dtype=int)
+    level[0] = 0
+    frontier = [0]
+    period = 0
+    while frontier:
+        nxt = []
+        for i in frontier:
+            for j in np.flatnonzero(sub[i]).tolist():
+                if level[j] < 0:
+                    level[j] = level[i] + 1
+                    nxt.append(j)
+                else:
+                    period = math.gcd(period, level[i] + 1 - level[j])
+        frontier = nxt
+    return max(period, 1)
+
+
+def stationary_distribution(T: np.ndarray) -> np.ndarray:
+    """Return the stationary distribution of an irreducible chain T."""
+    T = _validate_chain(T)
+    n = T.shape[0]
+    A = np.vstack([T.T - np.eye(n), np.ones((1, n))])
+    b = np.zeros(n + 1, dtype=float)
+    b[-1] = 1.0
+    pi, *_ = np.linalg.lstsq(A, b, rcond=None)
+    pi = np.clip(pi, 0.0, None)
+    return pi / pi.sum()
+
+
+def limiting_matrix(T: np.ndarray, atol: float = 0.0) -> np.ndarray:
+    """Return the Cesaro limit of the powers of T.
+
+    Row s is lim_{N->inf} (1/N) sum_{t<N} (delta_s T^t). For aperiodic chains this
+    equals lim_t delta_s T^t; for periodic closed classes it is the time-averaged
+    occupation, i.e. the class stationary distribution. Transient rows mix the
+    class stationary distributions by their absorption probabilities, obtained
+    from one linear solve over the transient states.
+    """
+    T = _validate_chain(T)
+    n = T.shape[0]
+    classes = closed_classes(T, atol=atol)
+
+    Pi = np.zeros((n, n), dtype=float)
+    recurrent = np.zeros(n, dtype=bool)
+    for members in classes:
+        pi = stationary_distribution(T[np.ix_(members, members)])
+        Pi[np.ix_(members, members)] = pi[None, :]
+        recurrent[members] = True
+
+    transient = np.flatnonzero(~recurrent)
+    if transient.size:
+        Q = T[np.ix_(transient, transient)]
+        R = np.stack([T[np.ix_(transient, members)].sum(axis=1) for members in classes], axis=1)
+        absorb = np.linalg.solve(np.eye(transient.size) - Q, R)
+        for k, members in enumerate(classes):
+            pi = Pi[members[0], members]
+            Pi[np.ix_(transient, members)] = absorb[:, k][:, None] * pi[None, :]
+    return Pi
@@ -3,17 +3,30 @@
 from __future__ import annotations
 
 from dataclasses import asdict
+from functools import cached_property, lru_cache
 from typing import Any
-import math
 
 import numpy as np
 
-from sbt_agency.channel import build_channel_matrix, enumerate_action_seqs
-from sbt_agency.empowerment import feasible_capacity_bits
+from sbt_agency.cache import memoize
+from sbt_agency.channel import (
+    build_channel_matrices_by_horizon,
+    build_channel_matrices_for_states,
+    build_channel_matrix,
+    enumerate_action_seqs,
+)
+from sbt_agency.empowerment import (
+    feasible_capacity_bits,
+    feasible_capacity_bits_batch,
+    feasible_capacity_curve_bits,
+)
 from sbt_agency.env_ring_agent import RingAgentConfig, build_kernel
+from sbt_agency.kernel import FiniteKernel, SuccessorTable
 from sbt_agency.packaging import empirical_endomap, idempotence_defect as _idempotence_defect
 from sbt_agency.repro import set_global_seed, stable_hash
-from sbt_agency.viability import ledger_feasible_actions, post_support_from_kernel, viability_kernel
+from sbt_agency.viability import ledger_feasible_mask, viability_kernel_mask
+
+NOISE_MAINTENANCE_SAFE = "r>=1 and u==0"
 
 
 def _cost_by_action_name(config: RingAgentConfig, name: str) -> int:
@@ -28,6 +41,293 @@ def _cost_by_action_name(config: RingAgentConfig, name: str) -> int:
     return 0
 
 
+class MetricsSession:
+    """Metric queries on one ring config, caching every intermediate stage.
+
+    The kernel, projections and successor table are built on first use. The
+    viability kernel is cached per ``safe_r_min``, capacities per (state,
+    horizon, action subset) and idempotence defects per ``tau``, so repeated
+    queries only compute what their parameters change.
+    """
+
+    def __init__(self, config: RingAgentConfig) -> None:
+        self.config = config
+        self.config_dict = asdict(config)
+        self.config_hash = stable_hash(self.config_dict)
+        self._viable: dict[int, np.ndarray] = {}
+        self._caps: dict[tuple, float] = {}
+        self._defects: dict[int, float] = {}
+        self._exact: dict[tuple[int, int], dict[str, Any]] = {}
+
+    @cached_property
+    def _built(self) -> tuple[FiniteKernel, dict[str, Any], dict[str, Any]]:
+        return build_kernel(self.config)
+
+    @property
+    def kernel(self) -> FiniteKernel:
+        return self._built[0]
+
+    @property
+    def projections(self) -> dict[str, Any]:
+        return self._built[1]
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        return self._built[2]
+
+    @cached_property
+    def action_names(self) -> list[str]:
+        return list(self.metadata["action_names"])
+
+    @cached_property
+    def ledger(self) -> np.ndarray:
+        return np.array([t[3] for t in self.metadata["state_tuples"]], dtype=np.int64)
+
+    @cached_property
+    def costs(self) -> np.ndarray:
+        return np.array(
+            [_cost_by_action_name(self.config, name) for name in self.action_names], dtype=float
+        )
+
+    def cost_fn(self, a_idx: int) -> float:
+        return float(self.costs[int(a_idx)])
+
+    @cached_property
+    def successors(self) -> SuccessorTable:
+        return self.kernel.successors()
+
+    def viable_states(self, safe_r_min: int = 1) -> np.ndarray:
+        """Sorted states of the viability kernel for ledger >= safe_r_min."""
+        if safe_r_min not in self._viable:
+            K, _safe_actions = viability_kernel_mask(
+                self.kernel,
+                self.ledger >= safe_r_min,
+                ledger_feasible_mask(self.ledger, self.costs),
+                successors=self.successors,
+            )
+            self._viable[safe_r_min] = np.flatnonzero(K)
+        return self._viable[safe_r_min]
+
+    def capacities(
+        self, states: Any, H: int, action_indices: tuple[int, ...] | None = None
+    ) -> list[float]:
+        """Feasible empowerment (bits) of each state over the proj_y channel."""
+        if action_indices is None:
+            action_indices = tuple(range(self.kernel.n_actions))
+        seqs = None
+        out = []
+        for s in states:
+            key = (int(s), H, action_indices)
+            if key not in self._caps:
+                if seqs is None:
+                    seqs = enumerate_action_seqs(list(action_indices), H)
+                W = build_channel_matrix(self.kernel, int(s), seqs, self.projections["proj_y"])
+                self._caps[key] = feasible_capacity_bits(
+                    W, seqs, self.cost_fn, int(self.ledger[int(s)])
+                )
+            out.append(self._caps[key])
+        return out
+
+    def capacity_curves(
+        self,
+        states: Any,
+        H_max: int,
+        action_indices: tuple[int, ...] | None = None,
+        *,
+        warm_start: bool = True,
+    ) -> np.ndarray:
+        """Feasible empowerment for horizons 1..H_max, as an (n, H_max) array.
+
+        Channels are extended one horizon at a time and each capacity solve is
+        warm-started from the previous horizon.
+        """
+        if action_indices is None:
+            action_indices = tuple(range(self.kernel.n_actions))
+        out = []
+        for s in states:
+            channels = build_channel_matrices_by_horizon(
+                self.kernel, int(s), action_indices, H_max, self.projections["proj_y"]
+            )
+            out.append(
+                feasible_capacity_curve_bits(
+                    channels,
+                    action_indices,
+                    self.cost_fn,
+                    int(self.ledger[int(s)]),
+                    warm_start=warm_start,
+                )
+            )
+        return np.array(out, dtype=float).reshape(len(out), H_max)
+
+    def sample_viable_states(
+        self, *, safe_r_min: int = 1, max_states: int = 32, seed: int = 0
+    ) -> list[int]:
+        """Up to max_states states of K, drawn without replacement by seed."""
+        K_list = self.viable_states(safe_r_min)
+        rng = np.random.default_rng(seed)
+        sample_n = min(len(K_list), max_states)
+        if len(K_list) > sample_n:
+            return rng.choice(K_list.tolist(), size=sample_n, replace=False).tolist()
+        return K_list.tolist()
+
+    def empowerment_median_on_K(
+        self, *, safe_r_min: int = 1, H: int = 2, max_states: int = 32, seed: int = 0
+    ) -> float:
+        sample_states = self.sample_viable_states(
+            safe_r_min=safe_r_min, max_states=max_states, seed=seed
+        )
+        if not sample_states:
+            return 0.0
+        caps = self.capacities(sample_states, H)
+        return float(np.median(caps)) if caps else 0.0
+
+    def empowerment_on_K(self, *, safe_r_min: int = 1, H: int = 2) -> dict[str, Any]:
+        """Feasible empowerment of every state in K, with summary statistics.
+
+        Channels for all of K are built in one batched propagation and solved
+        with the batched capacity iteration, grouped by ledger budget.
+        """
+        key = (safe_r_min, H)
+        if key not in self._exact:
+            K_list = self.viable_states(safe_r_min)
+            actions = list(range(self.kernel.n_actions))
+            if K_list.size:
+                W = build_channel_matrices_for_states(
+                    self.kernel, K_list, actions, H, self.projections["proj_y"]
+                )
+                values = feasible_capacity_bits_batch(
+                    W, enumerate_action_seqs(actions, H), self.cost_fn, self.ledger[K_list]
+                )
+            else:
+                values = np.zeros(0, dtype=float)
+            stats = {"median": 0.0, "mean": 0.0, "min": 0.0, "max": 0.0}
+            if values.size:
+                stats = {
+                    "median": float(np.median(values)),
+                    "mean": float(values.mean()),
+                    "min": float(values.min()),
+                    "max": float(values.max()),
+                }
+            self._exact[key] = {"states": K_list, "values": values, **stats}
+        return self._exact[key]
+
+    def empowerment_median_curve(
+        self, *, safe_r_min: int = 1, H_max: int = 5, max_states: int = 32, seed: int = 0
+    ) -> list[float]:
+        """Median feasible empowerment on the sampled K for every H in 1..H_max."""
+        sample_states = self.sample_viable_states(
+            safe_r_min=safe_r_min, max_states=max_states, seed=seed
+        )
+        if not sample_states:
+            return [0.0] * H_max
+        curves = self.capacity_curves(sample_states, H_max)
+        return [float(v) for v in np.median(curves, axis=0)]
+
+    def empowerment_medians_by_theta(
+        self,
+        *,
+        safe_r_min: int = 1,
+        H: int = 2,
+        restrict_u: int | None = 0,
+        restrict_phi: int | None = 0,
+        action_subset: tuple[str, ...] = ("LEFT", "RIGHT"),
+    ) -> dict[int, float]:
+        action_indices = tuple(
+            self.action_names.index(name) for name in action_subset if name in self.action_names
+        )
+        if not action_indices:
+            raise ValueError("action_subset yields no valid action indices")
+
+        tuples = np.asarray(self.metadata["state_tuples"], dtype=np.int64)
+        K_list = self.viable_states(safe_r_min)
+        medians: dict[int, float] = {}
+        for theta in range(self.config.theta_max + 1):
+            keep = tuples[K_list, 5] == theta
+            if restrict_u is not None:
+                keep &= tuples[K_list, 1] == restrict_u
+            if restrict_phi is not None:
+                keep &= tuples[K_list, 2] == restrict_phi
+            theta_states = K_list[keep].tolist()
+            if not theta_states:
+                medians[theta] = 0.0
+                continue
+            caps = self.capacities(theta_states, H, action_indices)
+            medians[theta] = float(np.median(caps)) if caps else 0.0
+        return medians
+
+    def maintenance_policy(self) -> np.ndarray:
+        """Repair when damaged and affordable, else move right, as an action array."""
+        names = self.action_names
+        right_idx = names.index("RIGHT") if "RIGHT" in names else 0
+        actions = np.full(self.kernel.n_states, right_idx, dtype=np.int64)
+        if "REPAIR" in names:
+            u = np.array([t[1] for t in self.metadata["state_tuples"]])
+            damaged = (u == 1) & (self.ledger >= _cost_by_action_name(self.config, "REPAIR"))
+            actions[damaged] = names.index("REPAIR")
+        return actions
+
+    def idempotence_defect(self, tau: int = 2) -> float:
+        if tau not in self._defects:
+            E = empirical_endomap(
+                self.kernel, self.projections["proj_macro"], tau, self.maintenance_policy()
+            )
+            self._defects[tau] = float(_idempotence_defect(E))
+        return self._defects[tau]
+
+    def ring_metrics(
+        self,
+        *,
+        safe_r_min: int = 1,
+        empowerment_H: int = 2,
+        empowerment_max_states: int = 32,
+        packaging_tau: int = 2,
+        seed: int = 0,
+        exact: bool = False,
+    ) -> dict[str, float | int | str | dict | list]:
+        """Metrics dict of ``compute_ring_metrics``.
+
+        With ``exact`` the empowerment median is taken over all of K instead of
+        a seeded sample of ``empowerment_max_states`` states, and the per-state
+        values are reported under ``empowerment_on_K``.
+        """
+        out: dict[str, float | int | str | dict | list] = {
+            "config_hash": self.config_hash,
+            "n_states": self.kernel.n_states,
+            "n_actions": self.kernel.n_actions,
+            "kernel_size_viable": int(self.viable_states(safe_r_min).size),
+        }
+        if exact:
+            emp = self.empowerment_on_K(safe_r_min=safe_r_min, H=empowerment_H)
+            out["empowerment_median_on_K"] = emp["median"]
+            out["empowerment_on_K"] = {
+                "states": emp["states"].tolist(),
+                "values": emp["values"].tolist(),
+                "median": emp["median"],
+                "mean": emp["mean"],
+                "min": emp["min"],
+                "max": emp["max"],
+            }
+        else:
+            out["empowerment_median_on_K"] = self.empowerment_median_on_K(
+                safe_r_min=safe_r_min, H=empowerment_H, max_states=empowerment_max_states, seed=seed
+            )
+        out["idempotence_defect"] = self.idempotence_defect(packaging_tau)
+        out["config"] = dict(self.config_dict)
+        out["action_names"] = list(self.action_names)
+        return out
+
+
+@lru_cache(maxsize=8)
+def shared_session(config: RingAgentConfig) -> MetricsSession:
+    """Process-wide MetricsSession of ``config``.
+
+    Experiments run in one interpreter (see ``sbt_agency.cli``) share kernels
+    and cached stages through it; the least recently used of 8 are dropped.
+    """
+    return MetricsSession(config)
+
+
+@memoize
 def compute_empowerment_medians_by_theta(
     config: RingAgentConfig,
     *,
@@ -38,60 +338,34 @@ def compute_empowerment_medians_by_theta(
     action_subset: tuple[str, ...] = ("LEFT", "RIGHT"),
 ) -> dict[int, float]:
     """Compute median feasible-empowerment by theta group."""
-    kernel, projections, metadata = build_kernel(config)
-    action_names = metadata["action_names"]
-    state_tuples = metadata["state_tuples"]
+    return shared_session(config).empowerment_medians_by_theta(
+        safe_r_min=safe_r_min,
+        H=empowerment_H,
+        restrict_u=restrict_u,
+        restrict_phi=restrict_phi,
+        action_subset=action_subset,
+    )
 
-    def ledger(s: int) -> int:
-        return int(state_tuples[s][3])
-
-    def cost_fn(a_idx: int) -> float:
-        name = action_names[int(a_idx)]
-        return float(_cost_by_action_name(config, name))
-
-    states = range(kernel.n_states)
-    actions = range(kernel.n_actions)
-    feasible_actions = ledger_feasible_actions(actions, ledger, cost_fn)
-    post_support = post_support_from_kernel(kernel)
-
-    def safe(s: int) -> bool:
-        return ledger(s) >= safe_r_min
-
-    K = viability_kernel(states, actions, feasible_actions, post_support, safe)
-
-    action_indices = [action_names.index(name) for name in action_subset if name in action_names]
-    if not action_indices:
-        raise ValueError("action_subset yields no valid action indices")
-
-    seqs = enumerate_action_seqs(action_indices, empowerment_H)
-    proj_y = projections["proj_y"]
-
-    theta_max = config.theta_max
-    medians: dict[int, float] = {}
-    for theta in range(theta_max + 1):
-        theta_states = []
-        for s in K:
-            y, u, phi, r, g, th = state_tuples[s]
-            if th != theta:
-                continue
-            if restrict_u is not None and u != restrict_u:
-                continue
-            if restrict_phi is not None and phi != restrict_phi:
-                continue
-            theta_states.append(s)
 
-        if not theta_states:
-            medians[theta] = 0.0
-            continue
-
-        caps = []
-        for s in theta_states:
-            budget = ledger(s)
-            W = build_channel_matrix(kernel, s, seqs, proj_y)
-            caps.append(feasible_capacity_bits(W, seqs, cost_fn, budget))
-        medians[theta] = float(np.median(caps)) if caps else 0.0
-
-    return medians
+@memoize(name="sbt_agency.metrics.compute_ring_metrics")
+def _cached_ring_metrics(
+    config: RingAgentConfig,
+    *,
+    safe_r_min: int,
+    empowerment_H: int,
+    empowerment_max_states: int,
+    packaging_tau: int,
+    seed: int,
+    exact: bool,
+) -> dict[str, float | int | str | dict | list]:
+    return shared_session(config).ring_metrics(
+        safe_r_min=safe_r_min,
+        empowerment_H=empowerment_H,
+        empowerment_max_states=empowerment_max_states,
+        packaging_tau=packaging_tau,
+        seed=seed,
+        exact=exact,
+    )
 
 
 def compute_ring_metrics(
@@ -102,74 +376,67 @@ def compute_ring_metrics(
     empowerment_max_states: int = 32,
     packaging_tau: int = 2,
     seed: int = 0,
+    exact: bool = False,
 ) -> dict[str, float | int | str | dict | list]:
-    """Compute viability, empowerment, and packaging metrics for a ring config."""
-    set_global_seed(seed)
-    kernel, projections, metadata = build_kernel(config)
-
-    config_dict = asdict(config)
-    config_hash = stable_hash(config_dict)
-
-    action_names = metadata["action_names"]
-    state_tuples = metadata["state_tuples"]
-
-    def ledger(s: int) -> int:
-        return int(state_tuples[s][3])
-
-    def cost_fn(a_idx: int) -> float:
-        name = action_names[int(a_idx)]
-        return float(_cost_by_action_name(config, name))
+    """Compute viability, empowerment, and packaging metrics for a ring config.
 
-    states = range(kernel.n_states)
-    actions = range(kernel.n_actions)
-    feasible_actions = ledger_feasible_actions(actions, ledger, cost_fn)
-    post_support = post_support_from_kernel(kernel)
-
-    def safe(s: int) -> bool:
-        return ledger(s) >= safe_r_min
-
-    K = viability_kernel(states, actions, feasible_actions, post_support, safe)
-    kernel_size_viable = len(K)
-
-    if not K:
-        empowerment_median_on_K = 0.0
-    else:
-        rng = np.random.default_rng(seed)
-        K_list = sorted(K)
-        sample_n = min(len(K_list), empowerment_max_states)
-        if len(K_list) > sample_n:
-            sample_states = rng.choice(K_list, size=sample_n, replace=False)
-        else:
-            sample_states = np.array(K_list, dtype=int)
-        seqs = enumerate_action_seqs(list(actions), empowerment_H)
-        proj_y = projections["proj_y"]
-        caps = []
-        for s in sample_states.tolist():
-            budget = ledger(int(s))
-            W = build_channel_matrix(kernel, int(s), seqs, proj_y)
-            caps.append(feasible_capacity_bits(W, seqs, cost_fn, budget))
-        empowerment_median_on_K = float(np.median(caps)) if caps else 0.0
-
-    proj_macro = projections["proj_macro"]
-    right_idx = action_names.index("RIGHT") if "RIGHT" in action_names else 0
-    repair_idx = action_names.index("REPAIR") if "REPAIR" in action_names else None
-
-    def policy(s_idx: int) -> int:
-        y, u, phi, r, g, theta = state_tuples[s_idx]
-        if repair_idx is not None and u == 1 and r >= _cost_by_action_name(config, "REPAIR"):
-            return repair_idx
-        return right_idx
-
-    E = empirical_endomap(kernel, proj_macro, packaging_tau, policy)
-    defect = float(_idempotence_defect(E))
-
-    return {
-        "config_hash": config_hash,
-        "n_states": kernel.n_states,
-        "n_actions": kernel.n_actions,
-        "kernel_size_viable": kernel_size_viable,
-        "empowerment_median_on_K": empowerment_median_on_K,
-        "idempotence_defect": defect,
-        "config": config_dict,
-        "action_names": list(action_names),
-    }
+    ``exact=True`` evaluates empowerment on every state of K (see
+    ``MetricsSession.ring_metrics``). Results are memoized in the default
+    metric cache when one is configured (see ``sbt_agency.cache``).
+    """
+    set_global_seed(seed)
+    return _cached_ring_metrics(
+        config,
+        safe_r_min=safe_r_min,
+        empowerment_H=empowerment_H,
+        empowerment_max_states=empowerment_max_states,
+        packaging_tau=packaging_tau,
+        seed=seed,
+        exact=exact,
+    )
+
+
+def noise_maintenance_metrics(
+    config: RingAgentConfig,
+    *,
+    max_states: int = 16,
+    tol: float = 1e-6,
+    max_iter: int = 500,
+) -> dict[str, float]:
+    """Cell metrics of the noise/maintenance sweep.
+
+    K is the viability kernel of the safe set r >= 1 and u == 0; emp_median is
+    the median H=2 feasible empowerment over the first ``max_states`` states
+    of K in index order.
+    """
+    session = MetricsSession(config)
+    kernel = session.kernel
+    u = np.array([t[1] for t in session.metadata["state_tuples"]])
+    K, _safe_actions = viability_kernel_mask(
+        kernel,
+        (session.ledger >= 1) & (u == 0),
+        ledger_feasible_mask(session.ledger, session.costs),
+        successors=session.successors,
+    )
+    K_sorted = np.flatnonzero(K).tolist()
+    if not K_sorted:
+        return {"K_size": 0.0, "emp_median": 0.0}
+
+    n_actions = kernel.n_actions
+    L = config.L
+    seqs = enumerate_action_seqs(list(range(n_actions)), 2)
+    P = kernel.P
+    YDIST = session.projections["proj_y"].push(P.reshape(-1, kernel.n_states))
+    YDIST = YDIST.reshape(n_actions, kernel.n_states, L)
+
+    caps = []
+    for s in K_sorted[: min(max_states, len(K_sorted))]:
+        W = np.zeros((len(seqs), L), dtype=float)
+        for i, (a0, a1) in enumerate(seqs):
+            W[i] = P[a0, s] @ YDIST[a1]
+        caps.append(
+            feasible_capacity_bits(
+                W, seqs, session.cost_fn, int(session.ledger[s]), tol=tol, max_iter=max_iter
+            )
+        )
+    return {"K_size": float(len(K_sorted)), "emp_median": float(np.median(caps))}
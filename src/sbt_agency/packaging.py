@@ -3,97 +3,130 @@
 from __future__ import annotations
 
 from collections.abc import Mapping, Sequence
-from typing import Callable
+import math
 
 import numpy as np
 
-from sbt_agency.kernel import FiniteKernel
+from sbt_agency.kernel import FiniteKernel, PolicyLike
+from sbt_agency.lens import Lens, ProjLike, as_lens
+from sbt_agency.markov import limiting_matrix
 
 
-def _validate_policy_output(
-    out: int | np.ndarray, n_actions: int, atol: float = 1e-12
-) -> np.ndarray:
-    if isinstance(out, (int, np.integer)):
-        a = int(out)
-        if a < 0 or a >= n_actions:
-            raise ValueError("policy action out of range")
-        probs = np.zeros(n_actions, dtype=float)
-        probs[a] = 1.0
-        return probs
-
-    probs = np.asarray(out, dtype=float)
-    if probs.ndim != 1 or probs.shape[0] != n_actions:
-        raise ValueError("policy distribution has wrong shape")
-    if not np.all(np.isfinite(probs)):
-        raise ValueError("policy distribution must be finite")
-    if np.any(probs < -atol):
-        raise ValueError("policy distribution has negative entries")
-    if not np.isclose(probs.sum(), 1.0, atol=atol, rtol=0.0):
-        raise ValueError("policy distribution must sum to 1 within tolerance")
-    return probs
-
-
-def empirical_endomap(
-    kernel: FiniteKernel,
-    proj: Callable[[int], int],
-    tau: int,
-    policy: Callable[[int], int | np.ndarray],
-    *,
-    macro_labels: Sequence[int] | None = None,
-) -> dict[int, int]:
-    """Compute an empirical endomap on macro labels under a stationary policy."""
+def _validate_tau(tau: int | float, tol: float | None) -> None:
     if tau < 0:
         raise ValueError("tau must be non-negative")
+    if not math.isinf(tau) and int(tau) != tau:
+        raise ValueError("tau must be an integer or math.inf")
+    if tol is not None and tol < 0:
+        raise ValueError("tol must be non-negative")
 
-    n_states = kernel.n_states
-    n_actions = kernel.n_actions
-
-    labels = []
-    state_labels = np.zeros(n_states, dtype=int)
-    for s in range(n_states):
-        x = proj(s)
-        if not isinstance(x, (int, np.integer)):
-            raise ValueError("proj(s) must return an integer")
-        x = int(x)
-        if x < 0:
-            raise ValueError("proj(s) must be non-negative")
-        state_labels[s] = x
-        labels.append(x)
 
+def _label_support(
+    lens: Lens, macro_labels: Sequence[int] | None
+) -> tuple[list[int], np.ndarray]:
     if macro_labels is None:
-        label_list = sorted(set(labels))
+        label_list = np.unique(lens.labels).tolist()
     else:
         label_list = sorted(int(x) for x in macro_labels)
 
-    label_to_states: dict[int, list[int]] = {x: [] for x in label_list}
-    for s, x in enumerate(state_labels.tolist()):
-        if x in label_to_states:
-            label_to_states[x].append(s)
-
-    for x, states in label_to_states.items():
-        if not states:
+    counts = np.bincount(lens.labels, minlength=lens.n_outputs)
+    for x in label_list:
+        if x < 0 or x >= lens.n_outputs or counts[x] == 0:
             raise ValueError(f"macro label {x} has no supporting states")
+    return label_list, counts
+
 
-    T_pi = np.zeros((n_states, n_states), dtype=float)
-    for s in range(n_states):
-        probs = _validate_policy_output(policy(s), n_actions)
-        T_pi[s] = probs @ kernel.P[:, s, :]
+def _policy_chain(kernel: FiniteKernel, policy: PolicyLike) -> np.ndarray:
+    T_pi = kernel.policy_matrix(policy)
     if not np.allclose(T_pi.sum(axis=1), 1.0, atol=1e-12, rtol=0.0):
         raise ValueError("rows of T_pi must sum to 1 within tolerance")
+    return T_pi
 
-    E: dict[int, int] = {}
-    for x in label_list:
-        states = label_to_states[x]
-        d = np.zeros(n_states, dtype=float)
-        d[states] = 1.0 / len(states)
-        for _ in range(tau):
-            d = d @ T_pi
 
-        macro_dist = np.array([d[label_to_states[l]].sum() for l in label_list], dtype=float)
-        idx = int(np.argmax(macro_dist))
-        E[x] = label_list[idx]
+def empirical_endomap(
+    kernel: FiniteKernel,
+    proj: ProjLike,
+    tau: int | float,
+    policy: PolicyLike,
+    *,
+    macro_labels: Sequence[int] | None = None,
+    tol: float | None = None,
+) -> dict[int, int]:
+    """Compute an empirical endomap on macro labels under a stationary policy.
+
+    ``proj`` may be a ``Lens``, an ``(n_states,)`` integer label array or a
+    per-state callable. ``policy`` may be a per-state callable, an ``(n_states,)``
+    action array or an ``(n_states, n_actions)`` probability table; see
+    ``compile_policy`` for turning callables into tables ahead of repeated calls.
 
-    return E
+    ``tau=math.inf`` uses the limiting (Cesaro-averaged) distributions of T_pi,
+    computed from its closed classes. For finite tau, ``tol`` stops propagating a
+    label's distribution once a step moves it by at most ``tol`` in L1. Labels
+    whose macro masses tie (to 12 decimals) map to the smallest label. This is
+    ``empirical_endomaps`` with a single lens.
+    """
+    return empirical_endomaps(
+        kernel, [proj], tau, policy, macro_labels=[macro_labels], tol=tol
+    )[0]
+
+
+def empirical_endomaps(
+    kernel: FiniteKernel,
+    projs: Sequence[ProjLike],
+    tau: int | float,
+    policy: PolicyLike,
+    *,
+    macro_labels: Sequence[Sequence[int] | None] | None = None,
+    tol: float | None = None,
+) -> list[dict[int, int]]:
+    """Compute one empirical endomap per lens from a shared propagation.
+
+    The label start distributions of every lens are stacked and propagated
+    through T_pi together, so the kernel is traversed once for all lenses.
+    ``macro_labels`` optionally gives the label subset of each lens; ``tau``,
+    ``tol`` and tie-breaking are as in ``empirical_endomap``.
+    """
+    _validate_tau(tau, tol)
+    lenses = [as_lens(proj, kernel.n_states) for proj in projs]
+    if macro_labels is None:
+        macro_labels = [None] * len(lenses)
+    elif len(macro_labels) != len(lenses):
+        raise ValueError("macro_labels needs one entry per lens")
+    supports = [_label_support(lens, labels) for lens, labels in zip(lenses, macro_labels)]
+    if not lenses:
+        return []
+
+    D = np.concatenate(
+        [
+            lens.indicator()[:, label_list].T / counts[label_list][:, None]
+            for lens, (label_list, counts) in zip(lenses, supports)
+        ]
+    )
+    T_pi = _policy_chain(kernel, policy)
+    if math.isinf(tau):
+        D = D @ limiting_matrix(T_pi)
+    elif tol is None:
+        for _ in range(int(tau)):
+            D = D @ T_pi
+    else:
+        active = np.arange(D.shape[0])
+        for _ in range(int(tau)):
+            D_next = D[active] @ T_pi
+            moved = np.abs(D_next - D[active]).sum(axis=1)
+            D[active] = D_next
+            active = active[moved > tol]
+            if active.size == 0:
+                break
+
+    out = []
+    start = 0
+    for lens, (label_list, _counts) in zip(lenses, supports):
+        rows = D[start : start + len(label_list)]
+        start += len(label_list)
+        macro_dist = np.round(lens.push(rows)[:, label_list], 12)
+        idx = np.argmax(macro_dist, axis=1)
+        out.append({x: label_list[int(i)] for x, i in zip(label_list, idx)})
+    return out
 
 
 def idempotence_defect(E: Mapping[int, int]) -> float:
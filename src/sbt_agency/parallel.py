@@ -0,0 +1,133 @@
+"""Process-parallel batched rollouts with reproducible per-block streams."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+import numpy as np
+
+from sbt_agency.kernel import FiniteKernel, PolicyLike, SuccessorTable, policy_table
+from sbt_agency.shared import SharedKernel, SharedKernelHandle, attach_kernel
+from sbt_agency.sim import rollout_batch
+
+_WORKER_STATE: dict = {}
+_worker_budget: int | None = None
+
+
+def set_worker_budget(n_workers: int | None) -> None:
+    """Cap the default process count of pools started in this process; None resets it.
+
+    ``sbt_agency.pipeline`` sets this in its workers so that nested pools
+    (sweeps, rollouts) share the machine instead of each taking every core.
+    """
+    global _worker_budget
+    if n_workers is not None and n_workers < 1:
+        raise ValueError("n_workers must be positive")
+    _worker_budget = n_workers
+
+
+def default_workers() -> int:
+    """Process count used when ``n_workers`` is not given: the budget, else all cores."""
+    if _worker_budget is not None:
+        return _worker_budget
+    return os.cpu_count() or 1
+
+
+def _init_worker(handle: SharedKernelHandle, table: np.ndarray, n_steps: int) -> None:
+    kernel, successors = attach_kernel(handle)
+    _WORKER_STATE["kernel"] = kernel
+    _WORKER_STATE["table"] = table
+    _WORKER_STATE["n_steps"] = n_steps
+    _WORKER_STATE["successors"] = successors
+
+
+def _run_block(
+    s0: np.ndarray,
+    seed_seq: np.random.SeedSequence,
+    kernel: FiniteKernel | None = None,
+    table: np.ndarray | None = None,
+    n_steps: int | None = None,
+    successors: SuccessorTable | None = None,
+) -> dict[str, np.ndarray]:
+    if kernel is None:
+        kernel = _WORKER_STATE["kernel"]
+        table = _WORKER_STATE["table"]
+        n_steps = _WORKER_STATE["n_steps"]
+        successors = _WORKER_STATE["successors"]
+    return rollout_batch(
+        kernel,
+        s0,
+        n_steps,
+        table,
+        rng=np.random.default_rng(seed_seq),
+        successors=successors,
+    )
+
+
+def _run_block_task(args: tuple[np.ndarray, np.random.SeedSequence]) -> dict[str, np.ndarray]:
+    return _run_block(*args)
+
+
+def parallel_rollouts(
+    kernel: FiniteKernel,
+    s0: int | np.ndarray,
+    n_steps: int,
+    policy: PolicyLike,
+    *,
+    n_traj: int | None = None,
+    seed: int | np.random.SeedSequence = 0,
+    block_size: int = 1024,
+    n_workers: int | None = None,
+) -> dict[str, np.ndarray]:
+    """Run batched rollouts split into blocks across a process pool.
+
+    Trajectories are cut into fixed blocks of ``block_size``; block k is driven
+    by the k-th child of ``SeedSequence(seed).spawn``. Blocks are merged in
+    order, so the output is bit-identical for any ``n_workers`` (including 1,
+    which runs in-process). Workers read the kernel and its successor table
+    from shared memory. Returns int32 ``s``, ``a``, ``s_next`` arrays of shape
+    ``(n_steps, n_traj)``.
+    """
+    if block_size <= 0:
+        raise ValueError("block_size must be positive")
+    if isinstance(s0, (int, np.integer)):
+        if n_traj is None:
+            raise ValueError("n_traj is required when s0 is a single state")
+        starts = np.full(int(n_traj), int(s0), dtype=np.int32)
+    else:
+        starts = np.asarray(s0, dtype=np.int32)
+        if starts.ndim != 1:
+            raise ValueError("s0 must be a state index or a 1D array of states")
+
+    table = policy_table(policy, kernel.n_states, kernel.n_actions)
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    blocks = [starts[i : i + block_size] for i in range(0, starts.shape[0], block_size)]
+    seeds = root.spawn(len(blocks))
+
+    if n_workers is None:
+        n_workers = default_workers()
+    n_workers = max(1, min(n_workers, len(blocks)))
+
+    successors = kernel.successors()
+    if n_workers == 1:
+        results = [
+            _run_block(block, seq, kernel, table, n_steps, successors)
+            for block, seq in zip(blocks, seeds)
+        ]
+    else:
+        # Workers attach to the published kernel instead of unpickling a copy.
+        with SharedKernel(kernel, successors) as shared, ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(shared.handle, table, n_steps),
+        ) as pool:
+            results = list(pool.map(_run_block_task, zip(blocks, seeds)))
+
+    if not results:
+        empty = np.empty((n_steps, 0), dtype=np.int32)
+        return {"s": empty, "a": empty.copy(), "s_next": empty.copy()}
+    return {
+        name: np.concatenate([res[name] for res in results], axis=1)
+        for name in ("s", "a", "s_next")
+    }
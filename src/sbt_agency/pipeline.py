@@ -0,0 +1,347 @@
+"""Dependency-aware, incremental runner for the paper experiments."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+import hashlib
+import importlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import runpy
+import sys
+import traceback
+
+import numpy as np
+
+from sbt_agency.env_ring_agent import RingAgentConfig
+from sbt_agency.exp_configs import (
+    ablations_suite,
+    cfg_learning_theta,
+    cfg_packaging_ring_off,
+    cfg_packaging_ring_on,
+    sweep_noise_maintenance_run_id,
+)
+from sbt_agency.parallel import set_worker_budget
+from sbt_agency.repro import code_version, stable_hash, write_text_atomic
+
+PIPELINE_STAMP_FORMAT = "sbt_pipeline_stamp"
+STAMP_DIR = ".pipeline"
+
+
+@dataclass(frozen=True)
+class Experiment:
+    """One experiment and what it reads and writes.
+
+    ``target`` is a script path, run as ``__main__``, or a ``"module:function"``
+    string naming a ``main(argv)`` called with no arguments. ``inputs`` holds
+    the config hashes (or other plain values) the results depend on;
+    ``outputs`` are paths relative to the results directory; ``after`` names
+    experiments that must finish first.
+    """
+
+    name: str
+    target: str | Path
+    inputs: Mapping[str, Any] = field(default_factory=dict)
+    outputs: tuple[str, ...] = ()
+    after: tuple[str, ...] = ()
+
+
+def file_digest(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _config_hash(config: RingAgentConfig) -> str:
+    return stable_hash(asdict(config))
+
+
+def _is_script(target: str | Path) -> bool:
+    return isinstance(target, Path) or target.endswith(".py")
+
+
+def _module_file(target: str) -> str:
+    module = target.partition(":")[0]
+    spec = importlib.util.find_spec(module)
+    if spec is None or spec.origin is None:
+        raise ValueError(f"cannot find the module of target {target}")
+    return spec.origin
+
+
+def paper_experiments() -> list[Experiment]:
+    """The six experiments behind the paper, with outputs named by config hash."""
+    hash_off = _config_hash(cfg_packaging_ring_off())
+    hash_on = _config_hash(cfg_packaging_ring_on())
+    suite = {name: _config_hash(cfg) for name, cfg in ablations_suite().items()}
+    hash_default = _config_hash(RingAgentConfig())
+    hash_learning = _config_hash(cfg_learning_theta())
+    run_id = sweep_noise_maintenance_run_id()
+
+    packaging = f"packaging/packaging_ring_{hash_off}_{hash_on}"
+    protocol = f"protocol/protocol_horizon_{suite['full']}_{suite['no_protocol']}"
+    return [
+        Experiment(
+            "rollouts",
+            "sbt_agency.experiments.rollouts:main",
+            {"config": hash_default},
+            (f"rollouts/trace_{hash_default}.json",),
+        ),
+        Experiment(
+            "packaging",
+            "sbt_agency.experiments.packaging_ring:main",
+            {"config_off": hash_off, "config_on": hash_on},
+            (f"{packaging}.json", f"{packaging}.png"),
+        ),
+        Experiment(
+            "ablations",
+            "sbt_agency.experiments.ablations:main",
+            {"suite": suite},
+            tuple(f"ablations/run_{name}_{h}.json" for name, h in sorted(suite.items()))
+            + ("ablations/summary.csv",),
+        ),
+        Experiment(
+            "sweep",
+            "sbt_agency.experiments.sweep_noise_maintenance:main",
+            {"run_id": run_id},
+            (
+                f"sweeps/noise_maintenance_{run_id}.npz",
+                f"sweeps/noise_maintenance_K_{run_id}.png",
+                f"sweeps/noise_maintenance_E_{run_id}.png",
+            ),
+        ),
+        Experiment(
+            "protocol",
+            "sbt_agency.experiments.protocol_horizon:main",
+            {"config_on": suite["full"], "config_off": suite["no_protocol"]},
+            (f"{protocol}.json", f"{protocol}.png"),
+        ),
+        Experiment(
+            "learning",
+            "sbt_agency.experiments.learning_theta:main",
+            {"config": hash_learning},
+            (
+                f"learning/learning_theta_{hash_learning}.json",
+                f"learning/learning_theta_{hash_learning}.png",
+            ),
+        ),
+    ]
+
+
+def _check_graph(experiments: Sequence[Experiment]) -> None:
+    names = [exp.name for exp in experiments]
+    if len(set(names)) != len(names):
+        raise ValueError("experiment names must be unique")
+    deps = {exp.name: set(exp.after) for exp in experiments}
+    for name, after in deps.items():
+        unknown = after - deps.keys()
+        if unknown:
+            raise ValueError(f"{name} depends on unknown experiments: {sorted(unknown)}")
+    done: set[str] = set()
+    while len(done) < len(deps):
+        ready = {name for name, after in deps.items() if name not in done and after <= done}
+        if not ready:
+            raise ValueError("experiment dependencies form a cycle")
+        done |= ready
+
+
+def _stamp_path(results_dir: Path, name: str) -> Path:
+    return results_dir / STAMP_DIR / f"{name}.json"
+
+
+def _read_stamp(results_dir: Path, name: str) -> dict | None:
+    try:
+        return json.loads(_stamp_path(results_dir, name).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def input_hash(experiment: Experiment, upstream: Mapping[str, Mapping[str, str]]) -> str:
+    """Hash of the declared inputs, the library and target sources, and upstream outputs."""
+    payload = {
+        "inputs": dict(experiment.inputs),
+        "code_version": code_version(),
+        "upstream": {name: dict(upstream[name]) for name in experiment.after},
+    }
+    if _is_script(experiment.target):
+        payload["script"] = file_digest(experiment.target)
+    else:
+        payload["target"] = experiment.target
+        payload["module"] = file_digest(_module_file(experiment.target))
+    return stable_hash(payload)
+
+
+def outputs_valid(results_dir: str | Path, stamp: Mapping[str, Any]) -> bool:
+    """True if every output recorded in ``stamp`` exists with its recorded digest."""
+    results_dir = Path(results_dir)
+    for rel, digest in stamp.get("outputs", {}).items():
+        path = results_dir / rel
+        if not path.is_file() or file_digest(path) != digest:
+            return False
+    return True
+
+
+def _call_target(target: str) -> Any:
+    if _is_script(target):
+        runpy.run_path(target, run_name="__main__")
+        return None
+    module, _, function = target.partition(":")
+    return getattr(importlib.import_module(module), function)([])
+
+
+def _run_target(target: str, root: str, log_path: str, budget: int) -> str | None:
+    """Run one experiment target from ``root``; None on success, else the error.
+
+    ``budget`` caps the default size of pools the target starts itself.
+    """
+    os.chdir(root)
+    set_worker_budget(budget)
+    argv = sys.argv
+    sys.argv = [target]
+    try:
+        with open(log_path, "w", encoding="utf-8") as log, redirect_stdout(log), redirect_stderr(
+            log
+        ):
+            try:
+                code = _call_target(target)
+            except SystemExit as exc:
+                code = exc.code
+            except Exception:
+                traceback.print_exc()
+                return traceback.format_exc(limit=1).strip().splitlines()[-1]
+            if code not in (None, 0):
+                return f"exited with status {code}"
+    finally:
+        sys.argv = argv
+    return None
+
+
+def _write_stamp(results_dir: Path, experiment: Experiment, digest: str) -> dict:
+    outputs = {}
+    for rel in experiment.outputs:
+        path = results_dir / rel
+        if not path.is_file():
+            raise FileNotFoundError(f"{experiment.name} did not write {rel}")
+        outputs[rel] = file_digest(path)
+    stamp = {
+        "format": PIPELINE_STAMP_FORMAT,
+        "experiment": experiment.name,
+        "target": str(experiment.target),
+        "inputs": dict(experiment.inputs),
+        "after": list(experiment.after),
+        "input_hash": digest,
+        "code_version": code_version(),
+        "outputs": outputs,
+        "created_at_utc": datetime.now(timezone.utc).isoformat(),
+        "versions": {"python": platform.python_version(), "numpy": np.__version__},
+    }
+    path = _stamp_path(results_dir, experiment.name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_text_atomic(path, json.dumps(stamp, indent=2, sort_keys=True) + "\n")
+    return stamp
+
+
+def run_pipeline(
+    experiments: Sequence[Experiment],
+    root: str | Path = ".",
+    *,
+    n_workers: int | None = None,
+    force: bool = False,
+) -> dict[str, str]:
+    """Run the experiments that are out of date, in dependency order.
+
+    Targets run with ``root`` as working directory and write under
+    ``root/results``. An experiment is skipped when its stamp in
+    ``results/.pipeline`` has the current input hash (see ``input_hash``) and
+    all recorded outputs still match their digests. The rest run concurrently
+    in a pool of ``n_workers`` processes (default: all cores) as soon as their
+    dependencies finish, logging to ``results/.pipeline/<name>.log``. Each
+    worker gets ``cpu_count // n_workers`` cores for the pools it starts
+    itself. Where available the pool forks, so workers inherit the modules
+    imported here. Returns the status of each experiment: "skipped", "ran",
+    "failed" or "blocked" (a dependency failed).
+    """
+    _check_graph(experiments)
+    root = Path(root).resolve()
+    results_dir = root / "results"
+    (results_dir / STAMP_DIR).mkdir(parents=True, exist_ok=True)
+    by_name = {exp.name: exp for exp in experiments}
+    status: dict[str, str] = {}
+    upstream: dict[str, dict[str, str]] = {}
+    digests: dict[str, str] = {}
+
+    def ready() -> list[Experiment]:
+        return [
+            exp
+            for exp in experiments
+            if exp.name not in status and all(dep in status for dep in exp.after)
+        ]
+
+    fork = "fork" in multiprocessing.get_all_start_methods()
+    if fork:
+        # Imported once here so forked workers inherit the modules.
+        for exp in experiments:
+            if not _is_script(exp.target):
+                importlib.import_module(str(exp.target).partition(":")[0])
+    n_cpus = os.cpu_count() or 1
+    n_workers = max(1, n_cpus if n_workers is None else n_workers)
+    budget = max(1, n_cpus // n_workers)
+    running: dict[Future, str] = {}
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=multiprocessing.get_context("fork") if fork else None,
+    ) as pool:
+        while len(status) < len(experiments):
+            for exp in ready():
+                if exp.name in running.values():
+                    continue
+                if any(status[dep] not in ("ran", "skipped") for dep in exp.after):
+                    status[exp.name] = "blocked"
+                    continue
+                digests[exp.name] = input_hash(exp, upstream)
+                stamp = _read_stamp(results_dir, exp.name)
+                if (
+                    not force
+                    and stamp is not None
+                    and stamp.get("input_hash") == digests[exp.name]
+                    and set(stamp.get("outputs", {})) == set(exp.outputs)
+                    and outputs_valid(results_dir, stamp)
+                ):
+                    status[exp.name] = "skipped"
+                    upstream[exp.name] = stamp["outputs"]
+                    continue
+                log_path = results_dir / STAMP_DIR / f"{exp.name}.log"
+                future = pool.submit(
+                    _run_target, str(exp.target), str(root), str(log_path), budget
+                )
+                running[future] = exp.name
+            if not running:
+                continue
+            finished, _pending = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                error = future.result()
+                if error is None:
+                    try:
+                        stamp = _write_stamp(results_dir, by_name[name], digests[name])
+                    except FileNotFoundError as exc:
+                        error = str(exc)
+                        with open(results_dir / STAMP_DIR / f"{name}.log", "a") as log:
+                            log.write(f"{error}\n")
+                if error is None:
+                    status[name] = "ran"
+                    upstream[name] = stamp["outputs"]
+                else:
+                    _stamp_path(results_dir, name).unlink(missing_ok=True)
+                    status[name] = "failed"
+    return status
@@ -0,0 +1,85 @@
+"""Figures for the experiment scripts.
+
+matplotlib is imported only when a figure is drawn, so runs that skip plots
+never pay for it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+def matplotlib_version() -> str | None:
+    """Installed matplotlib version, read without importing it."""
+    try:
+        return metadata.version("matplotlib")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _pyplot() -> Any:
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def plot_lines(
+    path: str | Path,
+    x: Sequence[float],
+    series: Mapping[str | None, Sequence[float]],
+    *,
+    xlabel: str,
+    ylabel: str,
+    figsize: tuple[float, float] = (6, 4),
+    ylim: tuple[float, float] | None = None,
+    grid: bool = False,
+) -> Path:
+    """Save one marker line per series; a legend is drawn when series are labelled."""
+    plt = _pyplot()
+    plt.figure(figsize=figsize)
+    for label, ys in series.items():
+        plt.plot(x, ys, marker="o", label=label)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    if ylim is not None:
+        plt.ylim(*ylim)
+    if any(label is not None for label in series):
+        plt.legend()
+    if grid:
+        plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+    return Path(path)
+
+
+def plot_heatmap(
+    path: str | Path,
+    data: np.ndarray,
+    *,
+    title: str,
+    xlabel: str,
+    ylabel: str,
+    xticklabels: Sequence[Any],
+    yticklabels: Sequence[Any],
+    cbar_label: str,
+) -> Path:
+    """Save a grid of values with rows along y, as in the sweep figures."""
+    plt = _pyplot()
+    plt.figure(figsize=(6, 4))
+    plt.imshow(data, origin="lower", aspect="auto")
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    plt.xticks(ticks=range(len(xticklabels)), labels=xticklabels)
+    plt.yticks(ticks=range(len(yticklabels)), labels=yticklabels)
+    plt.colorbar(label=cbar_label)
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+    return Path(path)
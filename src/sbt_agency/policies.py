@@ -95,3 +95,90 @@ def make_move_right_if_possible(
 
     return pi
 
+
+def _ledger_feasible_table(
+    action_names: Sequence[str], cost_by_name: dict[str, int], state_tuples: Sequence[tuple]
+) -> tuple[np.ndarray, np.ndarray]:
+    tuples = np.asarray(state_tuples, dtype=np.int64).reshape(len(state_tuples), -1)
+    costs = np.array([cost_by_name.get(name, 0) for name in action_names], dtype=np.int64)
+    return tuples, costs[None, :] <= tuples[:, 3:4]
+
+
+def _fallback_actions(action_names: Sequence[str], feasible: np.ndarray) -> np.ndarray:
+    """LEFT if feasible, else the first feasible action, else 0 (the closures' fallback)."""
+    actions = np.where(feasible.any(axis=1), feasible.argmax(axis=1), 0)
+    if "LEFT" in action_names:
+        left = action_names.index("LEFT")
+        actions = np.where(feasible[:, left], left, actions)
+    return actions
+
+
+def _one_hot(actions: np.ndarray, n_actions: int) -> np.ndarray:
+    table = np.zeros((actions.shape[0], n_actions), dtype=float)
+    table[np.arange(actions.shape[0]), actions] = 1.0
+    return table
+
+
+def random_feasible_table(
+    action_names: Sequence[str], cost_by_name: dict[str, int], state_tuples: Sequence[tuple]
+) -> np.ndarray:
+    """Compile ``make_random_feasible`` into an (n_states, n_actions) probability table."""
+    _tuples, feasible = _ledger_feasible_table(action_names, cost_by_name, state_tuples)
+    n_feasible = feasible.sum(axis=1)
+    table = feasible / np.maximum(n_feasible, 1)[:, None]
+    fallback = action_names.index("LEFT") if "LEFT" in action_names else 0
+    table[n_feasible == 0, fallback] = 1.0
+    return table
+
+
+def maintenance_first_table(
+    action_names: Sequence[str], cost_by_name: dict[str, int], state_tuples: Sequence[tuple]
+) -> np.ndarray:
+    """Compile ``make_maintenance_first`` into a one-hot (n_states, n_actions) table."""
+    tuples, feasible = _ledger_feasible_table(action_names, cost_by_name, state_tuples)
+    actions = _fallback_actions(action_names, feasible)
+    if "RIGHT" in action_names:
+        right = action_names.index("RIGHT")
+        actions = np.where(feasible[:, right], right, actions)
+    if "REPAIR" in action_names:
+        repair = action_names.index("REPAIR")
+        actions = np.where((tuples[:, 1] == 1) & feasible[:, repair], repair, actions)
+    return _one_hot(actions, len(action_names))
+
+
+def move_right_table(
+    action_names: Sequence[str],
+    cost_by_name: dict[str, int],
+    state_tuples: Sequence[tuple],
+    randomize: bool = True,
+) -> np.ndarray:
+    """Compile ``make_move_right_if_possible`` into an (n_states, n_actions) table.
+
+    ``randomize`` mirrors passing an rng to the factory: without RIGHT the
+    action is uniform over the feasible ones instead of the fixed fallback.
+    """
+    _tuples, feasible = _ledger_feasible_table(action_names, cost_by_name, state_tuples)
+    table = _one_hot(_fallback_actions(action_names, feasible), len(action_names))
+    if randomize:
+        n_feasible = feasible.sum(axis=1)
+        rows = n_feasible > 0
+        table[rows] = feasible[rows] / n_feasible[rows, None]
+    if "RIGHT" in action_names:
+        right = action_names.index("RIGHT")
+        rows = feasible[:, right]
+        table[rows] = 0.0
+        table[rows, right] = 1.0
+    return table
+
+
+def baseline_policy_tables(
+    action_names: Sequence[str],
+    cost_by_name: dict[str, int],
+    state_tuples: Sequence[tuple],
+) -> dict[str, np.ndarray]:
+    """Compile all baseline policies, keyed like the rollout script's runs."""
+    return {
+        "random_feasible": random_feasible_table(action_names, cost_by_name, state_tuples),
+        "maintenance_first": maintenance_first_table(action_names, cost_by_name, state_tuples),
+        "move_right": move_right_table(action_names, cost_by_name, state_tuples),
+    }
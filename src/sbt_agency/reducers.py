@@ -0,0 +1,100 @@
+"""Constant-memory reducers over streamed rollout chunks."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, Protocol
+
+import numpy as np
+
+
+class Reducer(Protocol):
+    def update(self, chunk: Mapping[str, np.ndarray]) -> None: ...
+
+    def result(self) -> Any: ...
+
+
+class OccupancyHistogram:
+    """Count visits to each state over all trajectories and steps."""
+
+    def __init__(self, n_states: int) -> None:
+        self.counts = np.zeros(n_states, dtype=np.int64)
+
+    def update(self, chunk: Mapping[str, np.ndarray]) -> None:
+        self.counts += np.bincount(chunk["s"].ravel(), minlength=self.counts.shape[0])
+
+    def result(self) -> np.ndarray:
+        return self.counts.copy()
+
+
+class ActionFrequencies:
+    """Count how often each action is taken."""
+
+    def __init__(self, n_actions: int) -> None:
+        self.counts = np.zeros(n_actions, dtype=np.int64)
+
+    def update(self, chunk: Mapping[str, np.ndarray]) -> None:
+        self.counts += np.bincount(chunk["a"].ravel(), minlength=self.counts.shape[0])
+
+    def result(self) -> np.ndarray:
+        return self.counts.copy()
+
+
+class FirstHitTime:
+    """Per-trajectory first time the state lies in a target set.
+
+    Time tau counts steps, so tau=0 is the start state and a hit through
+    ``s_next`` at step t is recorded as t + 1. Trajectories that never hit are
+    reported as -1.
+    """
+
+    def __init__(self, target_mask: np.ndarray) -> None:
+        self.target = np.asarray(target_mask, dtype=bool)
+        if self.target.ndim != 1:
+            raise ValueError("target_mask must be a 1D boolean array over states")
+        self.times: np.ndarray | None = None
+
+    def update(self, chunk: Mapping[str, np.ndarray]) -> None:
+        t = np.asarray(chunk["t"])
+        if len(t) == 0:
+            return
+        s_next = np.asarray(chunk["s_next"])
+        if s_next.ndim == 1:
+            s_next = s_next[:, None]
+        if self.times is None:
+            self.times = np.full(s_next.shape[1], -1, dtype=np.int64)
+            s_first = np.asarray(chunk["s"]).reshape(len(t), -1)[0]
+            self.times[self.target[s_first]] = 0
+        open_ = self.times < 0
+        if not np.any(open_):
+            return
+        hits = self.target[s_next[:, open_]]
+        any_hit = hits.any(axis=0)
+        first = hits.argmax(axis=0)
+        idx = np.flatnonzero(open_)[any_hit]
+        self.times[idx] = t[first[any_hit]] + 1
+
+    def result(self) -> np.ndarray:
+        if self.times is None:
+            return np.zeros(0, dtype=np.int64)
+        return self.times.copy()
+
+
+def time_to_first_unsafe(safe_mask: np.ndarray) -> FirstHitTime:
+    """First time each trajectory leaves the safe set."""
+    return FirstHitTime(~np.asarray(safe_mask, dtype=bool))
+
+
+def ledger_depletion_time(ledger: Sequence[int] | np.ndarray, level: int = 0) -> FirstHitTime:
+    """First time each trajectory's ledger value drops to ``level`` or below."""
+    return FirstHitTime(np.asarray(ledger) <= level)
+
+
+def reduce_stream(
+    chunks: Iterable[Mapping[str, np.ndarray]], reducers: Sequence[Reducer]
+) -> list[Any]:
+    """Feed every chunk to every reducer and return their results in order."""
+    for chunk in chunks:
+        for reducer in reducers:
+            reducer.update(chunk)
+    return [reducer.result() for reducer in reducers]
@@ -4,12 +4,14 @@ from __future__ import annotations
 
 from dataclasses import is_dataclass, fields
 from datetime import datetime, timezone
+from functools import lru_cache
 import base64
 import hashlib
 import json
 import math
 import os
 import random
+import tempfile
 from pathlib import Path
 from typing import Any
 
@@ -85,6 +87,50 @@ def stable_hash(obj: Any) -> str:
     return hashlib.sha256(payload).hexdigest()
 
 
+# Front ends and experiment drivers, relative to the package. They produce no
+# library results, so editing them leaves code_version() unchanged; the
+# pipeline and the paper exporter digest the drivers they run separately.
+APPLICATION_MODULES = ("cli.py", "service.py", "experiments/")
+
+
+@lru_cache(maxsize=None)
+def code_version() -> str:
+    """Return a sha256 hex digest of the installed sbt_agency library sources.
+
+    Results computed by one version of the library are keyed on this, so any
+    edit to a library module invalidates them. ``APPLICATION_MODULES`` are
+    left out.
+    """
+    package_dir = Path(__file__).resolve().parent
+    digest = hashlib.sha256()
+    for path in sorted(package_dir.rglob("*.py")):
+        if path.relative_to(package_dir).as_posix().startswith(APPLICATION_MODULES):
+            continue
+        digest.update(path.relative_to(package_dir).as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def write_text_atomic(path: str | Path, text: str) -> Path:
+    """Write ``text`` to ``path`` through a uniquely named temp file and ``os.replace``.
+
+    Concurrent writers of one path each use their own temp file, so readers
+    see one complete version and no writer fails.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return path
+
+
 def write_run_manifest(
     path: str | Path,
     config: Any,
@@ -0,0 +1,263 @@
+"""Local JSON-over-HTTP metrics service that keeps ring kernels warm."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+from sbt_agency.empowerment import capacity_bits
+from sbt_agency.env_ring_agent import RingAgentConfig
+from sbt_agency.metrics import MetricsSession
+from sbt_agency.repro import stable_hash
+
+
+def config_from_dict(data: dict[str, Any]) -> RingAgentConfig:
+    """Rebuild a RingAgentConfig from its ``asdict`` form (JSON lists become tuples)."""
+    if not isinstance(data, dict):
+        raise ValueError("config must be a JSON object")
+    known = {f.name for f in fields(RingAgentConfig)}
+    unknown = set(data) - known
+    if unknown:
+        raise ValueError(f"unknown RingAgentConfig fields: {sorted(unknown)}")
+    return RingAgentConfig(
+        **{k: tuple(v) if isinstance(v, list) else v for k, v in data.items()}
+    )
+
+
+@dataclass
+class _Entry:
+    last_used: float
+    session: MetricsSession | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class SessionPool:
+    """MetricsSessions keyed by config hash, evicting the least recently used.
+
+    At most ``max_sessions`` are kept; with ``idle_seconds`` set, sessions not
+    queried for that long (by ``clock``) are dropped on the next access.
+    Sessions are built under their own lock, so a cold config does not hold
+    up queries on other configs.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 8,
+        idle_seconds: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be positive")
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self.clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.built = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict_idle(self, now: float) -> None:
+        if self.idle_seconds is None:
+            return
+        for key in [k for k, e in self._entries.items() if now - e.last_used > self.idle_seconds]:
+            del self._entries[key]
+
+    def query(self, config: RingAgentConfig, fn: Callable[[MetricsSession], Any]) -> Any:
+        """Run ``fn`` on the session of ``config``, building it if needed."""
+        key = stable_hash(asdict(config))
+        with self._lock:
+            now = self.clock()
+            self._evict_idle(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(now)
+                self._entries[key] = entry
+                self.built += 1
+                while len(self._entries) > self.max_sessions:
+                    self._entries.popitem(last=False)
+            else:
+                entry.last_used = now
+                self._entries.move_to_end(key)
+        with entry.lock:
+            if entry.session is None:
+                entry.session = MetricsSession(config)
+            return fn(entry.session)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": list(self._entries),
+                "max_sessions": self.max_sessions,
+                "built": self.built,
+            }
+
+
+def _action_indices(session: MetricsSession, names: list[str] | None) -> tuple[int, ...] | None:
+    if names is None:
+        return None
+    return tuple(session.action_names.index(name) for name in names)
+
+
+def _ring_metrics(pool: SessionPool, req: dict) -> Any:
+    params = req.get("params", {})
+    return pool.query(config_from_dict(req["config"]), lambda s: s.ring_metrics(**params))
+
+
+def _viable_states(pool: SessionPool, req: dict) -> Any:
+    safe_r_min = int(req.get("safe_r_min", 1))
+    states = pool.query(config_from_dict(req["config"]), lambda s: s.viable_states(safe_r_min))
+    return states.tolist()
+
+
+def _empowerment(pool: SessionPool, req: dict) -> Any:
+    def run(session: MetricsSession) -> list[float]:
+        actions = _action_indices(session, req.get("actions"))
+        return session.capacities(req["states"], int(req.get("H", 2)), actions)
+
+    return pool.query(config_from_dict(req["config"]), run)
+
+
+def _capacity(_pool: SessionPool, req: dict) -> Any:
+    return capacity_bits(np.asarray(req["W"], dtype=float))
+
+
+ROUTES: dict[str, Callable[[SessionPool, dict], Any]] = {
+    "/ring_metrics": _ring_metrics,
+    "/viable_states": _viable_states,
+    "/empowerment": _empowerment,
+    "/capacity": _capacity,
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "MetricsServer"
+
+    def _reply(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/stats":
+            self._reply(200, self.server.pool.stats())
+        else:
+            self._reply(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        route = ROUTES.get(self.path)
+        if route is None:
+            self._reply(404, {"error": f"unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            result = route(self.server.pool, request)
+        except (KeyError, TypeError, ValueError, IndexError) as exc:
+            self._reply(400, {"error": f"{type(exc).__name__}: {exc}"})
+            return
+        except Exception as exc:
+            self._reply(500, {"error": f"{type(exc).__name__}: {exc}"})
+            return
+        self._reply(200, {"result": result})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """HTTP server answering metric queries from a shared SessionPool.
+
+    Endpoints take and return JSON: POST /ring_metrics, /viable_states,
+    /empowerment and /capacity (see ``MetricsClient``), GET /stats.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        max_sessions: int = 8,
+        idle_seconds: float | None = None,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__((host, port), _Handler)
+        self.pool = SessionPool(max_sessions, idle_seconds)
+        self.verbose = verbose
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MetricsServer":
+        """Serve from a daemon thread; stop with ``shutdown()`` and ``server_close()``."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class MetricsClient:
+    """Thin client for a running MetricsServer."""
+
+    def __init__(self, url: str, timeout: float | None = None) -> None:
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _call(self, path: str, payload: dict | None = None) -> Any:
+        data = None if payload is None else json.dumps(payload).encode("utf-8")
+        request = urllib.request.Request(
+            self.url + path, data=data, headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = json.loads(response.read())
+        except urllib.error.HTTPError as exc:
+            if exc.code == 400:
+                raise ValueError(json.loads(exc.read())["error"]) from None
+            if exc.code == 500:
+                raise RuntimeError(json.loads(exc.read())["error"]) from None
+            raise
+        return body if payload is None else body["result"]
+
+    def ring_metrics(self, config: RingAgentConfig, **params: Any) -> dict[str, Any]:
+        """Same dict as ``compute_ring_metrics(config, **params)``."""
+        return self._call("/ring_metrics", {"config": asdict(config), "params": params})
+
+    def viable_states(self, config: RingAgentConfig, safe_r_min: int = 1) -> list[int]:
+        return self._call("/viable_states", {"config": asdict(config), "safe_r_min": safe_r_min})
+
+    def empowerment(
+        self,
+        config: RingAgentConfig,
+        states: list[int],
+        H: int = 2,
+        actions: list[str] | None = None,
+    ) -> list[float]:
+        """Feasible empowerment (bits) of ``states`` over action names ``actions``."""
+        payload = {"config": asdict(config), "states": [int(s) for s in states], "H": H}
+        if actions is not None:
+            payload["actions"] = list(actions)
+        return self._call("/empowerment", payload)
+
+    def capacity(self, W: np.ndarray) -> float:
+        return self._call("/capacity", {"W": np.asarray(W, dtype=float).tolist()})
+
+    def stats(self) -> dict[str, Any]:
+        return self._call("/stats")
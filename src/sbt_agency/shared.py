@@ -0,0 +1,168 @@
+"""Zero-copy kernel distribution to worker processes."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from pathlib import Path
+import sys
+import tempfile
+import uuid
+import weakref
+
+import numpy as np
+
+from sbt_agency.kernel import FiniteKernel, SuccessorTable
+
+BACKENDS = ("shm", "memmap")
+_SUCCESSOR_FIELDS = ("succ", "prob", "cdf", "n_succ")
+
+# Segments attached by this process, kept open while their arrays are in use
+# and dropped when the owner in this process releases them.
+_ATTACHED: dict[str, shared_memory.SharedMemory] = {}
+
+
+@dataclass(frozen=True)
+class ArraySpec:
+    location: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+@dataclass(frozen=True)
+class SharedKernelHandle:
+    """Picklable description of a published kernel; pass it to workers."""
+
+    backend: str
+    arrays: dict[str, ArraySpec]
+    state_shape: tuple[int, ...] | None = None
+
+
+def _attach_shm(name: str) -> shared_memory.SharedMemory:
+    if name in _ATTACHED:
+        return _ATTACHED[name]
+    if sys.version_info >= (3, 13):
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        # Workers share the owner's resource tracker, where registering a
+        # name it already holds is a no-op. Unregistering here would drop the
+        # owner's registration and leak the segment if the owner crashed.
+        shm = shared_memory.SharedMemory(name=name)
+    _ATTACHED[name] = shm
+    return shm
+
+
+def _detach(name: str) -> None:
+    shm = _ATTACHED.pop(name, None)
+    if shm is not None:
+        try:
+            shm.close()
+        except BufferError:
+            pass  # arrays still view the mapping; it closes when they are freed
+
+
+def _attach_array(backend: str, spec: ArraySpec) -> np.ndarray:
+    if backend == "memmap":
+        return np.load(spec.location, mmap_mode="r")
+    shm = _attach_shm(spec.location)
+    arr = np.ndarray(spec.shape, dtype=np.dtype(spec.dtype), buffer=shm.buf)
+    arr.setflags(write=False)
+    return arr
+
+
+def _release(
+    segments: list[shared_memory.SharedMemory], files: list[Path], dirs: list[Path]
+) -> None:
+    for shm in segments:
+        _detach(shm.name)
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    for path in files:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+    for path in dirs:
+        try:
+            path.rmdir()
+        except OSError:
+            pass
+
+
+@dataclass(eq=False)
+class SharedKernel:
+    """Publish a kernel's arrays in shared memory or memory-mapped files.
+
+    The publishing process owns the segments: ``close()`` (or leaving the
+    ``with`` block) unlinks them, a finalizer does so at interpreter exit, and
+    the multiprocessing resource tracker reclaims shared-memory segments if
+    the owner dies without cleaning up. Workers only attach, so a crashing
+    worker never leaks or removes a segment.
+    """
+
+    kernel: FiniteKernel
+    successors: SuccessorTable | None = None
+    state_shape: tuple[int, ...] | None = None
+    backend: str = "shm"
+    directory: str | Path | None = None
+    handle: SharedKernelHandle = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}")
+        arrays = {"P": self.kernel.P}
+        if self.successors is not None:
+            arrays.update({f: getattr(self.successors, f) for f in _SUCCESSOR_FIELDS})
+
+        self._segments: list[shared_memory.SharedMemory] = []
+        self._files: list[Path] = []
+        self._dirs: list[Path] = []
+        self._finalizer = weakref.finalize(
+            self, _release, self._segments, self._files, self._dirs
+        )
+        if self.backend == "memmap":
+            self._dirs.append(Path(tempfile.mkdtemp(prefix="sbt_kernel_", dir=self.directory)))
+        specs = {}
+        for key, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            if self.backend == "memmap":
+                path = self._dirs[0] / f"{key}_{uuid.uuid4().hex}.npy"
+                np.save(path, arr)
+                self._files.append(path)
+                location = str(path)
+            else:
+                shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+                self._segments.append(shm)
+                np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+                location = shm.name
+            specs[key] = ArraySpec(location, tuple(arr.shape), arr.dtype.str)
+        state_shape = tuple(self.state_shape) if self.state_shape is not None else None
+        self.handle = SharedKernelHandle(self.backend, specs, state_shape)
+
+    def __enter__(self) -> "SharedKernel":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._finalizer()
+
+
+def attach_kernel(handle: SharedKernelHandle) -> tuple[FiniteKernel, SuccessorTable | None]:
+    """Attach to a published kernel without copying its arrays.
+
+    Returns the kernel and, if it was published, its successor table. The
+    arrays are read-only views onto the shared segments or files.
+    """
+    if handle.backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}")
+    arrays = {key: _attach_array(handle.backend, spec) for key, spec in handle.arrays.items()}
+    kernel = FiniteKernel(arrays["P"])
+    successors = None
+    if all(f in arrays for f in _SUCCESSOR_FIELDS):
+        successors = SuccessorTable(**{f: arrays[f] for f in _SUCCESSOR_FIELDS})
+    return kernel, successors
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Callable, Sequence
+from typing import Callable, Iterator, Sequence
 
 import numpy as np
 
-from sbt_agency.kernel import FiniteKernel
+from sbt_agency.kernel import FiniteKernel, PolicyLike, SuccessorTable, policy_table
 
 
 def sample_next_state(kernel: FiniteKernel, s: int, a: int, rng: np.random.Generator) -> int:
@@ -56,3 +56,127 @@ def rollout(
         s = s_next
     return traj
 
+
+def _action_sampler(
+    policy: PolicyLike, n_states: int, n_actions: int
+) -> tuple[np.ndarray | None, np.ndarray | None]:
+    """Return (deterministic actions, None) or (None, per-state action CDFs)."""
+    table = policy_table(policy, n_states, n_actions)
+    rows = np.arange(n_states)
+    actions = table.argmax(axis=1)
+    if np.all(table[rows, actions] == 1.0):
+        return actions.astype(np.int32), None
+    cdf = np.cumsum(table, axis=1)
+    return None, cdf / cdf[:, -1:]
+
+
+def sample_actions(cdf: np.ndarray, states: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """Map uniforms u in [0, 1) to actions using per-state action CDFs."""
+    return (cdf[states] <= u[:, None]).sum(axis=1).astype(np.int32)
+
+
+def _initial_batch(kernel: FiniteKernel, s0: int | np.ndarray, n_traj: int | None) -> np.ndarray:
+    if isinstance(s0, (int, np.integer)):
+        if n_traj is None:
+            raise ValueError("n_traj is required when s0 is a single state")
+        s = np.full(int(n_traj), int(s0), dtype=np.int32)
+    else:
+        s = np.asarray(s0, dtype=np.int32).copy()
+        if s.ndim != 1:
+            raise ValueError("s0 must be a state index or a 1D array of states")
+        if n_traj is not None and n_traj != s.shape[0]:
+            raise ValueError("n_traj does not match the length of s0")
+    if np.any(s < 0) or np.any(s >= kernel.n_states):
+        raise ValueError("s0 out of range")
+    return s
+
+
+def iter_rollout_chunks(
+    kernel: FiniteKernel,
+    s0: int | np.ndarray,
+    n_steps: int | None,
+    policy: PolicyLike,
+    *,
+    chunk_size: int = 4096,
+    n_traj: int | None = None,
+    rng: np.random.Generator | None = None,
+    successors: SuccessorTable | None = None,
+) -> Iterator[dict[str, np.ndarray]]:
+    """Yield a batched rollout as fixed-size chunks of step arrays.
+
+    Each chunk holds ``t`` of shape ``(m,)`` and int32 ``s``, ``a``, ``s_next`` of
+    shape ``(m, n_traj)`` with ``m <= chunk_size``. ``n_steps=None`` streams
+    indefinitely; memory use is bounded by one chunk.
+    """
+    if rng is None:
+        rng = np.random.default_rng(0)
+    if n_steps is not None and n_steps < 0:
+        raise ValueError("n_steps must be non-negative")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    s = _initial_batch(kernel, s0, n_traj)
+    if successors is None:
+        successors = kernel.successors()
+
+    fixed_actions, action_cdf = _action_sampler(policy, kernel.n_states, kernel.n_actions)
+
+    n = s.shape[0]
+    t0 = 0
+    while n_steps is None or t0 < n_steps:
+        m = chunk_size if n_steps is None else min(chunk_size, n_steps - t0)
+        out_s = np.empty((m, n), dtype=np.int32)
+        out_a = np.empty((m, n), dtype=np.int32)
+        out_next = np.empty((m, n), dtype=np.int32)
+        for i in range(m):
+            if fixed_actions is not None:
+                a = fixed_actions[s]
+            else:
+                a = sample_actions(action_cdf, s, rng.random(n))
+            s_next = successors.sample(a, s, rng.random(n)).astype(np.int32)
+            out_s[i] = s
+            out_a[i] = a
+            out_next[i] = s_next
+            s = s_next
+        t = np.arange(t0, t0 + m, dtype=np.int64)
+        yield {"t": t, "s": out_s, "a": out_a, "s_next": out_next}
+        t0 += m
+
+
+def rollout_batch(
+    kernel: FiniteKernel,
+    s0: int | np.ndarray,
+    n_steps: int,
+    policy: PolicyLike,
+    *,
+    n_traj: int | None = None,
+    rng: np.random.Generator | None = None,
+    successors: SuccessorTable | None = None,
+) -> dict[str, np.ndarray]:
+    """Advance a batch of trajectories in lockstep under a stationary policy.
+
+    ``policy`` is an ``(n_states,)`` action array, an ``(n_states, n_actions)``
+    probability table, or a per-state callable compiled once into a table. Each
+    step draws one uniform per trajectory for the successor (plus one for the
+    action when the policy is stochastic) and samples through precomputed
+    successor CDFs. Returns int32 arrays ``s``, ``a`` and ``s_next`` of shape
+    ``(n_steps, n_traj)``.
+    """
+    if n_steps < 0:
+        raise ValueError("n_steps must be non-negative")
+    if n_steps == 0:
+        n = _initial_batch(kernel, s0, n_traj).shape[0]
+        empty = np.empty((0, n), dtype=np.int32)
+        return {"s": empty, "a": empty.copy(), "s_next": empty.copy()}
+    chunk = next(
+        iter_rollout_chunks(
+            kernel,
+            s0,
+            n_steps,
+            policy,
+            chunk_size=n_steps,
+            n_traj=n_traj,
+            rng=rng,
+            successors=successors,
+        )
+    )
+    return {"s": chunk["s"], "a": chunk["a"], "s_next": chunk["s_next"]}
@@ -0,0 +1,359 @@
+"""Resumable process-parallel sweeps over RingAgentConfig fields."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, fields, replace
+from functools import partial
+from itertools import product
+from pathlib import Path
+from typing import Any
+import json
+
+import numpy as np
+
+from sbt_agency.cache import get_default_cache
+from sbt_agency.env_ring_agent import RingAgentConfig
+from sbt_agency.parallel import default_workers
+from sbt_agency.repro import code_version, stable_hash, write_text_atomic
+
+SWEEP_CELL_FORMAT = "sbt_sweep_cell"
+SWEEP_STORE_DIR = Path(".cache") / "sweeps"
+
+MetricFn = Callable[[RingAgentConfig], Mapping[str, float]]
+
+
+def _coerce_field(base: RingAgentConfig, name: str, value: Any) -> Any:
+    if isinstance(value, np.generic):
+        value = value.item()
+    current = getattr(base, name)
+    if isinstance(current, bool):
+        return bool(value)
+    if isinstance(current, tuple):
+        return tuple(value)
+    return type(current)(value)
+
+
+def _lattice_field(base: RingAgentConfig, name: str, value: float) -> Any:
+    """Like ``_coerce_field``, but rounds lattice coordinates onto integer fields."""
+    current = getattr(base, name)
+    if isinstance(current, int) and not isinstance(current, bool):
+        value = round(float(value))
+    return _coerce_field(base, name, value)
+
+
+def sweep_grid(
+    base: RingAgentConfig, axes: Mapping[str, Sequence[Any]]
+) -> list[tuple[tuple[int, ...], RingAgentConfig]]:
+    """Return (grid index, config) for every cell of the product of ``axes``."""
+    names = {f.name for f in fields(RingAgentConfig)}
+    for name in axes:
+        if name not in names:
+            raise ValueError(f"unknown RingAgentConfig field: {name}")
+    cells = []
+    for index in product(*(range(len(values)) for values in axes.values())):
+        updates = {
+            name: _coerce_field(base, name, values[i])
+            for (name, values), i in zip(axes.items(), index)
+        }
+        cells.append((index, replace(base, **updates)))
+    return cells
+
+
+def metric_name(metric_fn: MetricFn) -> str:
+    """Module and qualname of ``metric_fn``; a ``partial`` adds a hash of its bound arguments."""
+    if isinstance(metric_fn, partial):
+        bound = stable_hash({"args": list(metric_fn.args), "keywords": metric_fn.keywords})
+        return f"{metric_name(metric_fn.func)}[{bound[:16]}]"
+    return f"{metric_fn.__module__}.{metric_fn.__qualname__}"
+
+
+def sweep_store_path(name: str) -> Path:
+    """Directory of a named cell store, under the default metric cache if one is set.
+
+    Without a default cache (see ``sbt_agency.cache``) stores go under
+    ``.cache/sweeps`` in the working directory, outside ``results/``.
+    """
+    cache = get_default_cache()
+    return (cache.path / "sweeps" if cache is not None else SWEEP_STORE_DIR) / name
+
+
+class SweepStore:
+    """On-disk cell results keyed by ``stable_hash`` of (config, metric, code version).
+
+    Each finished cell is one JSON file under ``<path>/<key[:2]>/<key>.json``,
+    written atomically, so an interrupted sweep resumes from what is on disk.
+    Keys include ``code_version()``, so cells computed by other library code
+    are never reused.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(config: RingAgentConfig, metric: str) -> str:
+        return stable_hash({"config": asdict(config), "metric": metric, "version": code_version()})
+
+    def _file(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, float] | None:
+        path = self._file(key)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))["values"]
+
+    def put(
+        self, key: str, config: RingAgentConfig, metric: str, values: Mapping[str, float]
+    ) -> None:
+        path = self._file(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "format": SWEEP_CELL_FORMAT,
+            "config": asdict(config),
+            "metric": metric,
+            "version": code_version(),
+            "values": {k: float(v) for k, v in values.items()},
+        }
+        write_text_atomic(path, json.dumps(payload, sort_keys=True) + "\n")
+
+
+def _evaluate(metric_fn: MetricFn, config: RingAgentConfig) -> dict[str, float]:
+    return {k: float(v) for k, v in metric_fn(config).items()}
+
+
+def evaluate_configs(
+    configs: Sequence[RingAgentConfig],
+    metric_fn: MetricFn,
+    *,
+    store: SweepStore | str | Path | None = None,
+    n_workers: int | None = None,
+) -> list[dict[str, float]]:
+    """Evaluate ``metric_fn`` on each config, reusing and filling ``store``.
+
+    Missing cells are dispatched to a pool of ``n_workers`` processes (default:
+    ``sbt_agency.parallel.default_workers()``; 1 runs in-process) and stored
+    as they finish. ``metric_fn`` must be a picklable module-level function
+    (or a ``partial`` of one) returning a mapping of metric name to float.
+    """
+    if store is not None and not isinstance(store, SweepStore):
+        store = SweepStore(store)
+    name = metric_name(metric_fn)
+
+    results: list[dict[str, float] | None] = [None] * len(configs)
+    pending = []
+    for i, config in enumerate(configs):
+        cached = store.get(store.key(config, name)) if store is not None else None
+        if cached is None:
+            pending.append(i)
+        else:
+            results[i] = cached
+
+    def _finish(i: int, values: dict[str, float]) -> None:
+        results[i] = values
+        if store is not None:
+            store.put(store.key(configs[i], name), configs[i], name, values)
+
+    if n_workers is None:
+        n_workers = default_workers()
+    n_workers = max(1, min(n_workers, len(pending)))
+    if n_workers == 1:
+        for i in pending:
+            _finish(i, _evaluate(metric_fn, configs[i]))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = {pool.submit(_evaluate, metric_fn, configs[i]): i for i in pending}
+            for future in as_completed(futures):
+                _finish(futures[future], future.result())
+    return results
+
+
+def run_sweep(
+    base: RingAgentConfig,
+    axes: Mapping[str, Sequence[Any]],
+    metric_fn: MetricFn,
+    *,
+    store: SweepStore | str | Path | None = None,
+    n_workers: int | None = None,
+) -> dict[str, np.ndarray]:
+    """Evaluate ``metric_fn`` on every grid cell and assemble one array per metric.
+
+    Cells already present in ``store`` are reused (see ``evaluate_configs``).
+    Arrays have shape ``tuple(len(v) for v in axes.values())``.
+    """
+    cells = sweep_grid(base, axes)
+    results = evaluate_configs(
+        [config for _index, config in cells], metric_fn, store=store, n_workers=n_workers
+    )
+
+    shape = tuple(len(values) for values in axes.values())
+    keys = list(results[0]) if results else []
+    grids = {key: np.zeros(shape, dtype=float) for key in keys}
+    for (index, _config), values in zip(cells, results):
+        for key in keys:
+            grids[key][index] = values[key]
+    return grids
+
+
+def adaptive_sweep(
+    base: RingAgentConfig,
+    axes: Mapping[str, tuple[float, float]],
+    metric_fn: MetricFn,
+    *,
+    threshold: float | Mapping[str, float],
+    coarse: int = 4,
+    max_depth: int = 6,
+    store: SweepStore | str | Path | None = None,
+    n_workers: int | None = None,
+) -> dict[str, Any]:
+    """Quadtree sweep over two config fields, refining only where metrics change.
+
+    ``axes`` maps two field names to (low, high) ranges, discretized on a
+    lattice of ``coarse * 2**max_depth + 1`` points per axis (integer fields
+    are rounded). Starting from ``coarse`` x ``coarse`` cells, a cell is split
+    into four while a thresholded metric changes by more than ``threshold``
+    (one value for all metrics, or per metric name) along an edge in a
+    direction that can still be refined; along an integer field, a step
+    between adjacent integers is already resolved. Each level is evaluated as
+    one batch, and lattice points mapping to the same config are evaluated
+    once. Boundaries that do not show at the corners of a coarse cell are not
+    resolved.
+
+    Returns the lattice coordinates, the sparse samples, the leaf cells as
+    (i, j, size) lattice rows, and per-metric grids filled by bilinear
+    interpolation over the leaves (in the rounded field values along integer
+    axes). Samples on the edge of a coarser leaf are interpolated from that
+    leaf, so the grid is continuous across refinement levels.
+    """
+    if len(axes) != 2:
+        raise ValueError("adaptive sweeps take exactly two axes")
+    if coarse < 1 or max_depth < 0:
+        raise ValueError("coarse must be positive and max_depth non-negative")
+    names = list(axes)
+    for name in names:
+        if name not in {f.name for f in fields(RingAgentConfig)}:
+            raise ValueError(f"unknown RingAgentConfig field: {name}")
+    size = coarse * 2**max_depth
+    coords = [np.linspace(float(axes[n][0]), float(axes[n][1]), size + 1) for n in names]
+    field_values = [
+        np.array([_lattice_field(base, n, c) for c in coords[k]], dtype=float)
+        for k, n in enumerate(names)
+    ]
+    integer_axis = [
+        isinstance(getattr(base, n), int) and not isinstance(getattr(base, n), bool)
+        for n in names
+    ]
+
+    def config_at(point: tuple[int, int]) -> RingAgentConfig:
+        return replace(
+            base,
+            **{n: _lattice_field(base, n, coords[k][point[k]]) for k, n in enumerate(names)},
+        )
+
+    by_config: dict[RingAgentConfig, dict[str, float]] = {}
+    samples: dict[tuple[int, int], dict[str, float]] = {}
+
+    def evaluate(points: list[tuple[int, int]]) -> None:
+        configs = {p: config_at(p) for p in points if p not in samples}
+        todo = list(dict.fromkeys(c for c in configs.values() if c not in by_config))
+        for config, values in zip(
+            todo, evaluate_configs(todo, metric_fn, store=store, n_workers=n_workers)
+        ):
+            by_config[config] = values
+        for p, config in configs.items():
+            samples[p] = by_config[config]
+
+    def corners(cell: tuple[int, int, int]) -> list[tuple[int, int]]:
+        i, j, h = cell
+        return [(i, j), (i + h, j), (i, j + h), (i + h, j + h)]
+
+    def refinable(k: int, lo: int, hi: int) -> bool:
+        if hi - lo <= 1:
+            return False
+        if integer_axis[k]:
+            return abs(field_values[k][hi] - field_values[k][lo]) > 1
+        return True
+
+    def jumps(p: tuple[int, int], q: tuple[int, int]) -> bool:
+        for key, a in samples[p].items():
+            limit = threshold.get(key) if isinstance(threshold, Mapping) else threshold
+            if limit is not None and abs(a - samples[q][key]) > limit:
+                return True
+        return False
+
+    def needs_split(cell: tuple[int, int, int]) -> bool:
+        i, j, h = cell
+        c00, c10, c01, c11 = corners(cell)
+        if refinable(0, i, i + h) and (jumps(c00, c10) or jumps(c01, c11)):
+            return True
+        return refinable(1, j, j + h) and (jumps(c00, c01) or jumps(c10, c11))
+
+    def weights(k: int, lo: int, h: int) -> np.ndarray:
+        if not integer_axis[k]:
+            return np.linspace(0.0, 1.0, h + 1)
+        vals = field_values[k][lo : lo + h + 1]
+        span = vals[-1] - vals[0]
+        return (vals - vals[0]) / span if span else np.zeros(h + 1)
+
+    step = 2**max_depth
+    cells = [(i * step, j * step, step) for i in range(coarse) for j in range(coarse)]
+    evaluate([p for cell in cells for p in corners(cell)])
+    leaves = []
+    while cells:
+        children = []
+        for cell in cells:
+            i, j, h = cell
+            if needs_split(cell):
+                half = h // 2
+                children.extend(
+                    (i + di, j + dj, half) for di in (0, half) for dj in (0, half)
+                )
+            else:
+                leaves.append(cell)
+        evaluate([p for cell in children for p in corners(cell)])
+        cells = children
+
+    points = sorted(samples)
+    keys = list(samples[points[0]])
+    # Corner values of the leaves. A sample on the edge of a coarser leaf (a
+    # hanging node of its refined neighbour) takes that edge's interpolated
+    # value, so neighbouring leaves agree on shared edges. Coarser leaves go
+    # first so that chains of hanging nodes resolve from the coarsest edge.
+    leaves.sort(key=lambda cell: (-cell[2], cell[0], cell[1]))
+    nodes = {p: np.array([samples[p][key] for key in keys]) for p in points}
+    for i, j, h in leaves:
+        wx, wy = weights(0, i, h), weights(1, j, h)
+        for t in range(1, h):
+            for jj in (j, j + h):
+                if (i + t, jj) in nodes:
+                    nodes[(i + t, jj)] = (1 - wx[t]) * nodes[(i, jj)] + wx[t] * nodes[(i + h, jj)]
+            for ii in (i, i + h):
+                if (ii, j + t) in nodes:
+                    nodes[(ii, j + t)] = (1 - wy[t]) * nodes[(ii, j)] + wy[t] * nodes[(ii, j + h)]
+
+    grids = {key: np.zeros((size + 1, size + 1), dtype=float) for key in keys}
+    for i, j, h in leaves:
+        wx, wy = weights(0, i, h)[:, None], weights(1, j, h)[None, :]
+        v00, v10 = nodes[(i, j)], nodes[(i + h, j)]
+        v01, v11 = nodes[(i, j + h)], nodes[(i + h, j + h)]
+        for n, key in enumerate(keys):
+            grids[key][i : i + h + 1, j : j + h + 1] = (1 - wx) * (
+                (1 - wy) * v00[n] + wy * v01[n]
+            ) + wx * ((1 - wy) * v10[n] + wy * v11[n])
+
+    index = np.array(points, dtype=np.int64)
+    return {
+        "axes": names,
+        "coords": coords,
+        "sample_index": index,
+        "sample_values": np.stack(
+            [field_values[0][index[:, 0]], field_values[1][index[:, 1]]], axis=1
+        ),
+        "samples": {key: np.array([samples[p][key] for p in points]) for key in keys},
+        "grid": grids,
+        "leaves": np.array(leaves, dtype=np.int64).reshape(-1, 3),
+        "n_leaves": len(leaves),
+        "n_evaluations": len(by_config),
+    }
@@ -0,0 +1,225 @@
+"""Columnar trajectory storage with chunked on-disk segments."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+import json
+
+import numpy as np
+
+from sbt_agency.repro import write_text_atomic
+
+TRACE_FORMAT = "sbt_columnar_trace"
+TRACE_FORMAT_VERSION = 1
+TRACE_COLUMNS = ("t", "s", "a", "s_next")
+HEADER_NAME = "header.json"
+
+
+@dataclass
+class Trajectory:
+    """A single trajectory stored as int32 columns.
+
+    States are kept as indices; tuples are decoded on demand through
+    ``state_shape`` (the mixed-radix codec of the state space).
+    """
+
+    t: np.ndarray
+    s: np.ndarray
+    a: np.ndarray
+    s_next: np.ndarray
+    state_shape: tuple[int, ...] | None = None
+    action_names: Sequence[str] | None = None
+
+    def __post_init__(self) -> None:
+        for name in TRACE_COLUMNS:
+            col = np.asarray(getattr(self, name))
+            if col.ndim != 1:
+                raise ValueError(f"column {name} must be 1D")
+            if col.dtype != np.int32:
+                col = col.astype(np.int32)
+            setattr(self, name, col)
+        n = len(self.t)
+        if any(len(getattr(self, name)) != n for name in TRACE_COLUMNS):
+            raise ValueError("trajectory columns must have equal lengths")
+        if self.state_shape is not None:
+            self.state_shape = tuple(int(d) for d in self.state_shape)
+
+    def __len__(self) -> int:
+        return int(self.t.shape[0])
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Sequence[Mapping[str, Any]],
+        *,
+        state_shape: Sequence[int] | None = None,
+        action_names: Sequence[str] | None = None,
+    ) -> "Trajectory":
+        """Convert ``sim.rollout`` records into columns."""
+        cols = {
+            name: np.array([int(rec[name]) for rec in records], dtype=np.int32)
+            for name in TRACE_COLUMNS
+        }
+        return cls(
+            **cols,
+            state_shape=tuple(state_shape) if state_shape is not None else None,
+            action_names=action_names,
+        )
+
+    def decode(self, states: np.ndarray) -> np.ndarray:
+        """Decode state indices into an (n, n_factors) array of tuple entries."""
+        if self.state_shape is None:
+            raise ValueError("trajectory has no state_shape to decode with")
+        idx = np.unravel_index(np.asarray(states, dtype=np.int64), self.state_shape)
+        return np.stack(idx, axis=-1)
+
+    def to_records(self) -> list[dict]:
+        """Expand into ``sim.rollout``-style records, decoding state tuples."""
+        states = self.decode(self.s).tolist()
+        states_next = self.decode(self.s_next).tolist()
+        records = []
+        for i in range(len(self)):
+            a = int(self.a[i])
+            record = {
+                "t": int(self.t[i]),
+                "s": int(self.s[i]),
+                "state": tuple(states[i]),
+                "a": a,
+                "s_next": int(self.s_next[i]),
+                "state_next": tuple(states_next[i]),
+            }
+            if self.action_names is not None:
+                record["a_name"] = self.action_names[a]
+            records.append(record)
+        return records
+
+
+def _write_json_atomic(path: Path, payload: dict) -> None:
+    write_text_atomic(path, json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+
+class TraceWriter:
+    """Stream trajectory chunks into a directory of .npy segments.
+
+    Layout: ``<path>/header.json`` plus ``<path>/<run>/<column>_<k>.npy``. The
+    header is rewritten after every appended chunk, so an interrupted writer
+    leaves a readable trace of the chunks completed so far.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        header: Mapping[str, Any] | None = None,
+        state_shape: Sequence[int] | None = None,
+        action_names: Sequence[str] | None = None,
+        n_states: int | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._header: dict[str, Any] = dict(header or {})
+        self._header.update(
+            {
+                "format": TRACE_FORMAT,
+                "format_version": TRACE_FORMAT_VERSION,
+                "columns": list(TRACE_COLUMNS),
+                "dtype": "int32",
+                "runs": {},
+            }
+        )
+        if state_shape is not None:
+            self._header["state_shape"] = [int(d) for d in state_shape]
+        if action_names is not None:
+            self._header["action_names"] = list(action_names)
+        if n_states is not None:
+            self._header["n_states"] = int(n_states)
+        self._t_next: dict[str, int] = {}
+        self._flush()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _flush(self) -> None:
+        _write_json_atomic(self.path / HEADER_NAME, self._header)
+
+    def append(self, run: str, chunk: Mapping[str, np.ndarray] | Trajectory) -> None:
+        """Append a chunk with ``s``, ``a``, ``s_next`` (and optionally ``t``) columns."""
+        if isinstance(chunk, Trajectory):
+            chunk = {name: getattr(chunk, name) for name in TRACE_COLUMNS}
+        if "/" in run or run in ("", ".", ".."):
+            raise ValueError("run name must be a plain directory name")
+        cols = {name: np.asarray(chunk[name]) for name in ("s", "a", "s_next")}
+        n = int(cols["s"].shape[0])
+        start = self._t_next.get(run, 0)
+        if "t" in chunk:
+            cols["t"] = np.asarray(chunk["t"])
+        else:
+            cols["t"] = np.arange(start, start + n)
+        for name, col in cols.items():
+            if col.ndim != 1 or col.shape[0] != n:
+                raise ValueError(f"column {name} must be 1D with {n} entries")
+
+        run_meta = self._header["runs"].setdefault(run, {"length": 0, "segments": []})
+        k = len(run_meta["segments"])
+        run_dir = self.path / run
+        run_dir.mkdir(parents=True, exist_ok=True)
+        for name in TRACE_COLUMNS:
+            np.save(run_dir / f"{name}_{k:05d}.npy", cols[name].astype(np.int32))
+        run_meta["segments"].append({"index": k, "length": n})
+        run_meta["length"] += n
+        self._t_next[run] = start + n
+        self._flush()
+
+    def close(self) -> None:
+        self._flush()
+
+
+class TraceReader:
+    """Read a columnar trace, memory-mapping its segments."""
+
+    def __init__(self, path: str | Path) -> None:
+        path = Path(path)
+        if path.name == HEADER_NAME:
+            path = path.parent
+        self.path = path
+        self.header = json.loads((path / HEADER_NAME).read_text(encoding="utf-8"))
+        if self.header.get("format") != TRACE_FORMAT:
+            raise ValueError(f"{path} is not a columnar trace")
+
+    @property
+    def runs(self) -> list[str]:
+        return list(self.header["runs"].keys())
+
+    def segment_path(self, run: str, column: str, index: int) -> Path:
+        return self.path / run / f"{column}_{index:05d}.npy"
+
+    def iter_segments(self, run: str) -> Iterator[dict[str, np.ndarray]]:
+        """Yield one dict of memory-mapped columns per stored segment."""
+        for seg in self.header["runs"][run]["segments"]:
+            yield {
+                name: np.load(self.segment_path(run, name, seg["index"]), mmap_mode="r")
+                for name in TRACE_COLUMNS
+            }
+
+    def trajectory(self, run: str) -> Trajectory:
+        """Concatenate a run's segments into a Trajectory."""
+        parts: dict[str, list[np.ndarray]] = {name: [] for name in TRACE_COLUMNS}
+        for seg in self.iter_segments(run):
+            for name in TRACE_COLUMNS:
+                parts[name].append(seg[name])
+        cols = {
+            name: np.concatenate(parts[name]) if parts[name] else np.zeros(0, dtype=np.int32)
+            for name in TRACE_COLUMNS
+        }
+        shape = self.header.get("state_shape")
+        return Trajectory(
+            **cols,
+            state_shape=tuple(shape) if shape is not None else None,
+            action_names=self.header.get("action_names"),
+        )
@@ -8,7 +8,7 @@ from typing import Callable
 
 import numpy as np
 
-from sbt_agency.kernel import FiniteKernel
+from sbt_agency.kernel import FiniteKernel, PolicyLike, SuccessorTable, policy_table
 
 
 def ledger_feasible_actions(
@@ -37,6 +37,25 @@ def ledger_feasible_actions(
     return feasible_actions
 
 
+def ledger_feasible_mask(
+    ledger: Sequence[float] | np.ndarray,
+    costs: Sequence[float] | np.ndarray,
+    eps: float = 1e-12,
+) -> np.ndarray:
+    """Return the (n_states, n_actions) mask of actions affordable under the ledger."""
+    if eps < 0:
+        raise ValueError("eps must be non-negative")
+    ledger = np.asarray(ledger, dtype=float)
+    costs = np.asarray(costs, dtype=float)
+    if ledger.ndim != 1 or costs.ndim != 1:
+        raise ValueError("ledger and costs must be 1D arrays")
+    if not np.all(np.isfinite(ledger)):
+        raise ValueError("ledger value must be finite")
+    if np.any(costs < 0):
+        raise ValueError("action cost must be non-negative")
+    return costs[None, :] <= ledger[:, None] + eps
+
+
 def post_support_from_kernel(
     kernel: FiniteKernel, atol: float = 0.0
 ) -> Callable[[int, int], set[int]]:
@@ -109,3 +128,113 @@ def viability_kernel_history(
         if next_K == K:
             return history
         K = next_K
+
+
+def viability_kernel_mask(
+    kernel: FiniteKernel,
+    safe_mask: np.ndarray,
+    feasible_mask: np.ndarray | None = None,
+    *,
+    atol: float = 0.0,
+    successors: SuccessorTable | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized viability kernel of a FiniteKernel.
+
+    Same greatest fixed point as ``viability_kernel`` with support P > atol, but
+    on boolean arrays. Returns the kernel mask K and the (n_states, n_actions)
+    mask of feasible actions whose whole support stays in K (all False outside
+    K).
+    """
+    K = np.asarray(safe_mask, dtype=bool).copy()
+    if K.shape != (kernel.n_states,):
+        raise ValueError("safe_mask must have shape (n_states,)")
+    if feasible_mask is None:
+        feasible = np.ones((kernel.n_states, kernel.n_actions), dtype=bool)
+    else:
+        feasible = np.asarray(feasible_mask, dtype=bool)
+        if feasible.shape != (kernel.n_states, kernel.n_actions):
+            raise ValueError("feasible_mask must have shape (n_states, n_actions)")
+    if successors is None:
+        successors = kernel.successors(atol=atol)
+
+    while True:
+        allowed = feasible & K[successors.succ].all(axis=-1).T & K[:, None]
+        next_K = allowed.any(axis=1)
+        if np.array_equal(next_K, K):
+            return K, allowed
+        K = next_K
+
+
+def shield_policy(policy: PolicyLike, safe_actions: np.ndarray) -> np.ndarray:
+    """Restrict a policy to safe actions, as an (n_states, n_actions) table.
+
+    The policy's mass on safe actions is renormalized; states where it puts no
+    mass on a safe action fall back to uniform over the safe actions. States
+    with no safe action (outside the viability kernel) keep the policy as is.
+    """
+    safe = np.asarray(safe_actions, dtype=bool)
+    if safe.ndim != 2:
+        raise ValueError("safe_actions must have shape (n_states, n_actions)")
+    table = policy_table(policy, safe.shape[0], safe.shape[1])
+    masked = np.where(safe, table, 0.0)
+    mass = masked.sum(axis=1)
+    n_safe = safe.sum(axis=1)
+
+    shielded = table.copy()
+    keep = mass > 0
+    shielded[keep] = masked[keep] / mass[keep, None]
+    fallback = ~keep & (n_safe > 0)
+    shielded[fallback] = safe[fallback] / n_safe[fallback, None]
+    return shielded
+
+
+def max_safe_probability(
+    kernel: FiniteKernel,
+    safe_mask: np.ndarray,
+    horizon: int,
+    *,
+    feasible_mask: np.ndarray | None = None,
+    successors: SuccessorTable | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Maximal probability of keeping S_0, ..., S_horizon in the safe set.
+
+    Backward value iteration over the sparse successor table, restricted to the
+    actions allowed by ``feasible_mask`` (all actions if omitted). Returns the
+    values for every start state and an (horizon, n_states) table whose row t
+    is the optimal action at time t (ties go to the lowest action index; -1
+    where no action is feasible).
+    """
+    if horizon < 0:
+        raise ValueError("horizon must be non-negative")
+    safe = np.asarray(safe_mask, dtype=bool)
+    if safe.shape != (kernel.n_states,):
+        raise ValueError("safe_mask must have shape (n_states,)")
+    if feasible_mask is None:
+        feasible = np.ones((kernel.n_states, kernel.n_actions), dtype=bool)
+    else:
+        feasible = np.asarray(feasible_mask, dtype=bool)
+        if feasible.shape != (kernel.n_states, kernel.n_actions):
+            raise ValueError("feasible_mask must have shape (n_states, n_actions)")
+    if successors is None:
+        successors = kernel.successors()
+
+    blocked = ~feasible.T
+    stuck = ~feasible.any(axis=1)
+    safe_f = safe.astype(float)
+    values = safe_f
+    actions = np.empty((horizon, kernel.n_states), dtype=np.int32)
+    for k in range(horizon - 1, -1, -1):
+        Q = successors.expect(values)
+        Q[blocked] = -1.0
+        best = Q.argmax(axis=0)
+        values = safe_f * np.maximum(Q[best, np.arange(kernel.n_states)], 0.0)
+        best[stuck] = -1
+        actions[k] = best
+    return values, actions
+
+
+def chance_safe_set(values: np.ndarray, delta: float) -> np.ndarray:
+    """Mask of states whose maximal safety probability is at least 1 - delta."""
+    if not 0.0 <= delta <= 1.0:
+        raise ValueError("delta must be in [0, 1]")
+    return np.asarray(values, dtype=float) >= 1.0 - delta
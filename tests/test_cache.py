@@ -0,0 +1,92 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+
+import numpy as np
+
+from sbt_agency.cache import MetricCache, memoize, set_default_cache
+from sbt_agency.empowerment import capacity_bits
+from sbt_agency.env_ring_agent import RingAgentConfig
+
+
+def test_memoize_round_trips_and_keys_on_arguments(tmp_path):
+    cache = MetricCache(tmp_path)
+    calls = []
+
+    @memoize(cache=cache, name="summary")
+    def summary(config, *, scale=1.0):
+        calls.append(scale)
+        return {
+            "L": config.L * scale,
+            "by_theta": {0: 1.5, 2: float("inf")},
+            "pair": (1, "a"),
+            "table": np.arange(6.0).reshape(2, 3) * scale,
+        }
+
+    config = RingAgentConfig(L=5)
+    first = summary(config)
+    again = summary(config, scale=1.0)
+    assert calls == [1.0]
+    assert again["by_theta"] == {0: 1.5, 2: float("inf")}
+    assert again["pair"] == (1, "a")
+    assert np.array_equal(again["table"], first["table"])
+
+    summary(config, scale=2.0)
+    summary(RingAgentConfig(L=6))
+    assert calls == [1.0, 2.0, 1.0]
+    assert len(cache) == 3
+
+    assert summary.invalidate(config) == 1
+    summary(config)
+    assert calls == [1.0, 2.0, 1.0, 1.0]
+    assert cache.invalidate(function="other") == 0
+    assert cache.invalidate(function="summary") == 3
+    assert len(cache) == 0
+
+
+def test_lru_eviction_keeps_recently_read_entries(tmp_path):
+    cache = MetricCache(tmp_path, max_entries=2)
+    keys = [cache.key("f", {"i": i}) for i in range(3)]
+    cache.put(keys[0], "f", 0)
+    cache.put(keys[1], "f", 1)
+    os.utime(cache._file(keys[0]), ns=(1, 1))
+    os.utime(cache._file(keys[1]), ns=(2, 2))
+    assert cache.get(keys[0]) == 0
+    cache.put(keys[2], "f", 2)
+    assert keys[0] in cache and keys[2] in cache
+    assert keys[1] not in cache
+
+
+def test_default_cache_memoizes_capacity_solves(tmp_path):
+    W = np.array([[0.9, 0.1], [0.2, 0.8]])
+    expected = capacity_bits(W)
+    cache = set_default_cache(tmp_path)
+    try:
+        assert capacity_bits(W) == expected
+        assert len(cache) == 1
+        assert capacity_bits(W.copy()) == expected
+        assert len(cache) == 1
+        capacity_bits(W[::-1])
+        assert len(cache) == 2
+    finally:
+        set_default_cache(None)
+
+
+def _put_table(path, key, seed):
+    cache = MetricCache(path)
+    for i in range(20):
+        cache.put(key, "f", {"seed": seed, "table": np.full(50, seed * 100 + i, dtype=float)})
+
+
+def test_concurrent_puts_of_one_key_leave_a_consistent_entry(tmp_path):
+    cache = MetricCache(tmp_path)
+    key = cache.key("f", {})
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=4, mp_context=ctx) as pool:
+        for future in [pool.submit(_put_table, tmp_path, key, seed) for seed in range(4)]:
+            future.result()
+    got = cache.get(key)
+    assert got["table"][0] // 100 == got["seed"]
+    assert not list(tmp_path.glob("??/*.tmp"))
+    assert cache.invalidate(key) == 1
+    assert not list(tmp_path.glob("??/*"))
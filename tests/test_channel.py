@@ -1,6 +1,12 @@
 import numpy as np
 
-from sbt_agency.channel import build_channel_matrix, enumerate_action_seqs
+from sbt_agency.channel import (
+    build_channel_matrices,
+    build_channel_matrices_by_horizon,
+    build_channel_matrix,
+    enumerate_action_seqs,
+    rollout_dists,
+)
 from sbt_agency.kernel import FiniteKernel
 
 
@@ -55,3 +61,30 @@ def test_channel_matrix_probabilistic_start():
     expected = np.array([0.5, 0.5])
     assert np.allclose(W, np.tile(expected, (4, 1)), atol=0.0, rtol=0.0)
 
+
+def test_channel_matrices_share_propagation():
+    kernel = _make_kernel()
+    seqs = enumerate_action_seqs([0, 1], 3)
+    projs = [lambda s: s, np.array([0, 0]), np.array([1, 0])]
+
+    Ws = build_channel_matrices(kernel, 0, seqs, projs)
+    assert len(Ws) == len(projs)
+    for W, proj in zip(Ws, projs):
+        assert np.array_equal(W, build_channel_matrix(kernel, 0, seqs, proj))
+
+    dists = rollout_dists(kernel, kernel.delta(0), seqs)
+    for row, seq in zip(dists, seqs):
+        assert np.array_equal(row, kernel.rollout_dist(kernel.delta(0), seq))
+
+
+def test_channel_matrices_by_horizon_match_direct_build():
+    rng = np.random.default_rng(5)
+    P = rng.random((3, 4, 4))
+    P /= P.sum(axis=2, keepdims=True)
+    kernel = FiniteKernel(P)
+    labels = np.array([0, 1, 1, 2])
+    channels = build_channel_matrices_by_horizon(kernel, 1, [0, 2], 3, labels)
+    assert len(channels) == 3
+    for h, W in enumerate(channels, start=1):
+        seqs = enumerate_action_seqs([0, 2], h)
+        assert np.allclose(W, build_channel_matrix(kernel, 1, seqs, labels), atol=1e-14)
@@ -0,0 +1,25 @@
+import json
+
+import pytest
+
+from sbt_agency import cache
+from sbt_agency.cli import main
+
+
+def test_audit_command_reports_and_sets_status(tmp_path, capsys):
+    assert main(["audit", "--root", str(tmp_path), "--strict"]) == 0
+    assert "checked=0 errors=0" in capsys.readouterr().out
+    (tmp_path / "bad.json").write_text("{not json", encoding="utf-8")
+    assert main(["audit", "--root", str(tmp_path)]) == 1
+
+
+def test_experiment_command_runs_in_process(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # --cache sets the process-wide default; restore it for later tests.
+    monkeypatch.setattr(cache, "_default_cache", cache._default_cache)
+    monkeypatch.setattr(cache, "_default_from_env", cache._default_from_env)
+    with pytest.raises(SystemExit):
+        main(["nope"])
+    assert main(["--cache", str(tmp_path / "cache"), "rollouts"]) == 0
+    (trace,) = (tmp_path / "results" / "rollouts").glob("trace_*.json")
+    assert json.loads(trace.read_text(encoding="utf-8"))
@@ -41,3 +41,9 @@ def test_perfect_repair_sets_u_zero():
             u2 = tuples[s2][1]
             assert u2 == 0
 
+
+def test_state_shape_encodes_state_tuples():
+    _kernel, _projections, metadata = build_kernel(RingAgentConfig(L=3, m_phase=2, R_max=2))
+    shape = metadata["state_shape"]
+    decoded = np.stack(np.unravel_index(np.arange(len(metadata["state_tuples"])), shape), axis=1)
+    assert [tuple(row) for row in decoded.tolist()] == metadata["state_tuples"]
@@ -0,0 +1,55 @@
+import numpy as np
+
+from sbt_agency.evaluation import (
+    expected_depletion_time,
+    expected_hitting_time,
+    occupancy_measure,
+    survival_probability,
+)
+from sbt_agency.kernel import FiniteKernel
+
+
+def _leaky_kernel(p_stay: float) -> FiniteKernel:
+    # State 0 leaks into absorbing state 1 under action 0; action 1 stays put.
+    P = np.array(
+        [
+            [[p_stay, 1.0 - p_stay, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+            [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+        ]
+    )
+    return FiniteKernel(P)
+
+
+def test_survival_probability_geometric():
+    kernel = _leaky_kernel(0.9)
+    safe = np.array([True, False, True])
+    policy = np.array([0, 0, 0])
+    v = survival_probability(kernel, policy, safe, 5)
+    assert np.allclose(v, [0.9**5, 0.0, 1.0])
+    mixed = np.tile([0.5, 0.5], (3, 1))
+    assert np.isclose(survival_probability(kernel, mixed, safe, 2)[0], 0.95**2)
+
+
+def test_expected_hitting_time_and_unreachable_targets():
+    kernel = _leaky_kernel(0.75)
+    target = np.array([False, True, False])
+    times = expected_hitting_time(kernel, np.array([0, 0, 0]), target)
+    assert np.isclose(times[0], 4.0)
+    assert times[1] == 0.0
+    assert np.isinf(times[2])
+    assert np.isinf(expected_hitting_time(kernel, np.array([1, 0, 0]), target)[0])
+    ledger = np.array([2, 0, 5])
+    assert np.allclose(
+        expected_depletion_time(kernel, np.array([0, 0, 0]), ledger)[:2], [4.0, 0.0]
+    )
+
+
+def test_occupancy_measure_horizon_and_discount():
+    kernel = _leaky_kernel(0.5)
+    policy = np.array([0, 0, 0])
+    occ = occupancy_measure(kernel, policy, horizon=3)
+    assert np.allclose(occ[0], [1.75, 1.25, 0.0])
+    assert np.allclose(occ.sum(axis=1), 3.0)
+    disc = occupancy_measure(kernel, policy, discount=0.9)
+    assert np.allclose(disc.sum(axis=1), 10.0)
+    assert np.isclose(disc[0, 0], 1.0 / (1.0 - 0.45))
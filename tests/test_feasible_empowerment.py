@@ -1,7 +1,11 @@
 import numpy as np
 
-from sbt_agency.channel import build_channel_matrix, enumerate_action_seqs
-from sbt_agency.empowerment import feasible_capacity_bits
+from sbt_agency.channel import (
+    build_channel_matrices_by_horizon,
+    build_channel_matrix,
+    enumerate_action_seqs,
+)
+from sbt_agency.empowerment import feasible_capacity_bits, feasible_capacity_curve_bits
 from sbt_agency.kernel import FiniteKernel
 
 
@@ -45,3 +49,22 @@ def test_feasible_capacity_empty_returns_zero():
     c0 = feasible_capacity_bits(W, seqs, cost_fn, budget=0.0)
     assert c0 == 0.0
 
+
+def test_feasible_capacity_curve_matches_per_horizon_solves():
+    rng = np.random.default_rng(2)
+    P = rng.random((2, 3, 3))
+    P /= P.sum(axis=2, keepdims=True)
+    kernel = FiniteKernel(P)
+    channels = build_channel_matrices_by_horizon(kernel, 0, [0, 1], 4, lambda s: s)
+
+    def cost_fn(a: int) -> float:
+        return 0.0 if a == 0 else 1.0
+
+    for warm_start in (True, False):
+        curve = feasible_capacity_curve_bits(
+            channels, [0, 1], cost_fn, budget=2.0, warm_start=warm_start
+        )
+        for h, value in enumerate(curve, start=1):
+            seqs = enumerate_action_seqs([0, 1], h)
+            W = build_channel_matrix(kernel, 0, seqs, lambda s: s)
+            assert abs(value - feasible_capacity_bits(W, seqs, cost_fn, budget=2.0)) < 1e-9
@@ -0,0 +1,52 @@
+import numpy as np
+
+from sbt_agency.channel import build_channel_matrix
+from sbt_agency.exp_configs import ablations_suite
+from sbt_agency.holonomy import holonomy_tv, holonomy_witnesses, ring_holonomy_metrics
+from sbt_agency.kernel import FiniteKernel
+
+
+def _sparse_kernel(n_actions=3, n_states=7, seed=0):
+    rng = np.random.default_rng(seed)
+    shape = (n_actions, n_states, n_states)
+    P = rng.random(shape) * (rng.random(shape) < 0.4)
+    P[:, np.arange(n_states), np.arange(n_states)] += 0.1
+    return FiniteKernel(P / P.sum(axis=2, keepdims=True))
+
+
+def test_holonomy_tv_matches_channel_matrices():
+    kernel = _sparse_kernel()
+    proj = np.array([0, 1, 1, 2, 0, 2, 1])
+    tv = holonomy_tv(kernel, proj)
+    assert tv.shape == (7, 3, 3)
+    assert np.allclose(tv, tv.transpose(0, 2, 1))
+    assert np.all(np.diagonal(tv, axis1=1, axis2=2) == 0.0)
+    for s in range(kernel.n_states):
+        for a in range(3):
+            for b in range(3):
+                W = build_channel_matrix(kernel, s, [(a, b), (b, a)], proj)
+                assert np.isclose(tv[s, a, b], 0.5 * np.abs(W[0] - W[1]).sum(), atol=1e-12)
+    sub = holonomy_tv(kernel, proj, actions=[2, 0])
+    assert np.allclose(sub[:, 0, 1], tv[:, 2, 0])
+
+
+def test_holonomy_witnesses_rank_and_ties():
+    tv = np.zeros((3, 3, 3))
+    tv[0, 0, 1] = tv[0, 1, 0] = 0.5
+    tv[2, 0, 1] = tv[2, 1, 0] = 0.5 + 1e-15
+    tv[1, 1, 2] = tv[1, 2, 1] = 0.9
+    table = holonomy_witnesses(tv, actions=[4, 5, 6])
+    assert table["state"][:3].tolist() == [1, 0, 2]
+    assert table["a"][:3].tolist() == [5, 4, 4]
+    assert table["b"][:3].tolist() == [6, 5, 5]
+    assert table["tv"].size == 9
+    top = holonomy_witnesses(tv, states=np.array([True, False, True]), top=1)
+    assert top["state"].tolist() == [0] and top["tv"].tolist() == [0.5]
+
+
+def test_ring_holonomy_metrics_detects_protocol():
+    suite = ablations_suite()
+    on = ring_holonomy_metrics(suite["full"])
+    off = ring_holonomy_metrics(suite["no_protocol"])
+    assert on["tv_mean"] > off["tv_mean"]
+    assert 0.0 <= off["tv_mean"] <= off["tv_max"] <= 1.0
@@ -1,6 +1,46 @@
+import subprocess
+import sys
+from pathlib import Path
+
 import sbt_agency
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
 
 def test_import():
     assert sbt_agency is not None
 
+
+def _loaded_after(code: str, *, cwd: Path, pythonpath: str | None = None) -> set[str]:
+    env = {"PYTHONPATH": pythonpath} if pythonpath else None
+    out = subprocess.run(
+        [sys.executable, "-c", f"import sys; {code}; print(' '.join(sys.modules))"],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(out.stdout.split())
+
+
+def test_submodules_load_lazily():
+    src = str(REPO_ROOT / "src")
+    loaded = _loaded_after("import sbt_agency", cwd=REPO_ROOT / "tests", pythonpath=src)
+    assert "numpy" not in loaded and "sbt_agency.metrics" not in loaded
+    loaded = _loaded_after(
+        "import sbt_agency; sbt_agency.metrics", cwd=REPO_ROOT / "tests", pythonpath=src
+    )
+    assert "sbt_agency.metrics" in loaded and "matplotlib" not in loaded
+    assert "metrics" in dir(sbt_agency)
+
+
+def test_root_shim_loads_src_package_when_src_is_on_path():
+    # With the repo root first on sys.path the shim is found first and must not recurse.
+    code = "import sbt_agency.kernel; assert 'src' in sbt_agency.__file__"
+    loaded = _loaded_after(
+        code,
+        cwd=REPO_ROOT,
+        pythonpath=str(REPO_ROOT / "src"),
+    )
+    assert "sbt_agency.kernel" in loaded
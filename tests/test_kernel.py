@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from sbt_agency.kernel import FiniteKernel
+from sbt_agency.kernel import FiniteKernel, compile_policy, policy_table
 
 
 def _make_kernel():
@@ -51,3 +51,58 @@ def test_rollout_composition():
     stepped = kernel.step_dist(kernel.step_dist(kernel.step_dist(dist, 1), 0), 1)
     assert np.allclose(rolled, stepped, atol=0.0, rtol=0.0)
 
+
+def test_policy_matrix_forms_agree():
+    kernel = _make_kernel()
+    actions = np.array([1, 0])
+    table = np.array([[0.0, 1.0], [1.0, 0.0]])
+
+    T_array = kernel.policy_matrix(actions)
+    T_table = kernel.policy_matrix(table)
+    T_callable = kernel.policy_matrix(lambda s: int(actions[s]))
+    expected = np.array([[0.0, 1.0], [0.0, 1.0]])
+    assert np.array_equal(T_array, expected)
+    assert np.array_equal(T_table, expected)
+    assert np.array_equal(T_callable, expected)
+
+
+def test_policy_matrix_mixed_table():
+    kernel = _make_kernel()
+    table = np.array([[0.25, 0.75], [0.5, 0.5]])
+    T = kernel.policy_matrix(table)
+    assert np.allclose(T, [[0.25, 0.75], [0.5, 0.5]], atol=1e-15, rtol=0.0)
+
+
+def test_policy_table_rejects_bad_input():
+    with pytest.raises(ValueError):
+        policy_table(np.array([0, 2]), n_states=2, n_actions=2)
+    with pytest.raises(ValueError):
+        policy_table(np.array([[0.5, 0.4], [1.0, 0.0]]), n_states=2, n_actions=2)
+    with pytest.raises(ValueError):
+        policy_table(np.array([0.0, 1.0]), n_states=2, n_actions=2)
+
+
+def test_compile_policy_matches_callable():
+    table = compile_policy(lambda s: np.array([0.5, 0.5]) if s == 0 else 1, 2, 2)
+    assert np.array_equal(table, [[0.5, 0.5], [0.0, 1.0]])
+
+
+def test_successor_table_padding():
+    P = np.array(
+        [
+            [[0.5, 0.0, 0.5], [0.0, 1.0, 0.0], [0.2, 0.3, 0.5]],
+        ]
+    )
+    table = FiniteKernel(P).successors()
+    assert table.succ.shape == (1, 3, 3)
+    assert table.n_succ.tolist() == [[2, 1, 3]]
+    assert table.succ[0, 0, :2].tolist() == [0, 2]
+    assert table.succ[0, 1].tolist() == [1, 1, 1]
+    assert np.allclose(table.prob.sum(axis=2), 1.0)
+    assert np.all(table.cdf[..., -1] == 1.0)
+    u = np.array([0.0, 0.49, 0.5, 0.99])
+    a = np.zeros(4, dtype=int)
+    s = np.zeros(4, dtype=int)
+    assert table.sample(a, s, u).tolist() == [0, 0, 2, 2]
+    values = np.array([1.0, 10.0, 100.0])
+    assert np.allclose(table.expect(values), P @ values)
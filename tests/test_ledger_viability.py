@@ -1,10 +1,17 @@
 import numpy as np
 
+from sbt_agency.env_ring_agent import RingAgentConfig, build_kernel
 from sbt_agency.kernel import FiniteKernel
+from sbt_agency.sim import rollout_batch
 from sbt_agency.viability import (
+    chance_safe_set,
     ledger_feasible_actions,
+    ledger_feasible_mask,
+    max_safe_probability,
     post_support_from_kernel,
+    shield_policy,
     viability_kernel,
+    viability_kernel_mask,
 )
 
 
@@ -51,3 +58,60 @@ def test_ledger_viability_income_vs_no_income():
     K_income = viability_kernel(states, actions, feasible_actions, post_support_income, safe)
     assert K_income == {1, 2}
 
+
+def test_max_safe_probability_matches_worst_case_kernel():
+    kernel = _make_kernel_income()
+    feasible = ledger_feasible_mask([0, 1, 2], [1.0, 1.0])
+    assert feasible.tolist() == [[False, False], [True, True], [True, True]]
+    safe = np.array([False, True, True])
+    values, actions = max_safe_probability(kernel, safe, 2000, feasible_mask=feasible)
+    assert np.allclose(values, [0.0, 1.0, 1.0])
+    assert actions.shape == (2000, 3)
+    assert np.all(actions[:, 0] == -1)
+    assert np.all(actions[:, 1] == 1)
+
+
+def test_max_safe_probability_chance_constraint():
+    # Action 0 is safe w.p. 0.95 per step; action 1 w.p. 0.9.
+    P = np.zeros((2, 2, 2))
+    P[0, 0] = [0.95, 0.05]
+    P[1, 0] = [0.9, 0.1]
+    P[:, 1, 1] = 1.0
+    kernel = FiniteKernel(P)
+    safe = np.array([True, False])
+    values, actions = max_safe_probability(kernel, safe, 3)
+    assert np.isclose(values[0], 0.95**3)
+    assert np.all(actions[:, 0] == 0)
+    assert chance_safe_set(values, 0.15).tolist() == [True, False]
+    assert chance_safe_set(values, 0.1).tolist() == [False, False]
+
+
+def test_viability_kernel_mask_matches_set_kernel_and_shields():
+    config = RingAgentConfig(p_flip=0.2, gain_positions=(0, 4))
+    kernel, _proj, metadata = build_kernel(config)
+    ledger = np.array([t[3] for t in metadata["state_tuples"]])
+    costs = [1.0] * kernel.n_actions
+    safe = ledger >= 1
+
+    feasible_actions = ledger_feasible_actions(
+        range(kernel.n_actions), lambda s: float(ledger[s]), lambda _a: 1.0
+    )
+    K_set = viability_kernel(
+        range(kernel.n_states),
+        range(kernel.n_actions),
+        feasible_actions,
+        post_support_from_kernel(kernel),
+        lambda s: bool(safe[s]),
+    )
+    K, safe_actions = viability_kernel_mask(kernel, safe, ledger_feasible_mask(ledger, costs))
+    assert set(np.flatnonzero(K).tolist()) == K_set
+    assert K_set
+    assert np.all(safe_actions.any(axis=1) == K)
+
+    right = np.full(kernel.n_states, metadata["action_names"].index("RIGHT"))
+    shielded = shield_policy(right, safe_actions)
+    assert np.allclose(shielded.sum(axis=1), 1.0)
+    assert np.all(shielded[K][~safe_actions[K]] == 0.0)
+    starts = np.flatnonzero(K)
+    out = rollout_batch(kernel, starts, 50, shielded, rng=np.random.default_rng(1))
+    assert np.all(K[out["s_next"]])
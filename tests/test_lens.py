@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from sbt_agency.channel import build_channel_matrix, enumerate_action_seqs
+from sbt_agency.env_ring_agent import RingAgentConfig, build_kernel
+from sbt_agency.lens import Lens, as_lens
+from sbt_agency.packaging import empirical_endomap
+
+
+def test_lens_push_and_call():
+    lens = Lens(np.array([0, 0, 2]), n_outputs=3)
+    assert lens(2) == 2
+    assert np.array_equal(lens.push(np.array([0.25, 0.25, 0.5])), [0.5, 0.0, 0.5])
+    batch = lens.push(np.eye(3))
+    assert np.array_equal(batch, lens.indicator())
+
+
+def test_lens_validation():
+    with pytest.raises(ValueError):
+        Lens(np.array([0, 3]), n_outputs=3)
+    with pytest.raises(ValueError):
+        Lens(np.array([0.0, 1.0]), n_outputs=2)
+    with pytest.raises(ValueError):
+        as_lens(lambda s: -1, 2)
+
+
+def test_build_kernel_lenses_match_state_tuples():
+    config = RingAgentConfig(L=4, R_max=1, g_size=1, theta_max=0)
+    kernel, projections, metadata = build_kernel(config)
+    proj_y = projections["proj_y"]
+    proj_macro = projections["proj_macro"]
+    assert proj_y.n_outputs == config.L
+    for s, (y, _u, phi, r, _g, _theta) in enumerate(metadata["state_tuples"]):
+        assert proj_y(s) == y
+        assert proj_macro(s) == (phi * (config.R_max + 1) + r) * config.L + y
+
+    seqs = enumerate_action_seqs(range(kernel.n_actions), 2)
+    W_lens = build_channel_matrix(kernel, 3, seqs, proj_y)
+    W_array = build_channel_matrix(kernel, 3, seqs, proj_y.labels)
+    W_callable = build_channel_matrix(kernel, 3, seqs, lambda s: int(proj_y.labels[s]))
+    assert np.array_equal(W_lens, W_array)
+    assert np.array_equal(W_lens, W_callable)
+
+    policy = np.zeros(kernel.n_states, dtype=int)
+    E_lens = empirical_endomap(kernel, proj_macro, tau=2, policy=policy)
+    E_callable = empirical_endomap(kernel, lambda s: proj_macro(s), tau=2, policy=policy)
+    assert E_lens == E_callable
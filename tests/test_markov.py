@@ -0,0 +1,56 @@
+import numpy as np
+
+from sbt_agency.markov import (
+    class_period,
+    closed_classes,
+    communicating_classes,
+    limiting_matrix,
+    stationary_distribution,
+)
+
+
+def _make_chain():
+    # 0 -> {1, 3}; {1, 2} is a period-2 cycle; 3 is absorbing.
+    T = np.zeros((4, 4))
+    T[0, 1] = 0.25
+    T[0, 3] = 0.75
+    T[1, 2] = 1.0
+    T[2, 1] = 1.0
+    T[3, 3] = 1.0
+    return T
+
+
+def test_closed_classes_and_period():
+    T = _make_chain()
+    classes = [c.tolist() for c in communicating_classes(T)]
+    assert classes == [[0], [1, 2], [3]]
+    closed = [c.tolist() for c in closed_classes(T)]
+    assert closed == [[1, 2], [3]]
+    assert class_period(T, np.array([1, 2])) == 2
+    assert class_period(T, np.array([3])) == 1
+
+
+def test_stationary_distribution_two_state():
+    T = np.array([[0.9, 0.1], [0.3, 0.7]])
+    pi = stationary_distribution(T)
+    assert np.allclose(pi, [0.75, 0.25], atol=1e-12, rtol=0.0)
+    assert np.allclose(pi @ T, pi, atol=1e-12, rtol=0.0)
+
+
+def test_limiting_matrix_matches_cesaro_average():
+    T = _make_chain()
+    Pi = limiting_matrix(T)
+    expected_row0 = np.array([0.0, 0.125, 0.125, 0.75])
+    assert np.allclose(Pi[0], expected_row0, atol=1e-12, rtol=0.0)
+
+    rng = np.random.default_rng(0)
+    R = rng.random((6, 6)) * (rng.random((6, 6)) < 0.4)
+    R[np.arange(6), np.arange(6)] += 1e-3
+    R /= R.sum(axis=1, keepdims=True)
+    acc = np.zeros_like(R)
+    M = np.eye(6)
+    n_avg = 20_000
+    for _ in range(n_avg):
+        acc += M
+        M = M @ R
+    assert np.allclose(limiting_matrix(R), acc / n_avg, atol=1e-3, rtol=0.0)
@@ -1,7 +1,10 @@
 import math
 
+import numpy as np
+
 from sbt_agency.env_ring_agent import RingAgentConfig
-from sbt_agency.metrics import compute_ring_metrics
+import sbt_agency.metrics as metrics_module
+from sbt_agency.metrics import MetricsSession, compute_ring_metrics
 
 
 def test_metrics_smoke():
@@ -29,3 +32,61 @@ def test_metrics_smoke():
     assert 0.0 <= metrics["empowerment_median_on_K"] <= math.log2(config.L) + 1e-6
     assert 0 <= metrics["kernel_size_viable"] <= metrics["n_states"]
 
+
+def _session_config():
+    return RingAgentConfig(
+        L=6,
+        m_phase=2,
+        R_max=1,
+        g_size=1,
+        theta_max=0,
+        enable_learn=False,
+        p_flip=0.1,
+        p_slip=0.1,
+        cost_repair=0,
+    )
+
+
+def test_metrics_session_reuses_stages(monkeypatch):
+    config = _session_config()
+    calls = {"build_kernel": 0, "build_channel_matrix": 0}
+
+    def counted(name):
+        fn = getattr(metrics_module, name)
+
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    for name in calls:
+        monkeypatch.setattr(metrics_module, name, counted(name))
+    session = MetricsSession(config)
+    assert calls["build_kernel"] == 0
+    K = session.viable_states(1)
+    assert session.viable_states(1) is K
+    assert calls["build_kernel"] == 1
+
+    direct = compute_ring_metrics(config, empowerment_H=1, empowerment_max_states=4, seed=0)
+    result = session.ring_metrics(empowerment_H=1, empowerment_max_states=4, seed=0)
+    assert result == direct
+    result["config"]["L"] = 99  # callers get a copy, not the session's dict
+    assert session.config_dict["L"] == config.L
+    n_built = calls["build_channel_matrix"]
+    session.empowerment_median_on_K(H=1, max_states=4, seed=0)
+    assert calls["build_channel_matrix"] == n_built
+    session.empowerment_median_on_K(H=2, max_states=4, seed=0)
+    assert calls["build_channel_matrix"] > n_built
+
+
+def test_exact_empowerment_covers_all_of_K():
+    config = _session_config()
+    session = MetricsSession(config)
+    metrics = session.ring_metrics(empowerment_max_states=4, exact=True)
+    emp = metrics["empowerment_on_K"]
+    K = session.viable_states(1)
+    assert emp["states"] == K.tolist()
+    assert np.allclose(emp["values"], session.capacities(K.tolist(), 2), atol=1e-9)
+    assert metrics["empowerment_median_on_K"] == emp["median"]
+    assert emp["min"] <= emp["median"] <= emp["max"]
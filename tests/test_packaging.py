@@ -1,7 +1,9 @@
+import math
+
 import numpy as np
 
 from sbt_agency.kernel import FiniteKernel
-from sbt_agency.packaging import empirical_endomap, idempotence_defect
+from sbt_agency.packaging import empirical_endomap, empirical_endomaps, idempotence_defect
 
 
 def _make_kernel():
@@ -40,3 +42,59 @@ def test_empirical_endomap_tau2_defect0():
     assert E[1] == 1
     assert idempotence_defect(E) == 0.0
 
+
+def test_empirical_endomap_accepts_policy_arrays():
+    kernel = _make_kernel()
+    E_callable = empirical_endomap(kernel, _proj, tau=1, policy=_policy)
+    E_actions = empirical_endomap(kernel, _proj, tau=1, policy=np.zeros(4, dtype=int))
+    E_table = empirical_endomap(kernel, _proj, tau=1, policy=np.ones((4, 1)))
+    assert E_callable == E_actions == E_table
+
+
+def _make_lazy_kernel():
+    P = np.zeros((1, 4, 4))
+    P[0, 0] = [0.5, 0.5, 0.0, 0.0]
+    P[0, 1] = [0.0, 0.5, 0.5, 0.0]
+    P[0, 2] = [0.0, 0.0, 0.9, 0.1]
+    P[0, 3] = [0.0, 0.0, 0.1, 0.9]
+    return FiniteKernel(P)
+
+
+def test_empirical_endomap_tau_inf_and_early_exit():
+    kernel = _make_lazy_kernel()
+    E_inf = empirical_endomap(kernel, _proj, tau=math.inf, policy=_policy)
+    E_long = empirical_endomap(kernel, _proj, tau=500, policy=_policy)
+    E_tol = empirical_endomap(kernel, _proj, tau=10**9, policy=_policy, tol=1e-12)
+    assert E_inf == E_long == E_tol == {0: 1, 1: 1}
+    assert idempotence_defect(E_inf) == 0.0
+
+
+def test_empirical_endomaps_multi_lens():
+    kernel = _make_lazy_kernel()
+    lenses = [_proj, np.array([0, 1, 1, 2]), lambda s: s]
+    for tau in (0, 1, 3, math.inf):
+        shared = empirical_endomaps(kernel, lenses, tau=tau, policy=_policy)
+        single = [empirical_endomap(kernel, proj, tau=tau, policy=_policy) for proj in lenses]
+        assert shared == single
+
+
+def test_endomaps_match_single_lens_on_ties_and_tol():
+    # Label 0 sends 0.3 to label 1 and 0.1 + 0.2 (one ulp more) to label 2.
+    P = np.zeros((1, 6, 6))
+    P[0, 0] = [0.0, 0.3, 0.1, 0.2, 0.25, 0.15]
+    P[0, 1:, 1:] = np.eye(5)
+    kernel = FiniteKernel(P)
+    labels = np.array([0, 1, 2, 2, 3, 4])
+    E = empirical_endomap(kernel, labels, tau=1, policy=_policy)
+    assert E == {0: 1, 1: 1, 2: 2, 3: 3, 4: 4}
+    (E_shared,) = empirical_endomaps(
+        kernel, [labels], tau=1, policy=_policy, macro_labels=[[4, 2, 1, 0, 3]]
+    )
+    assert E_shared == E
+
+    lazy = _make_lazy_kernel()
+    lenses = [_proj, np.array([0, 1, 1, 2])]
+    for tol in (1e-3, 1e-12):
+        shared = empirical_endomaps(lazy, lenses, tau=10**6, policy=_policy, tol=tol)
+        single = [empirical_endomap(lazy, proj, 10**6, _policy, tol=tol) for proj in lenses]
+        assert shared == single
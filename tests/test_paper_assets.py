@@ -0,0 +1,41 @@
+from sbt_agency.experiments.paper_assets import _copy_or_fail, _export_ablations_table, _Manifest
+
+SUMMARY = (
+    "name,kernel_size_viable,empowerment_median_on_K,idempotence_defect\n"
+    "full,12,1.25,0.0\n"
+    "no_protocol,9,0.5,0.125\n"
+)
+
+
+def _export(root, force=False):
+    manifest = _Manifest(root, force=force)
+    _copy_or_fail(manifest, root / "results" / "fig.png", root / "paper" / "figures" / "fig.png")
+    _export_ablations_table(manifest)
+    manifest.save()
+    return sorted(manifest.regenerated)
+
+
+def test_manifest_rebuilds_only_stale_assets(tmp_path):
+    summary = tmp_path / "results" / "ablations" / "summary.csv"
+    summary.parent.mkdir(parents=True)
+    summary.write_text(SUMMARY, encoding="utf-8")
+    (tmp_path / "results" / "fig.png").write_bytes(b"png-1")
+    table = "paper/generated/ablations_summary.tex"
+    figure = "paper/figures/fig.png"
+
+    assert _export(tmp_path) == [figure, table]
+    assert _export(tmp_path) == []
+
+    # A changed input rebuilds only the asset built from it.
+    (tmp_path / "results" / "fig.png").write_bytes(b"png-2")
+    assert _export(tmp_path) == [figure]
+    assert (tmp_path / figure).read_bytes() == b"png-2"
+
+    # An edited or missing output is rebuilt from unchanged inputs.
+    (tmp_path / table).write_text("edited\n", encoding="utf-8")
+    (tmp_path / figure).unlink()
+    assert _export(tmp_path) == [figure, table]
+    assert "no protocol & 9 & 0.500 & 0.125" in (tmp_path / table).read_text(encoding="utf-8")
+
+    assert _export(tmp_path, force=True) == [figure, table]
+    assert _export(tmp_path) == []
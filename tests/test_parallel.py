@@ -0,0 +1,29 @@
+import numpy as np
+
+from sbt_agency.kernel import FiniteKernel
+from sbt_agency.parallel import parallel_rollouts
+
+
+def _noisy_kernel():
+    rng = np.random.default_rng(3)
+    P = rng.random((2, 5, 5))
+    P /= P.sum(axis=2, keepdims=True)
+    return FiniteKernel(P)
+
+
+def test_parallel_rollouts_independent_of_worker_count():
+    kernel = _noisy_kernel()
+    policy = np.array([0, 1, 0, 1, 1])
+    kwargs = dict(n_traj=50, seed=7, block_size=8)
+    serial = parallel_rollouts(kernel, 2, 12, policy, n_workers=1, **kwargs)
+    pooled = parallel_rollouts(kernel, 2, 12, policy, n_workers=3, **kwargs)
+    for name in ("s", "a", "s_next"):
+        assert serial[name].shape == (12, 50)
+        assert np.array_equal(serial[name], pooled[name])
+    assert np.array_equal(serial["s"][1:], serial["s_next"][:-1])
+
+
+def test_parallel_rollouts_blocks_use_distinct_streams():
+    kernel = _noisy_kernel()
+    out = parallel_rollouts(kernel, 0, 20, np.array([0] * 5), n_traj=16, block_size=8, n_workers=1)
+    assert not np.array_equal(out["s_next"][:, :8], out["s_next"][:, 8:])
@@ -0,0 +1,96 @@
+from pathlib import Path
+import os
+
+import pytest
+
+from sbt_agency.audit import audit_results
+from sbt_agency.pipeline import Experiment, paper_experiments, run_pipeline
+
+
+def _script(tmp_path: Path, name: str, body: str) -> Path:
+    path = tmp_path / f"{name}.py"
+    path.write_text(
+        "from pathlib import Path\n"
+        "out = Path('results')\n"
+        "out.mkdir(exist_ok=True)\n"
+        "log = out / 'calls.txt'\n"
+        f"log.write_text(log.read_text() + '{name}\\n' if log.exists() else '{name}\\n')\n"
+        + body,
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_pipeline_runs_in_order_and_skips_up_to_date(tmp_path):
+    a = _script(tmp_path, "a", "(out / 'a.txt').write_text('1')\n")
+    b = _script(tmp_path, "b", "(out / 'b.txt').write_text((out / 'a.txt').read_text() + '2')\n")
+    boom = _script(tmp_path, "boom", "raise RuntimeError('boom')\n")
+    experiments = [
+        Experiment("b", b, {"x": 1}, ("b.txt",), after=("a",)),
+        Experiment("a", a, {"x": 1}, ("a.txt",)),
+        Experiment("boom", boom, {}, ("boom.txt",)),
+        Experiment("child", a, {}, ("a.txt",), after=("boom",)),
+    ]
+    status = run_pipeline(experiments, tmp_path, n_workers=2)
+    assert status == {"a": "ran", "b": "ran", "boom": "failed", "child": "blocked"}
+    assert (tmp_path / "results" / "b.txt").read_text() == "12"
+    assert "RuntimeError: boom" in (tmp_path / "results" / ".pipeline" / "boom.log").read_text()
+
+    calls = tmp_path / "results" / "calls.txt"
+    calls.write_text("")
+    status = run_pipeline(experiments[:2], tmp_path, n_workers=2)
+    assert status == {"a": "skipped", "b": "skipped"}
+    assert calls.read_text() == ""
+    assert audit_results(tmp_path / "results", strict=True)["errors"] == 0
+
+    # Restoring a tampered output leaves downstream stamps valid; new content does not.
+    (tmp_path / "results" / "a.txt").write_text("tampered")
+    assert audit_results(tmp_path / "results")["warnings"] == 1
+    status = run_pipeline(experiments[:2], tmp_path, n_workers=1)
+    assert status == {"a": "ran", "b": "skipped"}
+    a3 = _script(tmp_path, "a3", "(out / 'a.txt').write_text('3')\n")
+    changed = [Experiment("a", a3, {"x": 1}, ("a.txt",)), experiments[0]]
+    assert run_pipeline(changed, tmp_path, n_workers=1) == {"a": "ran", "b": "ran"}
+    assert (tmp_path / "results" / "b.txt").read_text() == "32"
+
+
+def test_pipeline_rejects_cycles_and_lists_paper_outputs(tmp_path):
+    cyclic = [
+        Experiment("a", tmp_path / "a.py", after=("b",)),
+        Experiment("b", tmp_path / "b.py", after=("a",)),
+    ]
+    with pytest.raises(ValueError, match="cycle"):
+        run_pipeline(cyclic, tmp_path)
+    experiments = paper_experiments()
+    assert [exp.name for exp in experiments] == [
+        "rollouts", "packaging", "ablations", "sweep", "protocol", "learning",
+    ]
+    assert all(exp.outputs and not exp.after for exp in experiments)
+    assert all(str(exp.target).startswith("sbt_agency.experiments.") for exp in experiments)
+
+
+def test_pipeline_calls_module_targets(tmp_path, monkeypatch):
+    (tmp_path / "toy_experiment.py").write_text(
+        "from pathlib import Path\n"
+        "from sbt_agency.parallel import default_workers\n"
+        "def main(argv):\n"
+        "    Path('results', 'toy.txt').write_text(f'{list(argv)} {default_workers()}')\n"
+        "def fail(argv):\n"
+        "    return 2\n",
+        encoding="utf-8",
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    experiments = [
+        Experiment("toy", "toy_experiment:main", {}, ("toy.txt",)),
+        Experiment("fail", "toy_experiment:fail", {}, ()),
+    ]
+    status = run_pipeline(experiments, tmp_path, n_workers=2)
+    assert status == {"toy": "ran", "fail": "failed"}
+    # Each of the two workers may use 8 // 2 cores for its own pools.
+    assert (tmp_path / "results" / "toy.txt").read_text() == "[] 4"
+    assert run_pipeline(experiments[:1], tmp_path) == {"toy": "skipped"}
+    # The target's own module is part of its input hash.
+    with open(tmp_path / "toy_experiment.py", "a", encoding="utf-8") as fh:
+        fh.write("# edited\n")
+    assert run_pipeline(experiments[:1], tmp_path) == {"toy": "ran"}
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from sbt_agency.env_ring_agent import RingAgentConfig, build_kernel
+from sbt_agency.packaging import empirical_endomap
+from sbt_agency.policies import (
+    baseline_policy_tables,
+    cost_map_from_config,
+    make_maintenance_first,
+    make_move_right_if_possible,
+    make_random_feasible,
+)
+from sbt_agency.sim import rollout_batch
+
+
+class _RecordingRng:
+    """Stands in for a Generator and records the lists passed to choice."""
+
+    def __init__(self):
+        self.last = None
+
+    def choice(self, options):
+        self.last = list(options)
+        return options[0]
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        RingAgentConfig(),
+        RingAgentConfig(enable_learn=True, cost_left=2, cost_repair=2),
+        RingAgentConfig(enable_repair=False, cost_right=3),
+    ],
+)
+def test_baseline_tables_match_closures(config):
+    kernel, _proj, metadata = build_kernel(config)
+    names = metadata["action_names"]
+    costs = cost_map_from_config(config, names)
+    tables = baseline_policy_tables(names, costs, metadata["state_tuples"])
+
+    deterministic = make_maintenance_first(names, costs)
+    rng = _RecordingRng()
+    randoms = {
+        "random_feasible": make_random_feasible(names, costs, rng),
+        "move_right": make_move_right_if_possible(names, costs, rng),
+    }
+    for s, state in enumerate(metadata["state_tuples"]):
+        expected = np.zeros(kernel.n_actions)
+        expected[deterministic(state, 0)] = 1.0
+        assert np.array_equal(tables["maintenance_first"][s], expected)
+        for name, pi in randoms.items():
+            rng.last = None
+            a = pi(state, 0)
+            expected = np.zeros(kernel.n_actions)
+            if rng.last is None:
+                expected[a] = 1.0
+            else:
+                expected[rng.last] = 1.0 / len(rng.last)
+            assert np.allclose(tables[name][s], expected)
+
+
+def test_baseline_tables_drive_sim_and_packaging():
+    config = RingAgentConfig()
+    kernel, projections, metadata = build_kernel(config)
+    names = metadata["action_names"]
+    tables = baseline_policy_tables(
+        names, cost_map_from_config(config, names), metadata["state_tuples"]
+    )
+    out = rollout_batch(kernel, 0, 10, tables["random_feasible"], n_traj=64)
+    assert out["a"].shape == (10, 64)
+    E = empirical_endomap(kernel, projections["proj_macro"], 2, tables["maintenance_first"])
+    assert E and set(E.values()) <= set(E)
@@ -0,0 +1,63 @@
+import numpy as np
+
+from sbt_agency.kernel import FiniteKernel
+from sbt_agency.reducers import (
+    ActionFrequencies,
+    FirstHitTime,
+    OccupancyHistogram,
+    ledger_depletion_time,
+    reduce_stream,
+    time_to_first_unsafe,
+)
+from sbt_agency.sim import iter_rollout_chunks, rollout_batch
+
+
+def _make_countdown_kernel():
+    # Ledger-like chain 3 -> 2 -> 1 -> 0 -> 0 under action 0; action 1 stays put.
+    P = np.zeros((2, 4, 4))
+    for r in range(4):
+        P[0, r, max(0, r - 1)] = 1.0
+        P[1, r, r] = 1.0
+    return FiniteKernel(P)
+
+
+def test_chunks_concatenate_to_batch_rollout():
+    kernel = _make_countdown_kernel()
+    table = np.full((4, 2), 0.5)
+    chunks = list(
+        iter_rollout_chunks(
+            kernel, 3, 10, table, chunk_size=4, n_traj=5, rng=np.random.default_rng(7)
+        )
+    )
+    assert [len(c["t"]) for c in chunks] == [4, 4, 2]
+    batch = rollout_batch(kernel, 3, 10, table, n_traj=5, rng=np.random.default_rng(7))
+    for name in ("s", "a", "s_next"):
+        assert np.array_equal(np.concatenate([c[name] for c in chunks]), batch[name])
+
+
+def test_reducers_on_unbounded_stream():
+    kernel = _make_countdown_kernel()
+    policy = np.zeros(4, dtype=int)
+    stream = iter_rollout_chunks(kernel, np.array([3, 1, 0]), None, policy, chunk_size=2)
+    limited = (chunk for chunk, _ in zip(stream, range(3)))
+
+    occupancy, actions, depletion, unsafe = reduce_stream(
+        limited,
+        [
+            OccupancyHistogram(4),
+            ActionFrequencies(2),
+            ledger_depletion_time(np.arange(4)),
+            time_to_first_unsafe(np.arange(4) >= 2),
+        ],
+    )
+    assert occupancy.sum() == 6 * 3
+    assert occupancy.tolist() == [14, 2, 1, 1]
+    assert actions.tolist() == [18, 0]
+    assert depletion.tolist() == [3, 1, 0]
+    assert unsafe.tolist() == [2, 0, 0]
+
+
+def test_first_hit_time_never_hit():
+    reducer = FirstHitTime(np.array([False, False, True]))
+    reducer.update({"t": np.array([0, 1]), "s": np.array([0, 1]), "s_next": np.array([1, 0])})
+    assert reducer.result().tolist() == [-1]
@@ -0,0 +1,94 @@
+from dataclasses import replace
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from sbt_agency.empowerment import capacity_bits
+from sbt_agency.env_ring_agent import RingAgentConfig
+from sbt_agency.metrics import MetricsSession, compute_ring_metrics
+from sbt_agency.service import ROUTES, MetricsClient, MetricsServer, SessionPool
+
+
+def _config(**overrides):
+    base = RingAgentConfig(
+        L=4, m_phase=2, R_max=1, g_size=1, theta_max=0, p_flip=0.1, p_slip=0.1,
+        cost_left=1, cost_right=1, cost_repair=0, cost_learn=0,
+    )
+    return replace(base, **overrides)
+
+
+@pytest.fixture
+def client():
+    server = MetricsServer(max_sessions=2).start()
+    try:
+        yield MetricsClient(server.url, timeout=30)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_service_matches_local_metrics(client):
+    config = _config()
+    remote = client.ring_metrics(config, empowerment_max_states=4, seed=0)
+    local = compute_ring_metrics(config, empowerment_max_states=4, seed=0)
+    assert json.loads(json.dumps(local)) == remote
+
+    session = MetricsSession(config)
+    assert client.viable_states(config) == session.viable_states().tolist()
+    states = session.viable_states()[:3].tolist()
+    assert client.empowerment(config, states, H=1, actions=["LEFT", "RIGHT"]) == pytest.approx(
+        session.capacities(states, 1, (0, 1))
+    )
+    W = np.array([[0.7, 0.3], [0.1, 0.9]])
+    assert client.capacity(W) == pytest.approx(capacity_bits(W))
+
+    with pytest.raises(ValueError, match="unknown RingAgentConfig fields"):
+        client._call("/viable_states", {"config": {"bogus": 1}})
+    assert client.stats()["built"] == 1
+
+
+def test_session_pool_evicts_least_recently_used():
+    pool = SessionPool(max_sessions=2)
+    a, b, c = _config(), _config(p_flip=0.2), _config(p_flip=0.3)
+    pool.query(a, lambda s: None)
+    pool.query(b, lambda s: None)
+    pool.query(a, lambda s: None)
+    pool.query(c, lambda s: None)
+    assert len(pool) == 2 and pool.built == 3
+    pool.query(a, lambda s: None)
+    assert pool.built == 3
+    pool.query(b, lambda s: None)
+    assert pool.built == 4
+
+    # A slow query on one config does not hold the pool lock for others.
+    release = threading.Event()
+    slow = threading.Thread(target=pool.query, args=(c, lambda s: release.wait(10)))
+    slow.start()
+    assert pool.query(a, lambda s: s.config) == a
+    release.set()
+    slow.join()
+
+    now = [0.0]
+    idle = SessionPool(max_sessions=4, idle_seconds=10.0, clock=lambda: now[0])
+    idle.query(a, lambda s: None)
+    now[0] = 5.0
+    idle.query(b, lambda s: None)
+    assert len(idle) == 2
+    now[0] = 12.0
+    idle.query(c, lambda s: None)
+    assert len(idle) == 2 and idle.stats()["built"] == 3
+    now[0] = 30.0
+    idle.query(c, lambda s: None)
+    assert len(idle) == 1
+
+
+def test_server_reports_unexpected_errors(client, monkeypatch):
+    def broken(_pool, _req):
+        raise AssertionError("broken route")
+
+    monkeypatch.setitem(ROUTES, "/capacity", broken)
+    with pytest.raises(RuntimeError, match="AssertionError: broken route"):
+        client.capacity(np.eye(2))
+    assert client.stats()["built"] == 0
@@ -0,0 +1,64 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+import os
+
+import numpy as np
+import pytest
+
+from sbt_agency.kernel import FiniteKernel
+from sbt_agency.shared import SharedKernel, attach_kernel
+
+
+def _kernel():
+    rng = np.random.default_rng(0)
+    P = rng.random((2, 4, 4))
+    P[P < 0.3] = 0.0
+    P /= P.sum(axis=2, keepdims=True)
+    return FiniteKernel(P)
+
+
+def _worker_sum(handle):
+    kernel, successors = attach_kernel(handle)
+    return float(kernel.P.sum()), int(successors.n_succ.sum()), kernel.P.flags.writeable
+
+
+def _worker_crash(handle):
+    attach_kernel(handle)
+    os._exit(1)
+
+
+@pytest.mark.parametrize("backend", ["shm", "memmap"])
+def test_workers_attach_to_published_kernel(backend, tmp_path):
+    kernel = _kernel()
+    successors = kernel.successors()
+    with SharedKernel(
+        kernel, successors, state_shape=(2, 2), backend=backend, directory=tmp_path
+    ) as shared:
+        assert shared.handle.state_shape == (2, 2)
+        local, local_succ = attach_kernel(shared.handle)
+        assert np.array_equal(local.P, kernel.P)
+        assert np.array_equal(local_succ.succ, successors.succ)
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            total, n_succ, writeable = pool.submit(_worker_sum, shared.handle).result()
+        assert total == pytest.approx(kernel.P.sum())
+        assert n_succ == int(successors.n_succ.sum())
+        assert not writeable
+    assert not list(tmp_path.iterdir())
+
+
+def test_segments_survive_worker_crash_and_are_unlinked_on_close():
+    shared = SharedKernel(_kernel())
+    name = shared.handle.arrays["P"].location
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        with pytest.raises(BrokenProcessPool):
+            pool.submit(_worker_crash, shared.handle).result()
+    kernel, successors = attach_kernel(shared.handle)
+    assert successors is None
+    assert np.allclose(kernel.P.sum(axis=2), 1.0)
+    shared.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+    # Closing also forgets this process's attachment instead of serving it stale.
+    with pytest.raises(FileNotFoundError):
+        attach_kernel(shared.handle)
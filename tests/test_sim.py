@@ -1,7 +1,7 @@
 import numpy as np
 
 from sbt_agency.kernel import FiniteKernel
-from sbt_agency.sim import rollout
+from sbt_agency.sim import rollout, rollout_batch
 
 
 def test_rollout_deterministic_kernel():
@@ -21,3 +21,34 @@ def test_rollout_deterministic_kernel():
     assert len(traj) == 3
     assert traj[-1]["s_next"] == 1
 
+
+def test_rollout_batch_deterministic_kernel():
+    P = np.array(
+        [
+            [[1.0, 0.0], [0.0, 1.0]],
+            [[0.0, 1.0], [1.0, 0.0]],
+        ]
+    )
+    kernel = FiniteKernel(P)
+    out = rollout_batch(kernel, np.array([0, 1]), 3, np.array([1, 1]))
+    assert out["s"].shape == (3, 2)
+    assert out["s_next"].dtype == np.int32
+    assert np.array_equal(out["s_next"][:, 0], [1, 0, 1])
+    assert np.array_equal(out["s"][1:], out["s_next"][:-1])
+
+
+def test_rollout_batch_matches_kernel_frequencies():
+    P = np.zeros((2, 3, 3))
+    P[0] = [[0.2, 0.8, 0.0], [0.0, 0.5, 0.5], [0.3, 0.0, 0.7]]
+    P[1] = [[0.0, 0.0, 1.0], [0.6, 0.4, 0.0], [0.1, 0.1, 0.8]]
+    kernel = FiniteKernel(P)
+    table = np.full((3, 2), 0.5)
+    out = rollout_batch(
+        kernel, 0, 50, table, n_traj=4000, rng=np.random.default_rng(1)
+    )
+
+    counts = np.zeros((2, 3, 3))
+    np.add.at(counts, (out["a"].ravel(), out["s"].ravel(), out["s_next"].ravel()), 1.0)
+    freq = counts / counts.sum(axis=2, keepdims=True)
+    assert np.allclose(freq, P, atol=0.02)
+    assert abs(np.mean(out["a"]) - 0.5) < 0.01
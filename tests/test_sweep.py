@@ -0,0 +1,156 @@
+from functools import partial
+
+import numpy as np
+
+from sbt_agency import cache, sweep
+from sbt_agency.audit import audit_results
+from sbt_agency.env_ring_agent import RingAgentConfig
+from sbt_agency.experiments import sweep_noise_maintenance
+from sbt_agency.sweep import SweepStore, adaptive_sweep, metric_name, run_sweep, sweep_grid
+
+CALLS = []
+
+
+def _toy_metric(config):
+    CALLS.append(config)
+    return {"score": config.p_flip * 10 + config.cost_repair, "L": config.L}
+
+
+def test_sweep_grid_coerces_field_types():
+    cells = sweep_grid(RingAgentConfig(), {"p_flip": np.linspace(0, 1, 3), "cost_repair": [0, 2]})
+    assert len(cells) == 6
+    index, config = cells[-1]
+    assert index == (2, 1)
+    assert type(config.p_flip) is float and config.cost_repair == 2
+
+
+def test_run_sweep_resumes_from_store_and_matches_pool(tmp_path):
+    base = RingAgentConfig()
+    axes = {"p_flip": [0.0, 0.5], "cost_repair": [1, 2, 3]}
+    CALLS.clear()
+    grids = run_sweep(base, axes, _toy_metric, store=tmp_path, n_workers=1)
+    assert grids["score"].shape == (2, 3)
+    assert np.allclose(grids["score"], [[1, 2, 3], [6, 7, 8]])
+    assert len(CALLS) == 6
+
+    # Drop one finished cell, as if the sweep had been interrupted.
+    store = SweepStore(tmp_path)
+    lost = store.key(sweep_grid(base, axes)[4][1], metric_name(_toy_metric))
+    store._file(lost).unlink()
+    CALLS.clear()
+    resumed = run_sweep(base, axes, _toy_metric, store=tmp_path, n_workers=1)
+    assert len(CALLS) == 1
+    assert np.array_equal(resumed["score"], grids["score"])
+
+    pooled = run_sweep(base, axes, _toy_metric, n_workers=2)
+    assert np.array_equal(pooled["score"], grids["score"])
+
+
+def _scaled_metric(config, scale):
+    return {"score": config.p_flip * scale}
+
+
+def test_store_keys_change_with_code_and_bound_parameters(tmp_path, monkeypatch):
+    base = RingAgentConfig()
+    axes = {"p_flip": [0.0, 0.5]}
+    CALLS.clear()
+    run_sweep(base, axes, _toy_metric, store=tmp_path, n_workers=1)
+    assert audit_results(tmp_path, strict=True)["errors"] == 0
+    monkeypatch.setattr(sweep, "code_version", lambda: "edited")
+    run_sweep(base, axes, _toy_metric, store=tmp_path, n_workers=1)
+    assert len(CALLS) == 4
+
+    doubled = run_sweep(base, axes, partial(_scaled_metric, scale=2), store=tmp_path, n_workers=1)
+    tripled = run_sweep(base, axes, partial(_scaled_metric, scale=3), store=tmp_path, n_workers=1)
+    assert doubled["score"].tolist() == [0.0, 1.0]
+    assert tripled["score"].tolist() == [0.0, 1.5]
+
+
+def _step_metric(config):
+    # Sharp boundary along p_flip = 0.3, flat elsewhere.
+    return {"step": float(config.p_flip > 0.3), "cost": float(config.cost_repair)}
+
+
+def test_adaptive_sweep_refines_only_near_the_boundary():
+    out = adaptive_sweep(
+        RingAgentConfig(),
+        {"p_flip": (0.0, 1.0), "slip_improve_per_theta": (0.0, 1.0)},
+        _step_metric,
+        threshold={"step": 0.5},
+        coarse=2,
+        max_depth=5,
+        n_workers=1,
+    )
+    grid = out["grid"]["step"]
+    assert grid.shape == (65, 65)
+    # Full-resolution evaluation would need 65 * 65 points.
+    assert out["n_evaluations"] < 65 * 65 / 4
+    coords = out["coords"][0]
+    exact = (coords > 0.3).astype(float)[:, None] * np.ones(65)[None, :]
+    # Away from the single lattice interval containing the step, the grid is exact.
+    far = np.abs(coords - 0.3) > 1.0 / 64
+    assert np.array_equal(grid[far], exact[far])
+    assert np.all(out["samples"]["cost"] == RingAgentConfig().cost_repair)
+
+
+def test_adaptive_sweep_rounds_integer_axes():
+    out = adaptive_sweep(
+        RingAgentConfig(),
+        {"p_flip": (0.0, 1.0), "cost_repair": (0, 3)},
+        _step_metric,
+        threshold=0.5,
+        coarse=1,
+        max_depth=3,
+        n_workers=1,
+    )
+    assert set(out["samples"]["cost"].tolist()) <= {0.0, 1.0, 2.0, 3.0}
+    assert out["n_evaluations"] <= len(out["sample_index"])
+
+
+def _step_and_curve_metric(config):
+    return {"step": float(config.p_flip > 0.3), "curve": config.slip_improve_per_theta**2}
+
+
+def test_adaptive_sweep_grid_is_continuous_across_levels():
+    out = adaptive_sweep(
+        RingAgentConfig(),
+        {"p_flip": (0.0, 1.0), "slip_improve_per_theta": (0.0, 1.0)},
+        _step_and_curve_metric,
+        threshold={"step": 0.5},
+        coarse=2,
+        max_depth=3,
+        n_workers=1,
+    )
+    grid = out["grid"]["curve"]
+    assert len(set(out["leaves"][:, 2].tolist())) > 1
+    # Along every leaf edge the grid is linear, including at the hanging nodes
+    # where a finer neighbour sampled the (non-linear) metric.
+    for i, j, h in out["leaves"]:
+        for edge in (grid[i : i + h + 1, j], grid[i : i + h + 1, j + h]):
+            assert np.allclose(edge, np.linspace(edge[0], edge[-1], h + 1))
+        for edge in (grid[i, j : j + h + 1], grid[i + h, j : j + h + 1]):
+            assert np.allclose(edge, np.linspace(edge[0], edge[-1], h + 1))
+
+
+def test_run_sweep_truncates_integer_fields():
+    cells = sweep_grid(RingAgentConfig(), {"cost_repair": [1.7]})
+    assert cells[0][1].cost_repair == 1
+
+
+def _flat_maintenance_metric(config):
+    return {"K_size": 10.0, "emp_median": config.p_flip}
+
+
+def test_adaptive_noise_maintenance_writes_into_a_fresh_tree(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cache, "_default_cache", None)
+    monkeypatch.setattr(cache, "_default_from_env", False)
+    monkeypatch.setattr(
+        sweep_noise_maintenance, "noise_maintenance_metrics", _flat_maintenance_metric
+    )
+    assert sweep_noise_maintenance.main(["--adaptive", "--workers", "1"]) == 0
+    (npz_path,) = (tmp_path / "results" / "sweeps").glob("noise_maintenance_adaptive_*.npz")
+    with np.load(npz_path) as data:
+        assert data["K_size"].shape == (257, 257)
+        assert np.all(data["K_size"] == 10.0)
+        assert len(data["sample_values"]) == 25
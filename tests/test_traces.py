@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+
+from sbt_agency.audit import audit_results
+from sbt_agency.env_ring_agent import RingAgentConfig, build_kernel
+from sbt_agency.repro import stable_hash
+from sbt_agency.sim import rollout
+from sbt_agency.traces import TraceReader, TraceWriter, Trajectory
+
+
+def _rollout_records():
+    config = RingAgentConfig(L=4, R_max=2)
+    kernel, _projections, metadata = build_kernel(config)
+    records = rollout(
+        kernel,
+        0,
+        12,
+        lambda _state, t: t % kernel.n_actions,
+        state_tuples=metadata["state_tuples"],
+        action_names=metadata["action_names"],
+        rng=np.random.default_rng(3),
+    )
+    return kernel, metadata, records
+
+
+def test_trajectory_round_trips_records():
+    _kernel, metadata, records = _rollout_records()
+    traj = Trajectory.from_records(
+        records, state_shape=metadata["state_shape"], action_names=metadata["action_names"]
+    )
+    assert traj.s.dtype == np.int32
+    assert traj.to_records() == records
+
+
+def test_writer_reader_segments(tmp_path):
+    kernel, metadata, records = _rollout_records()
+    traj = Trajectory.from_records(records, state_shape=metadata["state_shape"])
+    config = {"L": 4}
+    header = {
+        "config": config,
+        "config_hash": stable_hash(config),
+        "seed": 3,
+        "n_steps": len(traj),
+        "timestamp": "now",
+        "versions": {"python": "3"},
+    }
+    path = tmp_path / "results" / "trace"
+    with TraceWriter(
+        path,
+        header=header,
+        state_shape=metadata["state_shape"],
+        action_names=metadata["action_names"],
+        n_states=kernel.n_states,
+    ) as writer:
+        for lo in range(0, len(traj), 5):
+            writer.append("pi", {name: getattr(traj, name)[lo : lo + 5] for name in ("s", "a", "s_next")})
+
+    reader = TraceReader(path)
+    assert reader.runs == ["pi"]
+    segments = list(reader.iter_segments("pi"))
+    assert len(segments) == 3
+    assert isinstance(segments[0]["s"], np.memmap)
+    loaded = reader.trajectory("pi")
+    assert np.array_equal(loaded.t, traj.t)
+    assert loaded.to_records()[-1]["state_next"] == records[-1]["state_next"]
+
+    result = audit_results(tmp_path / "results", strict=True)
+    assert result["checked"] == 1
+    assert result["errors"] == 0
+    assert result["warnings"] == 0
+
+    np.save(path / "pi" / "s_00001.npy", np.zeros(5, dtype=np.int32))
+    result = audit_results(tmp_path / "results", strict=True)
+    assert result["errors"] == 1
+    assert "continuity" in result["details"][0]["message"]
+
+    header_data = json.loads((path / "header.json").read_text(encoding="utf-8"))
+    assert header_data["runs"]["pi"]["length"] == len(traj)